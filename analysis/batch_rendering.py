@@ -0,0 +1,207 @@
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha256
+from html import escape
+from json import load, dump, dumps
+from math import ceil
+from os import makedirs, replace, cpu_count
+from os.path import exists, join
+
+import matplotlib.pyplot as plt
+
+from analysis import analysis_primitives
+from analysis import compare_primitives_random
+from analysis.rendering import figure_name
+from utils.analysis import read_pickle_parameters, solving_methods_groups, algorithms_groups, save_results_caches
+from utils.pickle_utils import journal_path
+from utils.results_cache import file_state
+
+"""
+
+Headless rendering of all the figures of the analysis of a benchmark (and of its comparison to random ideals). The figures of every group of parameters are saved with the Agg backend by a pool of processes, with an index.html page. A group whose parameters and result files have not changed since the last rendering is not rendered again.
+
+"""
+
+KINDS = ["solving_methods", "groebner_time", "transformation_basis_time"] ### Figures of the mode analyse, then of the mode compare for both timings
+
+def group_fingerprint(kind:str, group:list[dict], folders_results:list[str]):
+
+    """
+    Return the fingerprint of the inputs of the figure of a group: its parameters and the state of their result files
+
+    :param kind: Kind of figure
+    :type kind: str
+    :param group: Parameters of the group
+    :type group: list[dict]
+    :param folders_results: Folders whose results are plotted
+    :type folders_results: list[str]
+    """
+
+    inputs = [kind, folders_results, group]
+
+    for folder_results in folders_results:
+        for parameter in group:
+            res_path = f"./{folder_results}/res/{parameter['id']}.pkl"
+            inputs.append([file_state(res_path), file_state(journal_path(res_path))])
+
+    return sha256(dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+def render_chunk(kind:str, folder_results_primitive:str, folder_results_random:str, variable_parameter:str, output:str, formats:list[str], leaders:list[int]):
+
+    """
+    Render the figures of some groups in a process of the pool
+
+    :returns: The names and titles of the figures saved
+    :rtype: list[dict]
+    """
+
+    plt.switch_backend("Agg")
+
+    if folder_results_random is None:
+
+        if kind == "solving_methods":
+            figures = analysis_primitives.compare_solving_methods(folder_results_primitive, variable_parameter, output, formats, leaders)
+        else:
+            figures = analysis_primitives.algorithms_comparison(folder_results_primitive, variable_parameter, kind, output, formats, leaders)
+
+    elif kind == "solving_methods":
+        figures = compare_primitives_random.compare_solving_methods(folder_results_primitive, folder_results_random, variable_parameter, output, formats, leaders)
+
+    else:
+        figures = compare_primitives_random.algorithms_comparison(folder_results_primitive, folder_results_random, variable_parameter, kind, output, formats, leaders)
+
+    ### The processes of the pool end without the exit handlers
+    save_results_caches()
+
+    return figures
+
+def write_index(output:str, title:str, rendered:dict):
+
+    """
+    Write the index.html page of the figures
+
+    :param output: Folder of the figures
+    :type output: str
+    :param title: Title of the page
+    :type title: str
+    :param rendered: Figures of every group, by name of group
+    :type rendered: dict
+    """
+
+    lines = ["<!DOCTYPE html>", "<html>", "<head>", '<meta charset="utf-8">', f"<title>{escape(title)}</title>", "</head>", "<body>", f"<h1>{escape(title)}</h1>"]
+
+    for kind in KINDS:
+
+        figures = [figure for (name, group_figures) in sorted(rendered.items()) if name.startswith(kind + "_") for figure in group_figures]
+
+        if figures == []:
+            continue
+
+        lines.append(f"<h2>{escape(kind)} ({len(figures)})</h2>")
+
+        for figure in figures:
+            links = " ".join(f'<a href="{escape(figure["name"])}.{escape(figure_format)}">{escape(figure_format)}</a>' for figure_format in figure["formats"])
+            lines.append(f'<figure><img src="{escape(figure["name"])}.{escape(figure["formats"][0])}" width="960" loading="lazy"><figcaption>{escape(str(figure["title"]))} {links}</figcaption></figure>')
+
+    lines += ["</body>", "</html>"]
+
+    with open(join(output, "index.html"), 'w') as f_html:
+        f_html.write("\n".join(lines))
+
+def render_figures(folder_results_primitive:str, output:str, variable_parameter:str="round", folder_results_random:str=None, formats:list[str]=["png"], processes:int=None, force:bool=False):
+
+    """
+    Render all the figures of the analysis of a benchmark, or of its comparison to random ideals, in an output folder
+
+    :param folder_results_primitive: Folder containing the results file of the primitive benchmark
+    :type folder_results_primitive: str
+    :param output: Folder where the figures and index.html are saved
+    :type output: str
+    :param variable_parameter: The parameter we want to see the influence
+    :type variable_parameter: str
+    :param folder_results_random: Folder containing the results of the comparison with random ideals, None to analyse only the benchmark
+    :type folder_results_random: str
+    :param formats: Formats of the figures (png, svg...)
+    :type formats: list[str]
+    :param processes: Number of processes rendering the figures, the number of cores if it is None
+    :type processes: int
+    :param force: True to render again the groups that have not changed
+    :type force: bool
+    """
+
+    plt.switch_backend("Agg")
+    makedirs(output, exist_ok=True)
+
+    processes = processes or cpu_count() or 1
+
+    state_path = join(output, "figures.json")
+    state = {"fingerprints" : {}, "figures" : {}}
+
+    if exists(state_path) and not force:
+        with open(state_path) as f_json:
+            state = load(f_json)
+
+    folders_results = [folder_results_primitive] + ([folder_results_random] if folder_results_random is not None else [])
+
+    parameters = read_pickle_parameters(folder_results_primitive)[1:]
+
+    fingerprints = {}
+    pending = {kind : [] for kind in KINDS}
+
+    for kind in KINDS:
+
+        groups = solving_methods_groups(parameters, variable_parameter) if kind == "solving_methods" else algorithms_groups(parameters, variable_parameter, kind)
+
+        for group in groups:
+
+            name = figure_name(kind, variable_parameter, group[0])
+            fingerprints[name] = group_fingerprint(kind, group, folders_results)
+
+            up_to_date = state["fingerprints"].get(name) == fingerprints[name] and all(exists(join(output, figure["name"] + "." + figure_format)) for figure in state["figures"].get(name, []) for figure_format in formats) and all(figure["formats"] == list(formats) for figure in state["figures"].get(name, []))
+
+            if not up_to_date:
+                pending[kind].append(group[0]["id"])
+
+    number_pending = sum(len(leaders) for leaders in pending.values())
+    print(f"Rendering {number_pending} groups of figures, {len(fingerprints) - number_pending} up to date", flush=True)
+
+    rendered = {name : figures for (name, figures) in state["figures"].items() if name in fingerprints}
+
+    ### Every process renders chunks of groups, so that the parameters are not read again for every group
+    futures = []
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+
+        for kind in KINDS:
+
+            leaders = pending[kind]
+            chunk_size = max(1, ceil(len(leaders) / (4 * processes)))
+
+            for start in range(0, len(leaders), chunk_size):
+                chunk = leaders[start:start + chunk_size]
+                futures.append((kind, chunk, executor.submit(render_chunk, kind, folder_results_primitive, folder_results_random, variable_parameter, output, formats, chunk)))
+
+        for (kind, chunk, future) in futures:
+
+            try:
+                figures = {figure["name"] : figure for figure in future.result()}
+            except Exception as e:
+                print(f"Cannot render the groups {chunk} of {kind}: {e}", flush=True)
+                for leader in chunk:
+                    fingerprints.pop(figure_name(kind, variable_parameter, {"id" : leader}), None)
+                continue
+
+            for leader in chunk:
+                name = figure_name(kind, variable_parameter, {"id" : leader})
+                rendered[name] = [figures[name]] if name in figures else []
+
+    state = {"fingerprints" : {name : fingerprint for (name, fingerprint) in fingerprints.items() if name in rendered}, "figures" : rendered}
+
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, 'w') as f_json:
+        dump(state, f_json)
+    replace(tmp_path, state_path)
+
+    title = folder_results_primitive if folder_results_random is None else f"{folder_results_primitive} / {folder_results_random}"
+    write_index(output, title, rendered)
+
+    print(f"Figures in {join(output, 'index.html')}", flush=True)
@@ -0,0 +1,56 @@
+from os.path import join
+
+import matplotlib.pyplot as plt
+from matplotlib.widgets import Button
+
+def figure_name(kind:str, variable_parameter:str, parameter:dict):
+
+    """
+    Return the name of the file of a figure, from the ID of the first parameter of its group
+
+    :param kind: Kind of figure ("solving_methods", "groebner_time" or "transformation_basis_time")
+    :type kind: str
+    :param variable_parameter: The parameter we want to see the influence
+    :type variable_parameter: str
+    :param parameter: First parameter dictionnary of the group of the figure
+    :type parameter: dict
+    """
+
+    return f"{kind}_{variable_parameter}_{parameter['id']}"
+
+def show_figure(fig, stop, figures:list[dict], output:str=None, formats:list[str]=["png"], name:str=None, title:str=None):
+
+    """
+    Display a figure with a STOP button, or save it in the output folder in every format when there is one
+
+    :param fig: Figure
+    :param stop: Function called by the STOP button
+    :param figures: List of the figures saved, the figure is added to it
+    :type figures: list[dict]
+    :param output: Folder where the figure is saved, None to display it
+    :type output: str
+    :param formats: Formats of the figure saved (png, svg...)
+    :type formats: list[str]
+    :param name: Name of the file of the figure, without extension
+    :type name: str
+    :param title: Title of the figure
+    :type title: str
+    """
+
+    if output is None:
+
+        ax_stop = plt.axes([0.8, 0.02, 0.15, 0.06])
+        btn_stop = Button(ax_stop, 'STOP', color='red', hovercolor='red')
+        btn_stop.on_clicked(stop)
+        plt.show()
+
+    else:
+
+        fig.set_size_inches(19.2, 10.8)
+
+        for figure_format in formats:
+            fig.savefig(join(output, name + "." + figure_format), bbox_inches="tight")
+
+        plt.close(fig)
+
+        figures.append({"name" : name, "title" : title, "formats" : list(formats)})
@@ -1,16 +1,11 @@
-from sys import executable, stdout, stderr
-from os import remove
-from os.path import exists
 from sage.all import GF
-from multiprocessing import Queue, Process
 from pickle import dump
-from subprocess import TimeoutExpired, CalledProcessError, Popen
-from tempfile import NamedTemporaryFile
 
 from utils.constants_generation import constants_random_sparsity
-from utils.exception import TimeoutException
-from utils.pickle_utils import change_dict_failed_to_timeout, change_dict_failed_to_skipped
-from utils.utils_all import import_perm, kill_process_tree
+from utils.pickle_utils import change_dict_failed_to_status, change_dict_failed_to_skipped, compact_journal, reset_result_dict
+from utils.solver_pool import SolverPool
+from utils.system_store import SystemStore
+from utils.utils_all import import_perm
 
 
 def system_of_equation_shape(system_of_equation:list):
@@ -26,7 +21,7 @@ def system_of_equation_shape(system_of_equation:list):
         vars = equation.variables()
         indices = [int(str(var).split('_')[1]) for var in vars]
         ### The shape of a system of equations is a tuple of a number of monomials, list of indices of variables (number of variables must be non negative integer) and a total degree        
-        system_of_equation_shape.append((len(equation.monomials()), indices, equation.total_degree()))
+        system_of_equation_shape.append((len(equation.monomials()), indices, int(equation.total_degree())))
     return system_of_equation_shape
 
 class ExperimentRecord:
@@ -50,13 +45,22 @@ class ExperimentRecord:
     :param str algo_gb: Algorithm to compute the Gröbner basis
     :param dict[str, list[dict[str, any]]] options: Options for the Gröbner basis algorithm
     :param str algo_order_change: Algorithm to use for the term order change
+
+    :param int cores: Number of cores of the worker, the independent systems are generated and solved on them at the same time
+    :param bool linear_elimination: True to eliminate the variables of the equations of degree 1 before the computation of the Gröbner basis
+    :param bool metrics_only: True to only compute the dimension, the degree, the Hilbert series and the radicality of the ideals from the first Gröbner basis, without the term order change
+    :param bool matrix_profile: True to also measure the density of the multiplication matrices of the zero-dimensional ideals, after the other results
+    :param bool system_cache: False to generate the systems again instead of reading them from the cache of the systems and of the rounds
     """
 
-    def __init__(self, folder_results:str, id:int, algo_gb:str, options:dict[str, list[dict[str, any]]], algo_order_change:str, field_size:int, monomial_order:str, permutation:str, cico:int, round:int, number_test:int, branch:int, seed:int, constant_sparsity:int):
+    def __init__(self, folder_results:str, id:int, algo_gb:str, options:dict[str, list[dict[str, any]]], algo_order_change:str, field_size:int, monomial_order:str, permutation:str, cico:int, round:int, number_test:int, branch:int, seed:int, constant_sparsity:int, cores:int=1, linear_elimination:bool=False, metrics_only:bool=False, system_cache:bool=True, matrix_profile:bool=False):
 
         self.file_log_result_path = f"./{folder_results}/logs/{id}.log"
         self.file_output_result_path = f"./{folder_results}/res/{id}.pkl"
 
+        ### The first Gröbner bases are shared by the experiments that only differ by the term order change algorithm
+        self.solver_options = {"artifact_store_folder" : f"./{folder_results}/artifacts", "linear_elimination" : linear_elimination, "metrics_only" : metrics_only, "matrix_profile" : matrix_profile}
+
         self.id = id
         self.seed = seed
 
@@ -75,7 +79,10 @@ class ExperimentRecord:
         self.options = options
         self.algo_order_change = algo_order_change
 
-    def generate_systems(self, system_generation_timeout:float, state:str):
+        self.cores = cores
+        self.system_cache = system_cache
+
+    def generate_systems(self, system_generation_timeout:float, state:str, indices:list[int]=None):
 
         """Generate the system of equations from the permutation.
         
@@ -83,16 +90,24 @@ class ExperimentRecord:
         :type system_generation_timeout: float
         :param state: State of the experiment. At the initialisation it is either "skipped" if it is in the forbidden zone or "failed"
         :type state: str
+        :param indices: Indices of the systems to generate when a benchmark is resumed, their results are replaced in the existing result file. All the systems are generated and written if it is None.
+        :type indices: list[int]
+
+        :returns: The list of the number_test systems, None for the ones not generated
         """
 
-        system_of_equations_list = []
-        
-        for i in range(self.number_test):
+        resumed = indices is not None
+        if not resumed:
+            indices = list(range(self.number_test))
 
-            results_dict = {"system_of_equation_shape" : state, "generation_time" : state, "groebner_time" : state, "solving_degree" : state, "ideal_dimension" : state, "transformation_basis_time" : state, "radical_ideal" : state, "shape_position" : state, "ideal_degree" : state}
-            
-            ### Import the function that generates the system of equations
-            generate_system_of_equations_cico_fun = import_perm(self.permutation)
+        system_of_equations_list = [None] * self.number_test
+
+        ### Import the function that generates the system of equations, it starts from the state saved after the previous rounds when the permutation supports it
+        generate_system_of_equations_cico_fun = import_perm(self.permutation, "results/cache/rounds" if self.system_cache else None)
+
+        generation_args_list = []
+        
+        for i in indices:
                 
             constant_vector_list = []
 
@@ -101,61 +116,58 @@ class ExperimentRecord:
                 ### The seed is modified for every round and systems
                 constant_vector_list.append(constants_random_sparsity(self.field, self.branch, self.constant_sparsity, self.seed + j + i * self.round))
 
-            try:
+            generation_args_list.append((self.field, self.monomial_order, self.branch, self.cico, self.round, self.seed , constant_vector_list))
 
-                ### We create a new process to generate the equations and use a Queue to get the system of equations
+        ### The systems already generated by a previous run are read from the cache. For the other ones, we create a new process for every generation of equations and use a Queue to get the system of equations. The independent generations are done on the cores of the worker.
 
-                q = Queue()
-                p = Process(target=generate_system_of_equations_cico_fun, args=(q, self.field, self.monomial_order, self.branch, self.cico, self.round, self.seed , constant_vector_list))
-                p.start()
-                p.join(system_generation_timeout)
+        generation_outcomes = SystemStore(enabled=self.system_cache).generate(self.permutation, generate_system_of_equations_cico_fun, generation_args_list, system_generation_timeout, self.cores)
 
-                if p.is_alive():
-                    p.terminate()
-                    p.join()
-                    raise TimeoutException()
-                
-                else:
-                    if not q.empty():
-                        system_of_equations, system_of_equations_generation_time = q.get()
-                    else:
-                        raise Exception("Error has occurred in the Queue to get the system of equations")
+        for (i, (outcome, result)) in zip(indices, generation_outcomes):
+
+            results_dict = {"system_of_equation_shape" : state, "generation_time" : state, "groebner_time" : state, "solving_degree" : state, "ideal_dimension" : state, "transformation_basis_time" : state, "radical_ideal" : state, "shape_position" : state, "ideal_degree" : state}
+
+            if outcome == "done":
+                system_of_equations, system_of_equations_generation_time = result
                     
-            except TimeoutException:
+            elif outcome == "timeout":
                 system_of_equations, system_of_equations_generation_time = "timeout_generation", "timeout_generation"
                 print("Timeout system of equations generation")
 
-            except Exception as e:
+            else:
                 system_of_equations, system_of_equations_generation_time = "failed_generation", "failed_generation"
                 print("System of equations generation has failed\n")
-                print(f"The error is: {e}")
-            
-            finally:
+                print(f"The error is: {result}")
 
-                system_of_equations_list.append(system_of_equations)
+            system_of_equations_list[i] = system_of_equations
 
-                if system_of_equations is None:
-                    results_dict = {"system_of_equation_shape" : "failed_generation", "generation_time" : "failed_generation", "groebner_time" : "failed_generation", "solving_degree" : "failed_generation", "ideal_dimension" : "failed_generation", "transformation_basis_time" : "failed_generation", "radical_ideal" : "failed_generation", "shape_position" : "failed_generation", "ideal_degree" : "failed_generation"}
-                    
-                elif system_of_equations == "timeout_generation":
-                    results_dict = {"system_of_equation_shape" : "timeout_generation", "generation_time" : "timeout_generation", "groebner_time" : "timeout_generation", "solving_degree" : "timeout_generation", "ideal_dimension" : "timeout_generation", "transformation_basis_time" : "timeout_generation", "radical_ideal" : "timeout_generation", "shape_position" : "timeout_generation", "ideal_degree" : "timeout_generation"}
+            if system_of_equations is None:
+                results_dict = {"system_of_equation_shape" : "failed_generation", "generation_time" : "failed_generation", "groebner_time" : "failed_generation", "solving_degree" : "failed_generation", "ideal_dimension" : "failed_generation", "transformation_basis_time" : "failed_generation", "radical_ideal" : "failed_generation", "shape_position" : "failed_generation", "ideal_degree" : "failed_generation"}
+                
+            elif system_of_equations == "timeout_generation":
+                results_dict = {"system_of_equation_shape" : "timeout_generation", "generation_time" : "timeout_generation", "groebner_time" : "timeout_generation", "solving_degree" : "timeout_generation", "ideal_dimension" : "timeout_generation", "transformation_basis_time" : "timeout_generation", "radical_ideal" : "timeout_generation", "shape_position" : "timeout_generation", "ideal_degree" : "timeout_generation"}
 
-                elif system_of_equations == "failed_generation":
-                    results_dict = {"system_of_equation_shape" : "failed_generation", "generation_time" : "failed_generation", "groebner_time" : "failed_generation", "solving_degree" : "failed_generation", "ideal_dimension" : "failed_generation", "transformation_basis_time" : "failed_generation", "radical_ideal" : "failed_generation", "shape_position" : "failed_generation", "ideal_degree" : "failed_generation"}
+            elif system_of_equations == "failed_generation":
+                results_dict = {"system_of_equation_shape" : "failed_generation", "generation_time" : "failed_generation", "groebner_time" : "failed_generation", "solving_degree" : "failed_generation", "ideal_dimension" : "failed_generation", "transformation_basis_time" : "failed_generation", "radical_ideal" : "failed_generation", "shape_position" : "failed_generation", "ideal_degree" : "failed_generation"}
 
-                else:
-                    results_dict["system_of_equation_shape"] = system_of_equation_shape(system_of_equations)
-                    results_dict["generation_time"] = system_of_equations_generation_time
-                
-                ### Write the list of result dictionnaries in a pickle file. This file will be updated all along the solving of the systems of equations.
+            else:
+                results_dict["system_of_equation_shape"] = system_of_equation_shape(system_of_equations)
+                results_dict["generation_time"] = system_of_equations_generation_time
+            
+            ### Write the list of result dictionnaries in a pickle file, in the order of the systems. This file will be updated all along the solving of the systems of equations.
+            if resumed:
+                reset_result_dict(self.file_output_result_path, i, results_dict)
+            else:
                 with open(self.file_output_result_path, 'ab') as f_pkl:
                     dump(results_dict, f_pkl)
                     f_pkl.flush()
                 f_pkl.close()
 
+        if resumed:
+            compact_journal(self.file_output_result_path)
+
         return system_of_equations_list
     
-    def solve_systems(self, system_generation_timeout:float, full_computation_timetout:float):
+    def solve_systems(self, system_generation_timeout:float, full_computation_timetout:float, solver_pool:SolverPool=None, indices:list[int]=None):
 
         """Solve systems of equations generated
         
@@ -163,66 +175,88 @@ class ExperimentRecord:
         :type system_generation_timeout: float
         :param full_computation_timeout: Timeout for the algebraic attack
         :type full_computation_timeout: float
+        :param solver_pool: Pool of solver processes to use, a new one is started if it is None
+        :type solver_pool: SolverPool
+        :param indices: Indices of the systems to solve when a benchmark is resumed, all the systems if it is None
+        :type indices: list[int]
+
+        :returns: The first step that timed out among the systems (0 for the Gröbner basis, see change_dict_failed_to_timeout), None if there is no timeout or if it only stopped the profile of the multiplication matrices
+        :rtype: int
         """
 
-        system_of_equations_list = self.generate_systems(system_generation_timeout, "failed")
+        system_of_equations_list = self.generate_systems(system_generation_timeout, "failed", indices)
 
-        add_to_forbidden_zone = False
+        if indices is None:
+            indices = list(range(self.number_test))
 
-        for (i, system_of_equations) in enumerate(system_of_equations_list):
+        timeout_step = None
 
-            print("\nExperiment number:", i, flush=True)
+        ### Sage is imported once by the workers of the pool and not for every system. The workers are still separated processes: if a C library such as Singular crashes, it doesn't impact other experiments running on other cores.
 
-            if system_of_equations is not None and system_of_equations != "timeout_generation" and system_of_equations != "failed_generation":
+        own_solver_pool = solver_pool is None
+        if own_solver_pool:
+            solver_pool = SolverPool(self.cores)
 
-                try:
+        try:
 
-                    ### Store the inputs of the solve.py script in the tmp file as system of equations is too large to be given as input of the function. Moreover we use subprocess to be able to timeout the execution of the script and to isolate the C processes such as Singular. If one them crashes then it doesn't impact other experiments running on other cores.
+            ### The first system is solved alone: if its Gröbner basis times out, the next ones are skipped
 
-                    with NamedTemporaryFile(delete=False) as f:
-                        dump((self.file_log_result_path, self.file_output_result_path, i, self.number_test, system_of_equations, self.algo_gb, self.monomial_order, self.algo_order_change, self.options), f)
-                        f.flush()
-                        input_file = f.name
+            solvable_indices = [i for i in indices if system_of_equations_list[i] is not None and system_of_equations_list[i] != "timeout_generation" and system_of_equations_list[i] != "failed_generation"]
 
-                    proc = Popen(
-                        [executable, "utils/systems_solver.py", input_file],
-                        stdout=stdout,
-                        stderr=stderr,
-                        text=True,
-                        start_new_session=True
-                    )
+            for i in indices:
+                if not i in solvable_indices:
+                    print("\nExperiment number:", i, flush=True)
+                    print("No system of equations")
+
+            ### The solving degree is read at the end of the log file, then the systems are solved one by one when the logs of the computation are printed
+            if self.options is not None and "prot" in self.options.keys() and self.options["prot"] == "sage":
+                parallel = 1
+            else:
+                parallel = self.cores
+
+            first_indices = [i for i in solvable_indices if i == 0]
+            other_indices = [i for i in solvable_indices if i != 0]
+
+            for batch_indices in [first_indices, other_indices]:
+
+                if batch_indices == []:
+                    continue
+
+                print("\nExperiment number:", ", ".join(str(i) for i in batch_indices), flush=True)
+
+                try:
+
+                    ### The independent systems are solved at the same time on the cores of the worker
+                    jobs = [(self.file_log_result_path, self.file_output_result_path, i, self.number_test, system_of_equations_list[i], self.algo_gb, self.monomial_order, self.algo_order_change, self.options, self.solver_options) for i in batch_indices]
+                    status = solver_pool.solve_many(jobs, full_computation_timetout, parallel)
 
-                    proc.wait(timeout=full_computation_timetout)
-                    
-                except TimeoutExpired:
-                    print("Timeout, next errors are due to the timeout", flush=True)
-                    add_to_forbidden_zone = True
-                    ### Kill all the processes coming from proc
-                    kill_process_tree(proc)
-                    timeout_algo = change_dict_failed_to_timeout(self.file_output_result_path, i, self.number_test)
-                    if timeout_algo == 0 and i == 0: ### If the computation of the Gröbner basis of the first experiment is tto long then I stop also the next algebraic attacks
-                        for j in range(1, self.number_test):
-                            change_dict_failed_to_skipped(self.file_output_result_path, j, self.number_test)
-                        print("End of timeout management", flush=True)
-                        return add_to_forbidden_zone
-                    print("End of timeout management", flush=True)
-                    
-                except CalledProcessError as e:
-                    print(f"Error in algebraic attack: {e}")
-                    kill_process_tree(proc)
-                
                 except KeyboardInterrupt:
                     print("Processes killed by Ctrl+C")
-                    kill_process_tree(proc)
                     return
 
-                finally:
-                    if exists(input_file):
-                        remove(input_file)
-                    print("Systems treated")
-            
-            else:
+                for (i, state) in zip(batch_indices, status):
+
+                    if state == "timeout" or state == "memout":
+                        ### A memout (memory limit of the solver exceeded) is managed as a timeout, the larger experiments would also exceed the limit
+                        print(f"{state.capitalize()}, next errors are due to the {state}", flush=True)
+                        ### The worker and all its processes have been killed by the pool
+                        timeout_algo = change_dict_failed_to_status(self.file_output_result_path, i, self.number_test, state)
+                        ### A timeout once all the steps have ended (in the profile of the multiplication matrices) doesn't add the experiment to the forbidden zone
+                        if timeout_algo < 6 and (timeout_step is None or timeout_algo < timeout_step):
+                            timeout_step = timeout_algo
+                        if timeout_algo == 0 and i == 0: ### If the computation of the Gröbner basis of the first experiment is tto long then I stop also the next algebraic attacks
+                            for j in range(1, self.number_test):
+                                change_dict_failed_to_skipped(self.file_output_result_path, j, self.number_test)
+                            print("End of timeout management", flush=True)
+                            return timeout_step
+                        print("End of timeout management", flush=True)
+
+                print("Systems treated")
 
-                print("No system of equations")
+        finally:
+            if own_solver_pool:
+                solver_pool.close()
+            ### Fold the changes of the journal in the result file
+            compact_journal(self.file_output_result_path)
                 
-        return add_to_forbidden_zone
\ No newline at end of file
+        return timeout_step
\ No newline at end of file
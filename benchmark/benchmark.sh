@@ -3,7 +3,6 @@
 ### Kill all the processes in case of Ctrl+C
 
 cleanup() {
-  rm 200
   echo "Killing all the processes"
   pkill -P $$
   exit 0
@@ -16,6 +15,11 @@ VERSION=1 ## Version of the tool
 PERMUTATION=$1
 CONFIGID=$2
 SETID=$3
+MODE=$4 ### "resume" to keep the results of a stopped run and only perform the unfinished experiments, "extend" to also add the new combinations of the input file
+
+if [[ "$MODE" == "resume" || "$MODE" == "extend" ]]; then
+  RESUME="resume"
+fi
 
 INPUTFILE="./experimentalSetup/${PERMUTATION}/${PERMUTATION}_set_${CONFIGID}.json" ### JSON input file
 
@@ -26,6 +30,9 @@ fi
 
 THREAD_NUMBER=$(jq -r '.thread_number' $INPUTFILE)
 START_NB_THREAD=$(jq -r '.start_nb_thread' $INPUTFILE)
+CORES_PER_WORKER=$(jq -r '.cores_per_worker // 1' $INPUTFILE) ### Number of cores of each worker, the systems of an experiment are solved on them at the same time
+MEMORY_LIMIT=$(jq -r '.memory_limit // 0' $INPUTFILE) ### Memory limit in GiB of the resolution of a system, 0 for no limit
+SYSTEM_CACHE=$(jq -r 'if .system_cache == false then "false" else "true" end' $INPUTFILE) ### false to generate the systems again instead of reading them from results/cache
 
 TIMEOUT_SYSTEM_GENERATION=$(jq -r '.timeout_system_generation' $INPUTFILE)
 TIMEOUT_FULL_COMPUTATION=$(jq -r '.timeout_full_computation' $INPUTFILE)
@@ -35,7 +42,14 @@ mkdir -p $DIRRES
 
 FOLDER_WORKING="./${DIRRES}/${PERMUTATION}_set_${CONFIGID}_${SETID}" ### Folder where the results and logs are stored
 
-if [[ -d "$FOLDER_WORKING" ]]; then
+if [[ "$RESUME" == "resume" ]]; then
+
+  if [[ ! -f "$FOLDER_WORKING/parameters.pkl" ]]; then
+    echo "There is no benchmark to ${MODE} in ${FOLDER_WORKING}"
+    exit 1
+  fi
+
+elif [[ -d "$FOLDER_WORKING" ]]; then
   echo "The folder ${FOLDER_WORKING} is going to be erased"
   read -r -p "Do you want to continue ? (y/n) [y] : " rep
   rep=${rep:-y}
@@ -46,33 +60,47 @@ if [[ -d "$FOLDER_WORKING" ]]; then
   fi
 fi
 
-rm -rf $FOLDER_WORKING/*
-mkdir -p $FOLDER_WORKING
-mkdir -p $FOLDER_WORKING/logs
-mkdir -p $FOLDER_WORKING/res
+if [[ "$RESUME" == "resume" ]]; then
+
+  ### The parameters and the results of the stopped run are kept
+  exec >> $FOLDER_WORKING/logs/global.log 2>&1
+  echo "Resume the benchmark"
 
-cp $INPUTFILE $FOLDER_WORKING
+  if [[ "$MODE" == "extend" ]]; then
 
-exec > $FOLDER_WORKING/logs/global.log 2>&1
+    ### Only the combinations of the input file that the benchmark doesn't have yet get new IDs, with the seed of the benchmark
+    cp $INPUTFILE $FOLDER_WORKING
+    python3 ./benchmark/generate_parameters.py $FOLDER_WORKING $INPUTFILE $PERMUTATION $VERSION extend
 
-#### Generate the parameters for the experiment
+  fi
 
-chmod 777 ./benchmark/generate_parameters.py
+else
 
-python3 ./benchmark/generate_parameters.py $FOLDER_WORKING $INPUTFILE $PERMUTATION $VERSION ## Perform algebraic attacks on primitives
+  rm -rf $FOLDER_WORKING/*
+  mkdir -p $FOLDER_WORKING
+  mkdir -p $FOLDER_WORKING/logs
+  mkdir -p $FOLDER_WORKING/res
 
-### Take advantage of multithreading
+  cp $INPUTFILE $FOLDER_WORKING
 
-for ((i=$START_NB_THREAD; i<$THREAD_NUMBER+$START_NB_THREAD; i++)); do
-  taskset -c "$i" bash ./benchmark/perform_experiments_per_thread.sh $FOLDER_WORKING $TIMEOUT_SYSTEM_GENERATION $TIMEOUT_FULL_COMPUTATION &
-  PIDS+=($!)
-done
+  exec > $FOLDER_WORKING/logs/global.log 2>&1
+
+  #### Generate the parameters for the experiment
+
+  chmod 777 ./benchmark/generate_parameters.py
+
+  python3 ./benchmark/generate_parameters.py $FOLDER_WORKING $INPUTFILE $PERMUTATION $VERSION ## Perform algebraic attacks on primitives
+
+fi
+
+### Take advantage of multithreading, the chains of experiments are scheduled on THREAD_NUMBER workers of CORES_PER_WORKER cores
+
+python3 ./benchmark/perform_experiments.py $FOLDER_WORKING $TIMEOUT_SYSTEM_GENERATION $TIMEOUT_FULL_COMPUTATION $THREAD_NUMBER $START_NB_THREAD $CORES_PER_WORKER $MEMORY_LIMIT $SYSTEM_CACHE $RESUME &
+PIDS+=($!)
 for pid in "${PIDS[@]}"; do
   wait "$pid"
 done
 
-rm -f $FOLDER_WORKING/200 $FOLDER_WORKING/ids.lock
-
 wait 
 
 echo "All experiments done !"
\ No newline at end of file
@@ -1,16 +1,19 @@
 from sys import argv
-from pickle import dump
+from pickle import load as load_pkl
 from random import randint
 from itertools import product
 from collections import defaultdict
-from json import load
+from json import load, dumps
+
+from utils.forbidden_zone import ForbiddenZone
+from utils.parameter_index import write_parameters
 """
 
 The matrices for the experiments have been fixed to the related permutation. It may be found in the documentation.
 
 """
 
-def generate_set_of_parameters(json_file:str, permutation:str, version:str):
+def generate_set_of_parameters(json_file:str, permutation:str, version:str, seed:int=None):
 
     """Generate all the parameters dictionnaries
     
@@ -20,6 +23,8 @@ def generate_set_of_parameters(json_file:str, permutation:str, version:str):
     :type permutation: str
     :param version: Version of the tool
     :type version: str
+    :param seed: Seed of the benchmark, a random one if it is None
+    :type seed: int
     """
 
     try:
@@ -43,7 +48,8 @@ def generate_set_of_parameters(json_file:str, permutation:str, version:str):
 
     number_of_parameters_by_thread_list = []
 
-    seed = randint(1, 10**15)
+    if seed is None:
+        seed = randint(1, 10**15)
  
     for field_char in inputs["field_chars"]:
 
@@ -141,6 +147,91 @@ def generate_set_of_parameters(json_file:str, permutation:str, version:str):
 
                                     number_of_parameters_by_thread_list.append(actual_pair)
 
+    ### The keys are only added when the options are used, the parameters of the benchmarks without them stay the same
+    for option in ["linear_elimination", "metrics_only", "matrix_profile"]:
+        if inputs.get(option, False):
+            for parameter in parameters:
+                parameter[option] = True
+
+    return parameters, number_of_parameters_by_thread_list
+
+def read_set_of_parameters(folder_results:str):
+
+    """Read the list of number of parameters by thread and the parameters of an existing benchmark
+
+    :param folder_results: Folder with the results of the benchmark
+    :type folder_results: str
+    """
+
+    parameters = []
+
+    with open(folder_results+"/parameters.pkl", 'rb') as f_param_pkl:
+
+        number_of_parameters_by_thread_list = load_pkl(f_param_pkl)
+
+        for _ in range(sum(number_of_parameters_by_thread_list)):
+            parameters.append(load_pkl(f_param_pkl))
+
+    return parameters, number_of_parameters_by_thread_list
+
+def parameter_signature(parameter:dict):
+
+    """Return a key identifying the combination of a parameter, without its ID, version and seed
+    """
+
+    return dumps({k : v for (k, v) in parameter.items() if k not in ["id", "version", "seed"]}, sort_keys=True)
+
+def extend_set_of_parameters(folder_results:str, json_file:str, permutation:str, version:str):
+
+    """Extend the parameters of an existing benchmark with the combinations of the JSON file that it doesn't have yet (new algorithm, new rounds...).
+
+    The grid of the JSON file is generated with the seed of the benchmark, so the new systems are comparable to the existing ones. The existing parameters keep their IDs. The new parameters of every chain of the grid get the next free IDs and form a new chain, then the IDs stay in the order of the chains.
+
+    :param folder_results: Folder with the results of the benchmark
+    :type folder_results: str
+    :param json_file: JSON file with the description of the parameters for the benchmark
+    :type json_file: str
+    :param permutation: Permutation/modelling name
+    :type permutation: str
+    :param version: Version of the tool
+    :type version: str
+
+    :returns: The parameters and the list of number of parameters by thread, the existing ones followed by the new ones
+    """
+
+    parameters, number_of_parameters_by_thread_list = read_set_of_parameters(folder_results)
+
+    seed = parameters[0]["seed"] if parameters != [] else None
+
+    grid_parameters, grid_number_of_parameters_by_thread_list = generate_set_of_parameters(json_file, permutation, version, seed)
+
+    known = set(parameter_signature(parameter) for parameter in parameters)
+
+    id = max([parameter["id"] for parameter in parameters] + [0]) + 1
+
+    start = 0
+    new_parameters_number = 0
+
+    for chain_size in grid_number_of_parameters_by_thread_list:
+
+        chain = grid_parameters[start:start + chain_size]
+        start += chain_size
+
+        new_chain = [parameter for parameter in chain if parameter_signature(parameter) not in known]
+
+        if new_chain == []:
+            continue
+
+        for parameter in new_chain:
+            parameter["id"] = id
+            id += 1
+
+        parameters += new_chain
+        number_of_parameters_by_thread_list.append(len(new_chain))
+        new_parameters_number += len(new_chain)
+
+    print("Extension of the benchmark:", new_parameters_number, "new parameters", flush=True)
+
     return parameters, number_of_parameters_by_thread_list
     
 
@@ -150,36 +241,30 @@ if __name__ == "__main__":
     json_file = argv[2]
     permutation = argv[3]
     version = argv[4]
+    extend = len(argv) > 5 and argv[5] == "extend" ## Add the new combinations of the JSON file to an existing benchmark
 
     """
         Generate all the sets of parameters for the experiments. Moreover, return the list of number of experiments to treat after the first ID. The following IDs (up to the next one in the list) have the same parameters except the number of branches and rounds.
     """
 
-    parameters, number_of_parameters_by_thread_list = generate_set_of_parameters(json_file, permutation, version)
+    if extend:
+        parameters, number_of_parameters_by_thread_list = extend_set_of_parameters(folder_results, json_file, permutation, version)
+    else:
+        parameters, number_of_parameters_by_thread_list = generate_set_of_parameters(json_file, permutation, version)
 
     """
-        Write the list of number of parameters by thread to treat and all the parameters set in the parameters.pkl file.
+        Write the list of number of parameters by thread to treat and all the parameters set in the parameters.pkl file, with the offset index of the parameters in the parameters.idx file.
     """
 
-    with open(folder_results+"/parameters.pkl", 'wb') as f_param_pkl:
-
-        dump(number_of_parameters_by_thread_list, f_param_pkl)
-
-        id = 1
-        for parameter in parameters:
-            dump(parameter, f_param_pkl)
-            f_param_pkl.flush()
-            id += 1
+    write_parameters(folder_results, number_of_parameters_by_thread_list, parameters)
 
     """
-        The first ID of each list of parameter to treat are written in decreasing order in the ids.txt file.
+        Create the forbidden zone shared by the workers with the dimensions of the input file. An extended benchmark keeps its zone.
     """
 
-    first_id = id
+    if not extend:
 
-    with open(folder_results+"/ids.txt", 'w') as f_id:
+        with open(json_file) as inputs_file:
+            inputs = load(inputs_file)
 
-        for nb_param in reversed(number_of_parameters_by_thread_list):
-            first_id -= nb_param
-            f_id.write(str(first_id)+"\n")
-            f_id.flush()
\ No newline at end of file
+        _ = ForbiddenZone(folder_results, inputs.get("forbidden_zone_dimensions", ForbiddenZone.default_dimensions), inputs.get("forbidden_zone_monotone_dimensions", ForbiddenZone.default_monotone_dimensions))
@@ -1,101 +1,96 @@
-from sys import argv
-from pickle import load
+from sys import argv, exit
+from signal import signal, SIGTERM
 from benchmark.algebraic_attack_benchmark import ExperimentRecord
+from utils.forbidden_zone import ForbiddenZone
+from utils.resume import resume_chains, prepare_resume
+from utils.scheduler import ChainScheduler, load_chains
+from utils.solver_pool import SolverPool
 from utils.utils_all import redirect_all_output
 
-def perform_experiments(folder_results:str, parameters:list[dict], system_generation_timeout:float, full_computation_timeout:float):
+def perform_experiment(parameter:dict, solver_pool:SolverPool, cores:int, folder_results:str, system_generation_timeout:float, full_computation_timeout:float, resume:bool=False, system_cache:bool=True):
 
-    """ Perform the list of experiments in parameters.
+    """ Perform one experiment of a chain.
 
-    This list contains experiments with the same parameter for the permutation except the number of branches or rounds. The time to perform an algebraic attack increases with these variables. Then, we use a forbidden zone that contains timed out experiments. If an experiment is treated with a higher number of rounds or branches than one from the forbidden zone then it is immediatly skipped as we know it will we be timed out.
+    The chain contains experiments with the same parameter for the permutation except the number of branches or rounds. The time to perform an algebraic attack increases with these variables. Then, we use a forbidden zone that contains timed out experiments, shared by all the workers of the benchmark. If an experiment is dominated by one from the forbidden zone (same parameters and a higher number of rounds or branches) then it is immediatly skipped as we know it will we be timed out.
 
+    :param parameter: dictionnary of parameters of the experiment
+    :type parameter: dict
+    :param solver_pool: Pool of solver processes of the worker
+    :type solver_pool: SolverPool
+    :param cores: Number of cores given to the worker, the systems of an experiment are generated and solved on them at the same time
+    :type cores: int
     :param folder_results: folder with the results of the benchmark
     :type folder_results: str
-    :param parameters: list of dictionnaries of parameters to treat
-    :type parameters: list[dict]
     :param system_generation_timeout: Timeout for the generation of the system
     :type system_generation_timeout: float
     :param full_computation_timeout: Timeout for the algebraic attack
     :type full_computation_timeout: float
+    :param resume: True if the benchmark is resumed, only the systems without final results are solved again
+    :type resume: bool
+    :param system_cache: False to generate the systems again instead of reading them from the cache
+    :type system_cache: bool
     """
 
-    forbidden_zone = []
- 
-    for parameter in parameters:
+    ### Indices of the systems to solve again when the benchmark is resumed, None to perform the whole experiment
+    indices = prepare_resume(folder_results, parameter) if resume else None
 
-        log_path = f"./{folder_results}/logs/{parameter['id']}.log"
-        redirect_all_output(log_path)
-        print("Parameters are", parameter, flush=True)
+    log_path = f"./{folder_results}/logs/{parameter['id']}.log"
+    redirect_all_output(log_path, 'w' if indices is None else 'a')
+    print("Parameters are", parameter, flush=True)
 
-        experimentation_to_do = True
+    if indices is not None:
+        print("Resumed, systems", indices, "solved again", flush=True)
 
-        """ Check whether the current experiment is in the forbidden zone
-        """
-
-        for element in forbidden_zone:
-            if (parameter["branch"] >= element[0]) and (parameter["round"] >= element[1]):
-                experimentation_to_do = False
-                break
-
-        experiment = ExperimentRecord(folder_results, id = parameter["id"], algo_gb = parameter["algo_gb"], options = parameter["options"], algo_order_change = parameter["algo_order_change"], field_size = parameter["field_char"], monomial_order = parameter["monomial_order"], permutation = parameter["permutation"], cico = parameter["cico"], round = parameter["round"], number_test = parameter["number_test"], branch = parameter["branch"], seed=parameter["seed"], constant_sparsity = parameter["constant_sparsity"])   
-
-        if experimentation_to_do:
-
-            add_to_forbidden_zone = experiment.solve_systems(system_generation_timeout, full_computation_timeout)
-
-            if add_to_forbidden_zone:
-                forbidden_zone.append((parameter["branch"], parameter["round"]))
-
-        else:
-            
-            """
-                The experiment is not performed but we compute the structure of the system to output it.
-            """
-            _ = experiment.generate_systems(system_generation_timeout, "skipped")
+    """ Check whether the current experiment is in the forbidden zone
+    """
 
+    forbidden_zone = ForbiddenZone(folder_results)
 
-if __name__ == "__main__":
+    dominating_timeout = forbidden_zone.dominating_timeout(parameter)
 
-    folder_results = argv[1]
-    parameter_first_id = int(argv[2]) ## First ID parameter to treat
-    system_generation_timeout = float(argv[3])
-    full_computation_timeout = float(argv[4])
+    experiment = ExperimentRecord(folder_results, id = parameter["id"], algo_gb = parameter["algo_gb"], options = parameter["options"], algo_order_change = parameter["algo_order_change"], field_size = parameter["field_char"], monomial_order = parameter["monomial_order"], permutation = parameter["permutation"], cico = parameter["cico"], round = parameter["round"], number_test = parameter["number_test"], branch = parameter["branch"], seed=parameter["seed"], constant_sparsity = parameter["constant_sparsity"], cores = cores, linear_elimination = parameter.get("linear_elimination", False), metrics_only = parameter.get("metrics_only", False), system_cache = system_cache, matrix_profile = parameter.get("matrix_profile", False))   
 
-    with open("./"+folder_results+"/parameters.pkl", 'rb') as f_pkl:
+    if dominating_timeout is None:
 
-        """
-            Get the number of parameters to treat starting to the first ID: parameter_first_id
-        """
+        timeout_step = experiment.solve_systems(system_generation_timeout, full_computation_timeout, solver_pool, indices)
 
-        parameters_by_thread_list = load(f_pkl)
+        if timeout_step is not None:
+            forbidden_zone.add(parameter, after_groebner_basis = timeout_step > 0)
 
-        for j in range(len(parameters_by_thread_list)):
-            if sum(parameters_by_thread_list[:j]) + 1 == parameter_first_id:
-                index = j
-                break
+    else:
 
-        parameters = []
-        i = 0
-        while i != parameter_first_id:
-            i += 1
-            first_set_parameters_to_treat = load(f_pkl)
-        
         """
-            Check we get the good first set of parameters
+            The experiment is not performed but we compute the structure of the system to output it.
         """
+        print("Skipped, dominated by the timed out experiment", dominating_timeout["id"], flush=True)
+        _ = experiment.generate_systems(system_generation_timeout, "skipped", indices)
 
-        parameters.append(first_set_parameters_to_treat)
-        assert parameters[0]["id"] == parameter_first_id
+if __name__ == "__main__":
 
-        """
-            Read and store the next set of parameters
-        """
+    folder_results = argv[1]
+    system_generation_timeout = float(argv[2])
+    full_computation_timeout = float(argv[3])
+    worker_number = int(argv[4]) ## Number of workers
+    first_core = int(argv[5]) ## First core to use
+    cores_per_worker = int(argv[6]) if len(argv) > 6 else 1 ## Number of cores of each worker
+    memory_limit = int(float(argv[7]) * 2**30) if len(argv) > 7 and float(argv[7]) > 0 else None ## Memory limit of the resolution of a system, given in GiB
+    system_cache = not (len(argv) > 8 and argv[8] == "false") ## Read the generated systems from the cache of the systems, "false" to generate them again
+    resume = len(argv) > 9 and argv[9] == "resume" ## Keep the results of a stopped run and only perform the unfinished experiments
 
-        for _ in range(parameters_by_thread_list[index]-1):
-            parameters.append(load(f_pkl))
+    signal(SIGTERM, lambda signum, frame: exit(1))
 
     """
-        Perform the experiments of the parameters list
+        Read the parameters once and perform the chains of experiments on the workers
     """
 
-    perform_experiments(folder_results, parameters, system_generation_timeout, full_computation_timeout)
\ No newline at end of file
+    chains = load_chains(folder_results)
+    forbidden_zone = ForbiddenZone(folder_results)
+
+    if resume:
+        ### The timeouts recorded in the results but not in the forbidden zone are added before the experiments are scheduled
+        forbidden_zone.rebuild(folder_results, [parameter for chain in chains for parameter in chain])
+        chains = resume_chains(folder_results, chains)
+
+    ### A stolen experiment waits for the earlier experiments of its chain that may put it in the forbidden zone
+    scheduler = ChainScheduler(folder_results, chains, perform_experiment, (folder_results, system_generation_timeout, full_computation_timeout, resume, system_cache), worker_number, first_core, cores_per_worker, memory_limit, monotone_dimensions = forbidden_zone.monotone_dimensions)
+    scheduler.run()
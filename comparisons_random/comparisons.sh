@@ -3,7 +3,6 @@
 ### Kill all the processes in case of Ctrl+C
 
 cleanup() {
-  rm 200
   echo "Killing all the processes"
   pkill -P $$
   exit 0
@@ -14,6 +13,7 @@ trap cleanup SIGINT SIGTERM
 VERSION=1 ## Version number of the tool
 
 CONFIGID=$1
+RESUME=$2 ### "resume" to keep the results of a stopped run and only perform the unfinished experiments
 
 INPUTFILE="./experimentalSetup/random/random_set_${CONFIGID}.json"
 
@@ -24,6 +24,9 @@ fi
 
 THREAD_NUMBER=$(jq -r '.thread_number' $INPUTFILE)
 START_NB_THREAD=$(jq -r '.start_nb_thread' $INPUTFILE)
+CORES_PER_WORKER=$(jq -r '.cores_per_worker // 1' $INPUTFILE) ### Number of cores of each worker, the systems of an experiment are solved on them at the same time
+MEMORY_LIMIT=$(jq -r '.memory_limit // 0' $INPUTFILE) ### Memory limit in GiB of the resolution of a system, 0 for no limit
+SYSTEM_CACHE=$(jq -r 'if .system_cache == false then "false" else "true" end' $INPUTFILE) ### false to generate the systems again instead of reading them from results/cache
 
 TIMEOUT_SYSTEM_GENERATION=$(jq -r '.timeout_system_generation' $INPUTFILE)
 TIMEOUT_FULL_COMPUTATION=$(jq -r '.timeout_full_computation' $INPUTFILE)
@@ -41,7 +44,14 @@ DIRCOMPARE="results/benchmark"
 
 FOLDER_WORKING="./${DIRRES}/random_compare_${PERMUTATION}_set_${PERMUTATION_CONF_NB}_${PERMUTATION_SET_NB}"
 
-if [[ -d "$FOLDER_WORKING" ]]; then
+if [[ "$RESUME" == "resume" ]]; then
+
+  if [[ ! -f "$FOLDER_WORKING/parameters.pkl" ]]; then
+    echo "There is no comparison to resume in ${FOLDER_WORKING}"
+    exit 1
+  fi
+
+elif [[ -d "$FOLDER_WORKING" ]]; then
   echo "The folder ${FOLDER_WORKING} is going to be erased"
   read -r -p "Do you want to continue ? (y/n) [y] : " rep
   rep=${rep:-y}
@@ -52,31 +62,37 @@ if [[ -d "$FOLDER_WORKING" ]]; then
   fi
 fi
 
-rm -rf $FOLDER_WORKING/*
-mkdir -p $FOLDER_WORKING
-mkdir -p $FOLDER_WORKING/logs
-mkdir -p $FOLDER_WORKING/res
-
 FOLDER_TO_COMPARE="./${DIRCOMPARE}/${PERMUTATION}_set_${PERMUTATION_CONF_NB}_${PERMUTATION_SET_NB}"
 
-exec > $FOLDER_WORKING/logs/global.log 2>&1
+if [[ "$RESUME" == "resume" ]]; then
 
-chmod 777 ./comparisons_random/random_comparison_parameters.py
+  ### The parameters and the results of the stopped run are kept
+  exec >> $FOLDER_WORKING/logs/global.log 2>&1
+  echo "Resume the comparison"
 
-python3 ./comparisons_random/random_comparison_parameters.py $FOLDER_TO_COMPARE $FOLDER_WORKING $NUMBER_TEST_COMPARISON ## Generate and perform algebraic attack on random ideals to compare to systems corresponding to algebraic attacks on primitives
+else
 
-### Take advantage of multithreading
+  rm -rf $FOLDER_WORKING/*
+  mkdir -p $FOLDER_WORKING
+  mkdir -p $FOLDER_WORKING/logs
+  mkdir -p $FOLDER_WORKING/res
 
-for ((i=$START_NB_THREAD; i<$THREAD_NUMBER+$START_NB_THREAD; i++)); do
-  taskset -c "$i" bash ./comparisons_random/perform_experiments_per_thread.sh $FOLDER_WORKING $TIMEOUT_SYSTEM_GENERATION $TIMEOUT_FULL_COMPUTATION &
-  PIDS+=($!)
-done
+  exec > $FOLDER_WORKING/logs/global.log 2>&1
+
+  chmod 777 ./comparisons_random/random_comparison_parameters.py
+
+  python3 ./comparisons_random/random_comparison_parameters.py $FOLDER_TO_COMPARE $FOLDER_WORKING $NUMBER_TEST_COMPARISON ## Generate and perform algebraic attack on random ideals to compare to systems corresponding to algebraic attacks on primitives
+
+fi
+
+### Take advantage of multithreading, the chains of experiments are scheduled on THREAD_NUMBER workers of CORES_PER_WORKER cores
+
+python3 ./comparisons_random/perform_experiments.py $FOLDER_WORKING $TIMEOUT_SYSTEM_GENERATION $TIMEOUT_FULL_COMPUTATION $THREAD_NUMBER $START_NB_THREAD $CORES_PER_WORKER $MEMORY_LIMIT $SYSTEM_CACHE $RESUME &
+PIDS+=($!)
 for pid in "${PIDS[@]}"; do
   wait "$pid"
 done
 
-rm -f $FOLDER_WORKING/200 $FOLDER_WORKING/ids.lock
-
 wait 
 
 echo "All experiments done !"
\ No newline at end of file
@@ -1,94 +1,88 @@
-from sys import argv
-from pickle import load, dump
+from sys import argv, exit
+from pickle import dump
+from signal import signal, SIGTERM
 
 from comparisons_random.algebraic_attack_comparison import ExperimentRecord
+from utils.resume import resume_chains, prepare_resume
+from utils.scheduler import ChainScheduler, load_chains
+from utils.solver_pool import SolverPool
 from utils.utils_all import redirect_all_output
 
-def experiment_executed(folder_results:str, parameters:list[dict], system_generation_timeout:float, full_computation_timeout:float):
+def experiment_executed(parameter:dict, solver_pool:SolverPool, cores:int, folder_results:str, system_generation_timeout:float, full_computation_timeout:float, resume:bool=False, system_cache:bool=True):
 
-    """ Perform the list of experiments in parameters.
-
-    This list contains experiments with the same parameter for the permutation except the number of branches or rounds. The time to perform an algebraic attack increases with these variables. Then, we use a forbidden zone that contains timed out experiments. If an experiment is treated with a higher number of rounds or branches than one from the forbidden zone then it is immediatly skipped as we know it will we be timed out.
+    """ Perform one experiment of a chain.
 
+    :param parameter: dictionnary of parameters of the experiment
+    :type parameter: dict
+    :param solver_pool: Pool of solver processes of the worker
+    :type solver_pool: SolverPool
+    :param cores: Number of cores given to the worker, the systems of an experiment are generated and solved on them at the same time
+    :type cores: int
     :param folder_results: folder with the results of the benchmark
     :type folder_results: str
-    :param parameters: list of dictionnaries of parameters to treat
-    :type parameters: list[dict]
     :param system_generation_timeout: Timeout for the generation of the system
     :type system_generation_timeout: float
     :param full_computation_timeout: Timeout for the algebraic attack
     :type full_computation_timeout: float
+    :param resume: True if the comparison is resumed, only the systems without final results are solved again
+    :type resume: bool
+    :param system_cache: False to generate the systems again instead of reading them from the cache
+    :type system_cache: bool
     """
- 
-    for parameter in parameters:
 
-        log_path = f"./{folder_results}/logs/{parameter['id']}.log"
-        res_path = f"./{folder_results}/res/{str(parameter['id'])}.pkl"
-        redirect_all_output(log_path)
+    ### Indices of the systems to solve again when the comparison is resumed, None to perform the whole experiment
+    indices = prepare_resume(folder_results, parameter) if resume else None
+
+    log_path = f"./{folder_results}/logs/{parameter['id']}.log"
+    res_path = f"./{folder_results}/res/{str(parameter['id'])}.pkl"
+    redirect_all_output(log_path, 'w' if indices is None else 'a')
 
-        print("Parameters are", parameter, flush=True)
+    print("Parameters are", parameter, flush=True)
 
-        """
-            If algo_gb in random is skipped then it means that the experiment should be skipped
-        """
+    if indices is not None:
+        print("Resumed, systems", indices, "solved again", flush=True)
 
-        if parameter["algo_gb"] != "skipped":
+    """
+        If algo_gb in random is skipped then it means that the experiment should be skipped
+    """
 
-            experiment = ExperimentRecord(folder_results, id = parameter["id"], algo_gb = parameter["algo_gb"], options = parameter["options"], algo_order_change = parameter["algo_order_change"], field_size = parameter["field_char"], monomial_order = parameter["monomial_order"], permutation = parameter["permutation"], number_test = parameter["number_test"], seed=parameter["seed"], monomials_degree_variables_vector=parameter["monomials_degree_variables_vector"])
+    if parameter["algo_gb"] != "skipped":
 
-            _ = experiment.solve_systems(system_generation_timeout, full_computation_timeout)
+        experiment = ExperimentRecord(folder_results, id = parameter["id"], algo_gb = parameter["algo_gb"], options = parameter["options"], algo_order_change = parameter["algo_order_change"], field_size = parameter["field_char"], monomial_order = parameter["monomial_order"], permutation = parameter["permutation"], number_test = parameter["number_test"], seed=parameter["seed"], monomials_degree_variables_vector=parameter["monomials_degree_variables_vector"], cores = cores, linear_elimination = parameter.get("linear_elimination", False), metrics_only = parameter.get("metrics_only", False), system_cache = system_cache, matrix_profile = parameter.get("matrix_profile", False))
 
+        _ = experiment.solve_systems(system_generation_timeout, full_computation_timeout, solver_pool, indices)
 
-        else:
 
-            results_dict = {"system_of_equation_shape" : "skipped", "generation_time" : "skipped", "groebner_time" : "skipped", "solving_degree" : "skipped", "ideal_dimension" : "skipped", "transformation_basis_time" : "skipped", "shape_position" : "skipped", "ideal_degree" : "skipped"}
+    else:
 
-            with open(res_path, 'wb') as f_pkl:
-                dump(results_dict, f_pkl)
-                f_pkl.flush()
+        results_dict = {"system_of_equation_shape" : "skipped", "generation_time" : "skipped", "groebner_time" : "skipped", "solving_degree" : "skipped", "ideal_dimension" : "skipped", "transformation_basis_time" : "skipped", "shape_position" : "skipped", "ideal_degree" : "skipped"}
 
+        with open(res_path, 'wb') as f_pkl:
+            dump(results_dict, f_pkl)
+            f_pkl.flush()
 
 if __name__ == "__main__":
 
     folder_results = argv[1]
-    parameter_first_id = int(argv[2]) ## First ID parameter to treat
-    system_generation_timeout = float(argv[3])
-    full_computation_timeout = float(argv[4])
-
-    with open("./"+folder_results+"/parameters.pkl", 'rb') as f_pkl:
-
-        """
-            Get the number of parameters to treat starting to the first ID: parameter_first_id
-        """
-
-        parameters_by_thread_list = load(f_pkl)
-
-        for j in range(len(parameters_by_thread_list)):
-            if sum(parameters_by_thread_list[:j]) + 1 == parameter_first_id:
-                index = j
-                break
-
-        parameters = []
-        i = 0
-        while i != parameter_first_id:
-            i += 1
-            first_set_parameters_to_treat = load(f_pkl)
-        
-        """
-            Check we get the good first set of parameters
-        """
-        parameters.append(first_set_parameters_to_treat)
-        assert parameters[0]["id"] == parameter_first_id
-
-        """
-            Read and store the next set of parameters
-        """
-
-        for _ in range(parameters_by_thread_list[index]-1):
-            parameters.append(load(f_pkl))
+    system_generation_timeout = float(argv[2])
+    full_computation_timeout = float(argv[3])
+    worker_number = int(argv[4]) ## Number of workers
+    first_core = int(argv[5]) ## First core to use
+    cores_per_worker = int(argv[6]) if len(argv) > 6 else 1 ## Number of cores of each worker
+    memory_limit = int(float(argv[7]) * 2**30) if len(argv) > 7 and float(argv[7]) > 0 else None ## Memory limit of the resolution of a system, given in GiB
+    system_cache = not (len(argv) > 8 and argv[8] == "false") ## Read the generated systems from the cache of the systems, "false" to generate them again
+    resume = len(argv) > 9 and argv[9] == "resume" ## Keep the results of a stopped run and only perform the unfinished experiments
+
+    signal(SIGTERM, lambda signum, frame: exit(1))
 
     """
-        Perform the experiments of the parameters list
+        Read the parameters once and perform the chains of experiments on the workers
     """
 
-    experiment_executed(folder_results, parameters, system_generation_timeout, full_computation_timeout)
\ No newline at end of file
+    chains = load_chains(folder_results)
+
+    if resume:
+        chains = resume_chains(folder_results, chains)
+
+    scheduler = ChainScheduler(folder_results, chains, experiment_executed, (folder_results, system_generation_timeout, full_computation_timeout, resume, system_cache), worker_number, first_core, cores_per_worker, memory_limit)
+    scheduler.run()
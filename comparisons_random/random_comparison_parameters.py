@@ -1,8 +1,11 @@
-from pickle import load, dump
+from pickle import load
 from os import makedirs
 from os.path import exists
 from sys import argv
 
+from utils.parameter_index import write_parameters
+from utils.pickle_utils import read_result_dicts
+
 def get_parameters(folder_results:str):
 
     """
@@ -30,12 +33,12 @@ def get_experiment_result(filename:str):
     :type filename: str
     """
 
-    with open(filename, "rb") as f_pkl:
-        try:
-            data = load(f_pkl)
-        except EOFError:
-            print("Cannot read data")
-            data = None
+    data_list = read_result_dicts(filename)
+    if data_list == []:
+        print("Cannot read data")
+        data = None
+    else:
+        data = data_list[0]
     return data
 
 def generate_random_comparison_parameters(results_primitives_to_compare:str, parameters:list, number_test:int):
@@ -77,8 +80,8 @@ def generate_random_comparison_parameters(results_primitives_to_compare:str, par
                     The goal is to compare the equations with random ideals of the same structure. The same maximal degree, variables and number of monomials.
                 """
 
-                if data["groebner_time"] != "failed" and data["groebner_time"] != "skipped" and data["groebner_time"] != "timeout":
-                    random_parameters.append({"version": parameter["version"], "id" : id, "permutation" : "random", "algo_gb" : parameter["algo_gb"], "options" : parameter["options"], "algo_order_change" : parameter["algo_order_change"], "field_char": parameter["field_char"], "monomial_order" : parameter["monomial_order"], "number_test" : number_test, "seed" : parameter["seed"], "monomials_degree_variables_vector" : shape_system})
+                if data["groebner_time"] not in ["failed", "skipped", "timeout", "memout"]:
+                    random_parameters.append({"version": parameter["version"], "id" : id, "permutation" : "random", "algo_gb" : parameter["algo_gb"], "options" : parameter["options"], "algo_order_change" : parameter["algo_order_change"], "field_char": parameter["field_char"], "monomial_order" : parameter["monomial_order"], "number_test" : number_test, "seed" : parameter["seed"], "monomials_degree_variables_vector" : shape_system, **{option : True for option in ["linear_elimination", "metrics_only", "matrix_profile"] if parameter.get(option, False)}})
 
                     """
                         If the Gröbner basis computation has failed, timed out or been skipped for this ID of experiment then the comparison has to be skipped. It is specified by giving to the algo_gb key, the value skipped.
@@ -120,25 +123,7 @@ if __name__ == "__main__":
     random_parameters, last_id = generate_random_comparison_parameters(results_primitives_to_compare, parameters, number_test)
 
     """
-        Write the list of parameters in the parameters.pkl file. Reuse the list of number of experiments to do per thread used in the primitives experiments.
-    """
-
-    with open("./"+folder_results+"/parameters.pkl", 'wb') as f_param_pkl:
-
-        dump(parameters_by_thread_list, f_param_pkl)
-
-        for parameter in random_parameters:
-            dump(parameter, f_param_pkl)
-            f_param_pkl.flush()
-
-    """
-        Write the first ID of experiments in the ids.txt file.
+        Write the list of parameters in the parameters.pkl file, with their offset index. Reuse the list of number of experiments to do per thread used in the primitives experiments.
     """
 
-    first_id = last_id + 1
-
-    with open("./"+folder_results+"/ids.txt", 'w') as f_id:
-        for nb_param in reversed(parameters_by_thread_list):
-            first_id -= nb_param
-            f_id.write(str(first_id)+"\n")
-            f_id.flush()
\ No newline at end of file
+    write_parameters(folder_results, parameters_by_thread_list, random_parameters)
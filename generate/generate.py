@@ -1,13 +1,12 @@
 from os import makedirs
 from os.path import exists
-from sage.all import GF, sage_eval
-from pickle import dump
+from sage.all import GF, PolynomialRing, sage_eval
 from sys import argv
-from multiprocessing import Queue, Process
 
 from utils.constants_generation import constants_random_sparsity
+from utils.system_format import write_systems, sage_to_columns, term_order_to_json
+from utils.system_store import SystemStore
 from utils.utils_all import import_perm, redirect_all_output
-from utils.exception import TimeoutException
 
 class Generate:
 
@@ -25,11 +24,12 @@ class Generate:
     :param int constant_sparsity: Sparsity of the constant vectors
     :param number_test: Number of generation of the system to perform
     :param int seed: seed for randomness
+    :param bool system_cache: False to generate the systems again instead of reading them from the cache of the systems and of the rounds
     
 
     """
 
-    def __init__(self, file_systems_generated:str, system_generation_timeout:float, field_size:int, monomial_order:str, permutation:str, cico:int, round:int, number_test:int, branch:int, seed:int, constant_sparsity:int):
+    def __init__(self, file_systems_generated:str, system_generation_timeout:float, field_size:int, monomial_order:str, permutation:str, cico:int, round:int, number_test:int, branch:int, seed:int, constant_sparsity:int, system_cache:bool=True):
 
         self.file_systems_generated = file_systems_generated
 
@@ -46,6 +46,8 @@ class Generate:
         self.branch = branch
         self.constant_sparsity = constant_sparsity
 
+        self.system_cache = system_cache
+
     def generate_systems(self):
 
         """Generate the system of equations depending on whether the systems are from an algebraic attack on a permutation or a random ideal.
@@ -53,14 +55,16 @@ class Generate:
 
         system_of_equations_list = []
 
+        ### Import the function from the permutation python script to generate the equations
+            
+        generate_system_of_equations_cico_fun = import_perm(self.permutation, "results/cache/rounds" if self.system_cache else None)
+
         ### Generate number_test systems of equations, for every loop the seed becomes self.seed + j + i * self.round, where j is the index for the round, i the index for the number of the system of equations and self.round the total number of round
+
+        generation_args_list = []
         
         for i in range(self.number_test):
 
-            ### Import the function from the permutation python script to generate the equations
-            
-            generate_system_of_equations_cico_fun = import_perm(self.permutation)
-
             constant_vector_list = []
 
             for j in range(self.round):
@@ -69,54 +73,49 @@ class Generate:
 
                 constant_vector_list.append(constants_random_sparsity(self.field, self.branch, self.constant_sparsity, self.seed + j + i * self.round))
 
-            try:
-
-                ### Use multithreading and Queue to timeout the function and returns the value in a Queue
-
-                q = Queue()
-                p = Process(target=generate_system_of_equations_cico_fun, args=(q, self.field, self.monomial_order, self.branch, self.cico, self.round, self.seed, constant_vector_list))
-                p.start()
-                p.join(system_generation_timeout)
-
-                if p.is_alive():
-                    p.terminate()
-                    p.join()
-                    raise TimeoutException()
-                
-                else:
-                    if not q.empty():
-                        system_of_equations, system_of_equations_generation_time = q.get()
-                    else:
-                        raise Exception("Error has occurred in the Queue to get the system of equations")
-                    
-            except TimeoutException:
+            generation_args_list.append((self.field, self.monomial_order, self.branch, self.cico, self.round, self.seed, constant_vector_list))
+
+        ### The systems already generated are read from the cache, the other ones are generated in a new process with a timeout and returned in a Queue
+
+        generation_outcomes = SystemStore(enabled=self.system_cache).generate(self.permutation, generate_system_of_equations_cico_fun, generation_args_list, self.system_generation_timeout)
+
+        for (outcome, result) in generation_outcomes:
+
+            if outcome == "done":
+                system_of_equations, system_of_equations_generation_time = result
+
+            elif outcome == "timeout":
                 system_of_equations, system_of_equations_generation_time = "timeout", "timeout"
                 print("Timeout system of equations generation")
 
-            except Exception as e:
+            else:
                 system_of_equations, system_of_equations_generation_time = "failed", "failed"
                 print("System of equations generation has failed\n")
-                print(f"The error is: {e}")
+                print(f"The error is: {result}")
+
+            ### Add to the list of systems of equations and the time to generate them
+
+            system_of_equations_list.append((system_of_equations, system_of_equations_generation_time))
 
-            finally:
+        ### Store the results in the result file, in the binary format that can be read without Sage
 
-                ### Add to the list of systems of equations and the time to generate them
+        generated_systems = [system_of_equations for (system_of_equations, _) in system_of_equations_list if isinstance(system_of_equations, list) and system_of_equations != []]
 
-                system_of_equations_list.append((system_of_equations, system_of_equations_generation_time))
+        if generated_systems != []:
+            R = generated_systems[0][0].parent()
+        else:
+            R = PolynomialRing(self.field, "X_0", 1, order=self.monomial_order)
 
-        ### Store the results in the result file
+        systems = [(sage_to_columns(system_of_equations) if isinstance(system_of_equations, list) else system_of_equations, system_of_equations_generation_time) for (system_of_equations, system_of_equations_generation_time) in system_of_equations_list]
 
-        with open(self.file_systems_generated, 'wb') as f_pkl:
-            dump(system_of_equations_list, f_pkl)
-            f_pkl.flush()
-        f_pkl.close()
+        write_systems(self.file_systems_generated, self.field.characteristic(), R.variable_names(), term_order_to_json(R.term_order()), systems)
     
 if __name__ == "__main__":
 
     folder_name = argv[1]
     folder_results = f"results/generate/{folder_name}"
     file_log = f"{folder_results}/{folder_name}.log"
-    file_systems_generated = f"{folder_results}/{folder_name}.pkl"
+    file_systems_generated = f"{folder_results}/{folder_name}.sys"
 
     if not exists(folder_results):
         makedirs(folder_results)
@@ -138,8 +137,9 @@ if __name__ == "__main__":
     seed = int(argv[9])
     constant_sparsity = int(argv[10])
     system_generation_timeout = float(argv[11])
+    system_cache = not (len(argv) > 12 and argv[12] == "nocache") ## Generate the systems again instead of reading them from the cache
 
-    generate = Generate(file_systems_generated, system_generation_timeout, field_size, monomial_order, permutation, cico, round, number_test, branch, seed, constant_sparsity)
+    generate = Generate(file_systems_generated, system_generation_timeout, field_size, monomial_order, permutation, cico, round, number_test, branch, seed, constant_sparsity, system_cache)
 
     generate.generate_systems()
 
@@ -1,6 +1,7 @@
 from sage.all import *
 from utils.constants_generation import *
 from utils.matrices_generation import *
+from utils.round_checkpoints import RoundCheckpoints
 from utils.timer import *
 
 
@@ -49,16 +50,23 @@ class Anemoi:
         z, eq = self.NonLinearLayer_CICO1_solve(y, new_var)
         return z, eq
     
-    def permutation_CICO1_solve(self, x, extra_vars):
+    def permutation_CICO1_solve(self, x, extra_vars, checkpoints=None):
         system_of_equations = []
-        for i in range(self.round):
+        start_round = 0
+        if checkpoints is not None:
+            start_round, state = checkpoints.restore(self.constant_vector_list, self.round, extra_vars[0].parent())
+            if state is not None:
+                x, system_of_equations = vector(state[0]), list(state[1])
+        for i in range(start_round, self.round):
             x, new_eq = self.round_function_CICO1_solve(x, extra_vars[i], i)
             system_of_equations.append(new_eq)
+            if checkpoints is not None:
+                checkpoints.save(i+1, self.constant_vector_list, (list(x), list(system_of_equations)))
         x = self.matrix * x
         system_of_equations.append(x[0])
         return system_of_equations
 
-def generate_system_of_equations(q, field, order, branch:int, cico, round, seed, constant_vector_list) -> tuple[list | None, float | None]:
+def generate_system_of_equations(q, field, order, branch:int, cico, round, seed, constant_vector_list, checkpoint_folder=None) -> tuple[list | None, float | None]:
 
     set_random_seed(seed)    
     R = PolynomialRing(field,["X_{}".format(i) for i in range(round+1)], order=order)
@@ -83,11 +91,17 @@ def generate_system_of_equations(q, field, order, branch:int, cico, round, seed,
         a = field.random_element()
     permutation = Anemoi(field, branch, round, constant_vector_list, a)
 
+    ### The state after each round is saved, the generation starts from the most advanced state saved with the same first constants
+    checkpoints = None
+    if checkpoint_folder is not None:
+        checkpoints = RoundCheckpoints(("anemoi", field, order, branch, cico, seed), checkpoint_folder)
+
     timer_gen_sys_of_eq = Chronograph("Generation system of equations Anemoi CICO-{}".format(cico))
 
     try:
-        system_of_equations = permutation.permutation_CICO1_solve(input_cico, var_list[1:])
-        time_gen_sys_of_eq = timer_gen_sys_of_eq.time_measure() 
+        system_of_equations = permutation.permutation_CICO1_solve(input_cico, var_list[1:], checkpoints)
+        ### The generation time of the rounds restored from a checkpoint is added to the time of the rounds applied
+        time_gen_sys_of_eq = timer_gen_sys_of_eq.time_measure() if checkpoints is None else checkpoints.generation_time() 
     except Exception as e:
         system_of_equations = None
         time_gen_sys_of_eq = None
@@ -1,6 +1,7 @@
 from sage.all import *
 from utils.constants_generation import *
 from utils.matrices_generation import *
+from utils.round_checkpoints import RoundCheckpoints
 from utils.timer import *
 
 
@@ -102,14 +103,22 @@ class Griffin:
         y, eq = self.NonLinearLayer_CICO1_solve(x, new_var)
         return self.LinearLayer(y, self.constants_list[i]), eq
     
-    def permutation_CICO1_solve(self, x, extra_vars):
+    def permutation_CICO1_solve(self, x, extra_vars, checkpoints=None):
         system_of_equations = []
-        for i in range(len(x)):
-            x[i] = x[i] ** self.d
-        x = self.matrix * x
-        for i in range(self.round):
+        start_round = 0
+        if checkpoints is not None:
+            start_round, state = checkpoints.restore(self.constants_list, self.round, extra_vars[0].parent())
+        if start_round == 0:
+            for i in range(len(x)):
+                x[i] = x[i] ** self.d
+            x = self.matrix * x
+        else:
+            x, system_of_equations = vector(state[0]), list(state[1])
+        for i in range(start_round, self.round):
             x, new_eq = self.round_function_CICO1_solve(x, i, extra_vars[i])
             system_of_equations.append(new_eq)
+            if checkpoints is not None:
+                checkpoints.save(i+1, self.constants_list, (list(x), list(system_of_equations)))
         # system_of_equations.append(reduce_degrees_mod_p(x[0], self.field.cardinality()-1))
         system_of_equations.append(x[0])
         return system_of_equations
@@ -136,7 +145,7 @@ class Griffin:
 
 #     return result
 
-def generate_system_of_equations(q, field, order, branch, cico, round, seed, constant_vector_list):
+def generate_system_of_equations(q, field, order, branch, cico, round, seed, constant_vector_list, checkpoint_folder=None):
 
     # p=field.cardinality()
 
@@ -169,8 +178,14 @@ def generate_system_of_equations(q, field, order, branch, cico, round, seed, con
     # permutation = Griffin(field, branch, round, constants_list, beta_eq)
     permutation = Griffin(field, branch, round, constants_list)
 
+    ### The state after each round is saved, the generation starts from the most advanced state saved with the same first constants (the last round of an instance has zero constants)
+    checkpoints = None
+    if checkpoint_folder is not None:
+        checkpoints = RoundCheckpoints(("griffin", field, order, branch, cico, seed), checkpoint_folder)
+
     timer_gen_sys_of_eq = Chronograph("Generation system of equations Griffin CICO-{}".format(cico))
-    system_of_equations = permutation.permutation_CICO1_solve(input_cico, var_list[1:])
-    time_gen_sys_of_eq = timer_gen_sys_of_eq.time_measure()
+    system_of_equations = permutation.permutation_CICO1_solve(input_cico, var_list[1:], checkpoints)
+    ### The generation time of the rounds restored from a checkpoint is added to the time of the rounds applied
+    time_gen_sys_of_eq = timer_gen_sys_of_eq.time_measure() if checkpoints is None else checkpoints.generation_time()
 
     q.put((system_of_equations, time_gen_sys_of_eq))
\ No newline at end of file
@@ -9,6 +9,7 @@ class Template:
         pass
 
 ### This is the only compulsory function, it must have the indicated signature
+### An optional last argument checkpoint_folder=None may be added: the function is then given the folder of the checkpoints of the rounds (see utils/round_checkpoints.py) to restart from the state saved after the previous rounds
 
 def generate_system_of_equations(q, field, order:str, branch:int, cico:int, round:int, seed:int, constant_vector_list:list) -> tuple[list | None, float | None]:
 
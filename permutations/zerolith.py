@@ -1,6 +1,7 @@
 from sage.all import *
 from utils.constants_generation import *
 from utils.matrices_generation import *
+from utils.round_checkpoints import RoundCheckpoints
 from utils.timer import *
 
 class Zerolith:
@@ -21,13 +22,20 @@ class Zerolith:
         input = self.matrix * input + self.constant_vector_list[i]
         return input
     
-    def permutation(self, input):
-        for i in range(self.round):
+    def permutation(self, input, checkpoints=None):
+        start_round = 0
+        if checkpoints is not None:
+            start_round, state = checkpoints.restore(self.constant_vector_list, self.round, input.base_ring())
+            if state is not None:
+                input = vector(state)
+        for i in range(start_round, self.round):
             input = self.round_function(input, i)
+            if checkpoints is not None:
+                checkpoints.save(i+1, self.constant_vector_list, list(input))
         return input
     
 
-def generate_system_of_equations(q, field, order, branch, cico, round, seed, constant_vector_list):
+def generate_system_of_equations(q, field, order, branch, cico, round, seed, constant_vector_list, checkpoint_folder=None):
     set_random_seed(seed)
     var_list = list(PolynomialRing(field,["X_{}".format(i) for i in range(cico)], order=order).gens())
     input = []
@@ -41,10 +49,15 @@ def generate_system_of_equations(q, field, order, branch, cico, round, seed, con
         input.append(input_element)
     input_cico = vector([field(0)] * cico + input)
     permutation = Zerolith(field, branch, round, constant_vector_list)
+    ### The state after each round is saved, the generation starts from the most advanced state saved with the same first constants
+    checkpoints = None
+    if checkpoint_folder is not None:
+        checkpoints = RoundCheckpoints(("zerolith", field, order, branch, cico, seed), checkpoint_folder)
     try:
         timer_gen_sys_of_eq = Chronograph("Generation system of equations Zerolith CICO-{}".format(cico))
-        system_of_equations = list(permutation.permutation(input_cico))[0:cico]
-        time_gen_sys_of_eq = timer_gen_sys_of_eq.time_measure() 
+        system_of_equations = list(permutation.permutation(input_cico, checkpoints))[0:cico]
+        ### The generation time of the rounds restored from a checkpoint is added to the time of the rounds applied
+        time_gen_sys_of_eq = timer_gen_sys_of_eq.time_measure() if checkpoints is None else checkpoints.generation_time() 
     except Exception as e:
         system_of_equations = None
         time_gen_sys_of_eq = None
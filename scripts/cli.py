@@ -1,16 +1,17 @@
-from os import chdir, killpg
+from os import chdir, killpg, makedirs
 from signal import SIGINT
 from pathlib import Path
 from subprocess import Popen
 from argparse import ArgumentParser
 from argcomplete import autocomplete
 
-from sage.all import *
-
-from utils.pickle_utils import read_and_print_pkl_file
+from utils.pickle_utils import read_and_print_pkl_file, read_result_dicts
+from utils.results_table import consolidate_results, consolidate_results_continuously
+from utils.system_format import SystemsFile
 
 from analysis import analysis_primitives
 from analysis import compare_primitives_random
+from analysis.batch_rendering import render_figures
 
 def run_benchmark(args):
 
@@ -24,7 +25,7 @@ def run_benchmark(args):
         """
 
         ### Start the benchmark
-        child_process = Popen(["bash", "benchmark/benchmark.sh", args.permutation, args.configid, args.setid], start_new_session=True)
+        child_process = Popen(["bash", "benchmark/benchmark.sh", args.permutation, args.configid, args.setid] + (["extend"] if args.extend else ["resume"] if args.resume else []), start_new_session=True)
         child_process.wait()
 
     except KeyboardInterrupt as e:
@@ -43,7 +44,7 @@ def comparison_random(args):
         """
 
         ### Start the benchmark
-        child_process = Popen(["bash", "comparisons_random/comparisons.sh", args.configid], start_new_session=True)
+        child_process = Popen(["bash", "comparisons_random/comparisons.sh", args.configid] + (["resume"] if args.resume else []), start_new_session=True)
         child_process.wait()
 
     except KeyboardInterrupt as e:
@@ -61,7 +62,7 @@ def generate_equations(args):
     try:
 
         ### Start the generation of equations using output folder name, field, monomial order, permutation name, cioc number, number of rounds, number of branches, the random seed and constant sparsities
-        child_process = Popen(["python3", "generate/generate.py", args.output, str(args.field), args.monomialorder, args.permutation, str(args.cico), str(args.round), str(args.number), str(args.branch), str(args.seed), str(args.constantsparsity), str(args.timeoutgeneration)], start_new_session=True)
+        child_process = Popen(["python3", "generate/generate.py", args.output, str(args.field), args.monomialorder, args.permutation, str(args.cico), str(args.round), str(args.number), str(args.branch), str(args.seed), str(args.constantsparsity), str(args.timeoutgeneration)] + (["nocache"] if args.no_cache else []), start_new_session=True)
         child_process.wait()
 
     except KeyboardInterrupt as e:
@@ -76,7 +77,7 @@ def solve_equations(args):
 
     try:
 
-        child_process = Popen(["python3", "solve/algebraic_attack.py", args.output, args.input, args.algo_gb, args.options, args.algo_order_change, str(args.timeoutcomputation)], start_new_session=True)
+        child_process = Popen(["python3", "solve/algebraic_attack.py", args.output, args.input, args.algo_gb, args.options, args.algo_order_change, str(args.timeoutcomputation), str(args.race), str(args.memorylimit), str(args.linear_elimination), str(args.metrics_only), str(args.matrix_profile)], start_new_session=True)
         child_process.wait()
 
     except KeyboardInterrupt as e:
@@ -86,13 +87,26 @@ def read(args):
     
     if args.mode == 'generate':
 
-        file_to_read = f"results/generate/{args.folder}/{args.folder}.pkl"
-        read_and_print_pkl_file(file_to_read)
+        file_to_read = f"results/generate/{args.folder}/{args.folder}.sys"
+
+        if Path(file_to_read).exists():
+
+            ### The systems are printed from the binary file without Sage
+            systems_file = SystemsFile(file_to_read)
+            for i in range(len(systems_file)):
+                if systems_file.status(i) is not None:
+                    print((systems_file.status(i), systems_file.generation_time(i)))
+                else:
+                    print(([systems_file.equation_to_str(exponents, coefficients) for (exponents, coefficients) in systems_file.equations(i)], systems_file.generation_time(i)))
+
+        else:
+            read_and_print_pkl_file(f"results/generate/{args.folder}/{args.folder}.pkl")
 
     elif args.mode == 'solve':
 
         file_to_read = f"results/solve/{args.folder}/{args.folder}.pkl"
-        read_and_print_pkl_file(file_to_read)
+        for result_dict in read_result_dicts(file_to_read):
+            print(result_dict)
 
     else:
         print("Not supported mode")
@@ -105,6 +119,14 @@ def analysis_benchmark(args):
     elif args.mode == 'compare':
         analysis_primitives.algorithms_comparison(f"results/benchmark/{args.folder}", args.variable, args.algo)
 
+    elif args.mode == 'batch':
+        render_figures(f"results/benchmark/{args.folder}", args.output or f"results/benchmark/{args.folder}/figures", args.variable, None, args.formats.split(","), args.processes, args.force)
+
+    elif args.mode == 'cost':
+        if args.output is not None:
+            makedirs(args.output, exist_ok=True)
+        analysis_primitives.order_change_cost(f"results/benchmark/{args.folder}", args.output, args.formats.split(","))
+
     else:
         print("Not supported mode")
 
@@ -117,9 +139,31 @@ def analysis_random_comparison(args):
     elif args.mode == 'compare':
         compare_primitives_random.algorithms_comparison(f"results/benchmark/{args.folder}", f"results/comparisons/random_compare_{args.folder}", args.variable, args.algo)
 
+    elif args.mode == 'batch':
+        render_figures(f"results/benchmark/{args.folder}", args.output or f"results/comparisons/random_compare_{args.folder}/figures", args.variable or "round", f"results/comparisons/random_compare_{args.folder}", args.formats.split(","), args.processes, args.force)
+
     else:
         print("Not supported mode")
 
+def consolidate(args):
+
+    """Build the columnar table of the results of a benchmark or of a comparison to random ideals
+    
+    :param args: arguments from the command line
+    """
+
+    folder_results = f"results/comparisons/random_compare_{args.folder}" if args.random else f"results/benchmark/{args.folder}"
+
+    try:
+
+        if args.watch is not None:
+            consolidate_results_continuously(folder_results, args.watch)
+        else:
+            consolidate_results(folder_results, args.force)
+
+    except KeyboardInterrupt as e:
+        pass
+
 
 """
 
@@ -141,11 +185,14 @@ def main():
     parser_benchmark.add_argument("-p", "--permutation", help="Permutation/Modelling", required=True)
     parser_benchmark.add_argument("-c", "--configid", help="Configuration ID", required=True)
     parser_benchmark.add_argument("-s", "--setid", help="Set ID", required=True)
+    parser_benchmark.add_argument("--resume", action="store_true", help="Resume a stopped benchmark: keep its parameters and results and only perform the unfinished experiments")
+    parser_benchmark.add_argument("--extend", action="store_true", help="Extend an existing benchmark with the new combinations of its input file (algorithms, rounds...), with the same seed, and only perform them")
     parser_benchmark.set_defaults(func=run_benchmark)
 
     # --- Comparison random mode ---
     parser_random = subparsers.add_parser("random_comparison", help="Run comparisons with random ideals of the same shape")
     parser_random.add_argument("-c", "--configid", help="Configuration ID", required=True)
+    parser_random.add_argument("--resume", action="store_true", help="Resume a stopped comparison: keep its parameters and results and only perform the unfinished experiments")
     parser_random.set_defaults(func=comparison_random)
 
     # --- Equation generation mode ---
@@ -161,6 +208,7 @@ def main():
     parser_gen.add_argument("-cs", "--constantsparsity", type=int, default=0, help="Constant sparsity")
 
     parser_gen.add_argument("-tg", "--timeoutgeneration", type=int, default=10, help="Timeout generation of equation")
+    parser_gen.add_argument("--no-cache", action="store_true", help="Generate the systems again instead of reading them from the cache of the generated systems (results/cache)")
 
     parser_gen.add_argument("-o", "--output", default="generate", help="Output folder name")
     parser_gen.set_defaults(func=generate_equations)
@@ -172,6 +220,12 @@ def main():
     parser_solve.add_argument("-op", "--options", default="None", type=str, help="Options of the Gröbner basis algorithm")
     parser_solve.add_argument("-oc", "--algo_order_change", default="gwalk", type=str, help="Term order change algorithm")
     parser_solve.add_argument("-tc", "--timeoutcomputation", type=int, default=10, help="Timeout algebraic attack")
+    parser_solve.add_argument("--race", nargs="?", const="libsingular:slimgb_direct,msolve,giac:gbasis,libsingular:std_direct", default=None, type=str, help="Race Gröbner basis algorithms (comma separated list) on separate cores and keep the first one to finish")
+    parser_solve.add_argument("-ml", "--memorylimit", type=float, default=None, help="Memory limit of the resolution of a system in GiB, the system is marked 'memout' when it is exceeded")
+
+    parser_solve.add_argument("--linear-elimination", action="store_true", help="Eliminate the variables of the equations of degree 1 by substitution before the computation of the Gröbner basis")
+    parser_solve.add_argument("--metrics-only", action="store_true", help="Only compute the dimension, the degree, the Hilbert series and the radicality of the ideals from the first Gröbner basis, without the term order change")
+    parser_solve.add_argument("--matrix-profile", action="store_true", help="Also measure the density of the multiplication matrices of the zero-dimensional ideals, after the other results (see the cost mode of analysis_benchmark)")
 
     parser_solve.add_argument("-i", "--input", type=str, help="Input file with system(s) of equations to solve")
     parser_solve.add_argument("-o", "--output", default="solve", help="Output folder name")
@@ -187,22 +241,40 @@ def main():
     # --- Analyse benchmark results mode ---
 
     parser_analysis_benchmark = subparsers.add_parser("analysis_benchmark", help="Analysis of a benchmark")
-    parser_analysis_benchmark.add_argument("-m", "--mode", type=str, help="'compare' or 'analyse'")
+    parser_analysis_benchmark.add_argument("-m", "--mode", type=str, help="'compare', 'analyse', 'cost' (term order change time against the density of the multiplication matrices) or 'batch' (save all the figures without display)")
     parser_analysis_benchmark.add_argument("-f", "--folder", type=str, help="Folder with benchmark results")
     parser_analysis_benchmark.add_argument("-v", "--variable", type=str, default="round", help="Variable for x-axis")
     parser_analysis_benchmark.add_argument("-a", "--algo", type=str, default="groebner_time", help="Timing to analyse: Gröbner basis computation or Term order change")
+    parser_analysis_benchmark.add_argument("-o", "--output", type=str, default=None, help="Folder of the figures of the batch mode, the figures folder of the benchmark by default (folder of the figure of the cost mode, displayed by default)")
+    parser_analysis_benchmark.add_argument("--formats", type=str, default="png", help="Formats of the figures of the batch mode (comma separated list, png, svg...)")
+    parser_analysis_benchmark.add_argument("-j", "--processes", type=int, default=None, help="Number of processes rendering the figures of the batch mode")
+    parser_analysis_benchmark.add_argument("--force", action="store_true", help="Render again the figures whose inputs have not changed")
     
     parser_analysis_benchmark.set_defaults(func=analysis_benchmark)
 
     # --- Analyse random comparison mode ---
 
     parser_analysis_random_comparison = subparsers.add_parser("analysis_random", help="Analysis of a comparison to random ideals")
-    parser_analysis_random_comparison.add_argument("-m", "--mode", type=str, help="'compare' or 'analyse'")
+    parser_analysis_random_comparison.add_argument("-m", "--mode", type=str, help="'compare', 'analyse' or 'batch' (save all the figures without display)")
     parser_analysis_random_comparison.add_argument("-f", "--folder", type=str, help="Folder with benchmark results")
     parser_analysis_random_comparison.add_argument("-v", "--variable", type=str, help="Variable for x-axis")
     parser_analysis_random_comparison.add_argument("-a", "--algo", type=str, default="groebner_time", help="Timing to analyse: Gröbner basis computation or Term order change")
+    parser_analysis_random_comparison.add_argument("-o", "--output", type=str, default=None, help="Folder of the figures of the batch mode, the figures folder of the comparison by default")
+    parser_analysis_random_comparison.add_argument("--formats", type=str, default="png", help="Formats of the figures of the batch mode (comma separated list, png, svg...)")
+    parser_analysis_random_comparison.add_argument("-j", "--processes", type=int, default=None, help="Number of processes rendering the figures of the batch mode")
+    parser_analysis_random_comparison.add_argument("--force", action="store_true", help="Render again the figures whose inputs have not changed")
     
     parser_analysis_random_comparison.set_defaults(func=analysis_random_comparison)
+
+    # --- Consolidate results mode ---
+
+    parser_consolidate = subparsers.add_parser("consolidate", help="Build the columnar table of the results of a benchmark, used by the analysis")
+    parser_consolidate.add_argument("-f", "--folder", type=str, help="Folder with benchmark results", required=True)
+    parser_consolidate.add_argument("-r", "--random", action="store_true", help="Consolidate the comparison to random ideals of the benchmark")
+    parser_consolidate.add_argument("-w", "--watch", type=float, default=None, help="Consolidate again every WATCH seconds while the benchmark is running")
+    parser_consolidate.add_argument("--force", action="store_true", help="Build the table even if it is up to date")
+    parser_consolidate.set_defaults(func=consolidate)
+
     autocomplete(parser)
     args = parser.parse_args()
     args.func(args)
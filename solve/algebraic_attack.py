@@ -1,13 +1,13 @@
-from sys import executable, stdout, stderr, argv
-from os import remove, makedirs
-from os.path import exists
+from sys import argv
+from os import makedirs
+from os.path import exists, dirname
 from pickle import dump
-from subprocess import TimeoutExpired, CalledProcessError, Popen
 from ast import literal_eval
-from signal import SIGINT
-from tempfile import NamedTemporaryFile
 
-from utils.pickle_utils import change_dict_failed_to_timeout, read_pkl_file
+from utils.exception import TimeoutException, MemoutException
+from utils.pickle_utils import change_dict_failed_to_timeout, change_dict_failed_to_status, compact_journal, read_pkl_file
+from utils.solver_pool import SolverPool
+from utils.system_format import SystemsFile, SystemReference
 from utils.utils_all import redirect_all_output
 
 def system_of_equation_shape(system_of_equation:list):
@@ -22,7 +22,7 @@ def system_of_equation_shape(system_of_equation:list):
     for equation in system_of_equation:
         vars = equation.variables()
         indices = [int(str(var).split('_')[1]) for var in vars]
-        system_of_equation_shape.append((len(equation.monomials()), indices, equation.total_degree()))
+        system_of_equation_shape.append((len(equation.monomials()), indices, int(equation.total_degree())))
     return system_of_equation_shape
 
 class Solve:
@@ -36,10 +36,15 @@ class Solve:
         :param dict[str, list[dict[str, any]]] options: Options for the Gröbner basis algorithm
         :param str algo_order_change: Algorithm to use for the temr order change step
         :param float full_computation_timeout: timeout to solve the systems
+        :param list[str] race_backends: Gröbner basis algorithms racing on separate cores for every system, the first one to finish is kept. None to only use algo_gb.
+        :param int memory_limit: Maximal memory in bytes of the resolution of a system, no limit if it is None
+        :param bool linear_elimination: True to eliminate the variables of the equations of degree 1 before the computation of the Gröbner basis
+        :param bool metrics_only: True to only compute the dimension, the degree, the Hilbert series and the radicality of the ideals, without the term order change
+        :param bool matrix_profile: True to also measure the density of the multiplication matrices of the zero-dimensional ideals, after the other results
         
         """
 
-    def __init__(self, file_log_result_path:str, file_output_result_path:str, file_input_path:str, algo_gb:str, options:dict[str, list[dict[str, any]]], algo_order_change:str, full_computation_timetout:float):
+    def __init__(self, file_log_result_path:str, file_output_result_path:str, file_input_path:str, algo_gb:str, options:dict[str, list[dict[str, any]]], algo_order_change:str, full_computation_timetout:float, race_backends:list[str]=None, memory_limit:int=None, linear_elimination:bool=False, metrics_only:bool=False, matrix_profile:bool=False):
 
         self.file_log_result_path = file_log_result_path
         self.file_output_result_path = file_output_result_path
@@ -47,10 +52,14 @@ class Solve:
         self.input_file_path = file_input_path
 
         self.full_computation_timetout = full_computation_timetout
+        self.memory_limit = memory_limit
 
         self.algo_gb = algo_gb
         self.options = options
         self.algo_order_change = algo_order_change
+
+        ### The first Gröbner bases are stored next to the systems to be reused when they are solved with another term order change algorithm
+        self.solver_options = {"artifact_store_folder" : f"{dirname(file_input_path)}/artifacts", "race_backends" : race_backends, "linear_elimination" : linear_elimination, "metrics_only" : metrics_only, "matrix_profile" : matrix_profile}
         
     def solve(self):
 
@@ -59,62 +68,64 @@ class Solve:
 
         open(self.file_output_result_path, "wb").close()
 
-        system_of_equations_list = read_pkl_file(self.input_file_path)
+        if self.input_file_path.endswith(".sys"):
+
+            ### Binary format: only the header is read here, without Sage. The solver processes receive a reference to their system and build it.
+
+            systems_file = SystemsFile(self.input_file_path)
+            system_of_equations_list = [(SystemReference(self.input_file_path, i) if systems_file.status(i) is None else systems_file.to_sage(i), systems_file.generation_time(i)) for i in range(len(systems_file))]
+            shapes = [systems_file.shape(i) if systems_file.status(i) is None else None for i in range(len(systems_file))]
+
+        else:
+
+            system_of_equations_list = read_pkl_file(self.input_file_path)
+            shapes = [system_of_equation_shape(system_of_equations) if isinstance(system_of_equations, list) else None for (system_of_equations, _) in system_of_equations_list]
+
         number_test = len(system_of_equations_list)
 
         for (i, (system_of_equations, generation_time)) in enumerate(system_of_equations_list):
 
             ### Define the dictionnary of the algebraic attack with the data of the generation of the system
 
-            results_dict = {"system_of_equation_shape" : system_of_equation_shape(system_of_equations), "generation_time" : generation_time, "groebner_time" : "failed", "solving_degree" : "failed", "ideal_dimension" : "failed", "transformation_basis_time" : "failed", "radical_ideal" : "failed", "shape_position" : "failed", "ideal_degree" : "failed"}
+            results_dict = {"system_of_equation_shape" : shapes[i], "generation_time" : generation_time, "groebner_time" : "failed", "solving_degree" : "failed", "ideal_dimension" : "failed", "transformation_basis_time" : "failed", "radical_ideal" : "failed", "shape_position" : "failed", "ideal_degree" : "failed"}
 
             with open(self.file_output_result_path, "ab") as f:
                 dump(results_dict, f)
                 f.flush()
             f.close()
 
-        for (i, (system_of_equations, generation_time)) in enumerate(system_of_equations_list):
+        ### Pool of solver processes where Sage is imported only once for all the systems
 
-            if system_of_equations is not None and system_of_equations != "timeout_generation" and system_of_equations != "failed_generation":
-
-                ### If the system of equations have been generated then try to solve it
-                try:
-                    
-                    monomial_order = system_of_equations[0].parent().term_order()
-
-                    ### Store the inputs of the solve script in a file as system of equations may not be used as input due to its potential length
-
-                    with NamedTemporaryFile(delete=False) as f:
-                        dump((self.file_log_result_path, self.file_output_result_path, i, number_test, system_of_equations, self.algo_gb, monomial_order, self.algo_order_change, self.options), f) ### Order to change
-                        f.flush()
-                        input_file = f.name
-
-                    proc = Popen(
-                        [executable, "utils/systems_solver.py", input_file],
-                        stdout=stdout,
-                        stderr=stderr,
-                        text=True,
-                        start_new_session=True
-                    )
-
-                    ### Tiemout the full resolution of the system
-                    
-                    proc.wait(timeout=full_computation_timetout)
-                    
-                except TimeoutExpired:
-                    print("Timeout in the solving of the system of equations")
-                    proc.send_signal(SIGINT)
-                    _ = change_dict_failed_to_timeout(self.file_output_result_path, i, number_test)
-                    
-                except CalledProcessError as e:
-                    print(f"Error in algebraic attack: {e}")
-                
-                except KeyboardInterrupt:
-                    proc.send_signal(SIGINT)
+        solver_pool = SolverPool(memory_limit=self.memory_limit)
+
+        try:
+
+            for (i, (system_of_equations, generation_time)) in enumerate(system_of_equations_list):
+
+                if isinstance(system_of_equations, (list, SystemReference)) and system_of_equations != []:
 
-                finally:
-                    if exists(input_file):
-                        remove(input_file)
+                    ### If the system of equations have been generated then try to solve it
+                    try:
+                        
+                        ### The monomial order of a referenced system is read by the solver process from the file
+                        monomial_order = None if isinstance(system_of_equations, SystemReference) else system_of_equations[0].parent().term_order()
+
+                        ### The inputs of the solve function are sent to a solver process already started
+
+                        solver_pool.solve((self.file_log_result_path, self.file_output_result_path, i, number_test, system_of_equations, self.algo_gb, monomial_order, self.algo_order_change, self.options, self.solver_options), self.full_computation_timetout)
+                        
+                    except TimeoutException:
+                        print("Timeout in the solving of the system of equations")
+                        _ = change_dict_failed_to_timeout(self.file_output_result_path, i, number_test)
+
+                    except MemoutException:
+                        print("Memory limit exceeded in the solving of the system of equations")
+                        _ = change_dict_failed_to_status(self.file_output_result_path, i, number_test, "memout")
+
+        finally:
+            solver_pool.close()
+            ### Fold the changes of the journal in the result file
+            compact_journal(self.file_output_result_path)
                 
 
 if __name__ == "__main__":
@@ -126,7 +137,10 @@ if __name__ == "__main__":
     file_log_result_path = f"results/solve/{folder_result_name}/{folder_result_name}.log"
     file_output_result_path = f"results/solve/{folder_result_name}/{folder_result_name}.pkl"
 
-    file_input_path = f"results/generate/{folder_input_name}/{folder_input_name}.pkl"
+    file_input_path = f"results/generate/{folder_input_name}/{folder_input_name}.sys"
+
+    if not exists(file_input_path): ### Systems generated before the binary format
+        file_input_path = f"results/generate/{folder_input_name}/{folder_input_name}.pkl"
 
     if not exists(folder_result_path):
         makedirs(folder_result_path)
@@ -142,8 +156,22 @@ if __name__ == "__main__":
 
     algo_order_change = argv[5]
     full_computation_timetout = float(argv[6])
+
+    if len(argv) > 7 and argv[7] != "None":
+        race_backends = argv[7].split(",")
+    else:
+        race_backends = None
+
+    if len(argv) > 8 and argv[8] != "None":
+        memory_limit = int(float(argv[8]) * 2**30) ### Given in GiB
+    else:
+        memory_limit = None
+
+    linear_elimination = len(argv) > 9 and argv[9] == "True"
+    metrics_only = len(argv) > 10 and argv[10] == "True"
+    matrix_profile = len(argv) > 11 and argv[11] == "True"
     
-    solve = Solve(file_log_result_path, file_output_result_path, file_input_path, algo_gb, options, algo_order_change, full_computation_timetout)
+    solve = Solve(file_log_result_path, file_output_result_path, file_input_path, algo_gb, options, algo_order_change, full_computation_timetout, race_backends, memory_limit, linear_elimination, metrics_only, matrix_profile)
 
     solve.solve()
 
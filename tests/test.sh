@@ -2,6 +2,12 @@
 
 cd "$(dirname "$0")"
 
+### Unit tests of the modules without Sage
+
+echo "Unit tests"
+(cd .. && python3 -m unittest discover -s tests)
+echo ""
+
 ### Generation tests
 
 echo "Generate Anemoi equations"
@@ -54,6 +60,30 @@ tail -n 1 "../results/solve/zerolith/zerolith.log"
 pesscy read -m 'solve' -f zerolith
 echo ""
 
+echo "Solve Anemoi equations with a race of the Gröbner basis algorithms"
+pesscy solve -g singular:groebner -i anemoi -o anemoi_race --race libsingular:slimgb_direct,libsingular:std_direct -tc 50
+tail -n 1 "../results/solve/anemoi_race/anemoi_race.log"
+pesscy read -m 'solve' -f anemoi_race
+echo ""
+
+echo "Solve Anemoi equations, metrics only"
+pesscy solve -g singular:std -i anemoi -o anemoi_metrics --metrics-only -tc 50
+tail -n 1 "../results/solve/anemoi_metrics/anemoi_metrics.log"
+pesscy read -m 'solve' -f anemoi_metrics
+echo ""
+
+echo "Solve Anemoi equations with the sparse FGLM"
+pesscy solve -g singular:std -i anemoi -o anemoi_sparse_fglm -oc sparse_fglm -tc 50
+tail -n 1 "../results/solve/anemoi_sparse_fglm/anemoi_sparse_fglm.log"
+pesscy read -m 'solve' -f anemoi_sparse_fglm
+echo ""
+
+echo "Solve Anemoi equations after the linear elimination"
+pesscy solve -g singular:std -i anemoi -o anemoi_linear_elimination -oc fglm --linear-elimination -tc 50
+tail -n 1 "../results/solve/anemoi_linear_elimination/anemoi_linear_elimination.log"
+pesscy read -m 'solve' -f anemoi_linear_elimination
+echo ""
+
 ### Benchmark tests
 
 echo "Benchmark Anemoi"
@@ -68,6 +98,25 @@ tail -n 1 "../results/benchmark/zerolith_set_0_0/logs/1.log"
 tail -n 1 "../results/benchmark/zerolith_set_0_0/logs/global.log"
 echo ""
 
+echo "Resume the benchmark Anemoi"
+pesscy benchmark -p anemoi -c 0 -s 0 --resume
+tail -n 1 "../results/benchmark/anemoi_set_0_0/logs/global.log"
+echo ""
+
+echo "Extend the benchmark Anemoi"
+pesscy benchmark -p anemoi -c 0 -s 0 --extend
+tail -n 1 "../results/benchmark/anemoi_set_0_0/logs/global.log"
+echo ""
+
+echo "Consolidate the benchmark Anemoi"
+pesscy consolidate -f anemoi_set_0_0
+echo ""
+
+echo "Render the figures of the benchmark Anemoi"
+pesscy analysis_benchmark -m batch -f anemoi_set_0_0
+ls "../results/benchmark/anemoi_set_0_0/figures" | head -n 5
+echo ""
+
 ### Comparison random tests
 
 echo "Comparison Anemoi"
@@ -80,4 +129,14 @@ echo ""
 echo "Comparison Zerolith"
 pesscy random_comparison -c 3
 tail -n 1 "../results/comparisons/random_compare_zerolith_set_0_0/logs/1.log"
-tail -n 1 "../results/comparisons/random_compare_zerolith_set_0_0/logs/global.log"
\ No newline at end of file
+tail -n 1 "../results/comparisons/random_compare_zerolith_set_0_0/logs/global.log"
+
+echo ""
+
+echo "Consolidate the comparison Anemoi"
+pesscy consolidate -f anemoi_set_0_0 -r
+echo ""
+
+echo "Render the figures of the comparison Anemoi"
+pesscy analysis_random -m batch -f anemoi_set_0_0
+ls "../results/comparisons/random_compare_anemoi_set_0_0/figures" | head -n 5
\ No newline at end of file
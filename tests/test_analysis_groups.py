@@ -0,0 +1,83 @@
+from itertools import product
+from random import Random
+import unittest
+
+from utils.analysis import algorithms_groups, dict_keys_equal_except_keys_specified, solving_methods_groups
+
+def pairwise_groups(parameters:list[dict], keys_to_ignore:list, keys_to_ignore_joined:list, joined, skipped=None):
+
+    """
+    Groups of parameters built by comparing every pair of parameters, as the analysis did before group_parameters
+    """
+
+    parameters_treated = []
+    groups = []
+
+    for parameter in parameters:
+
+        if skipped is not None and skipped(parameter):
+            parameters_treated.append(parameter)
+            continue
+
+        if parameter in parameters_treated:
+            continue
+
+        parameters_treated.append(parameter)
+        parameters_used = [parameter]
+
+        for parameter_compared in parameters:
+            if dict_keys_equal_except_keys_specified(parameter, parameter_compared, keys_to_ignore) and parameter_compared != parameter:
+                parameters_treated.append(parameter_compared)
+                parameters_used.append(parameter_compared)
+            if keys_to_ignore_joined and dict_keys_equal_except_keys_specified(parameter, parameter_compared, keys_to_ignore_joined) and parameter_compared != parameter and joined(parameter_compared) and not parameter_compared in parameters_used:
+                parameters_treated.append(parameter_compared)
+                parameters_used.append(parameter_compared)
+
+        groups.append(parameters_used)
+
+    return groups
+
+def random_parameters(random:Random):
+
+    """
+    Return a random subset of a grid of parameters of a benchmark, with the elimination algorithms and orders
+    """
+
+    grid = product(["degrevlex", "lex"], ["singular:std", "msolve", "eliminate:giac", "eliminate:libsingular"], [None, "fglm", "gwalk"], [None, {"prot" : "sage"}], [2, 3], [1, 2, 3], [0, 1])
+
+    parameters = []
+
+    for (monomial_order, algo_gb, algo_order_change, options, branch, round, cico) in grid:
+        if random.random() < 0.5:
+            parameters.append({"id" : len(parameters) + 1, "monomial_order" : monomial_order, "algo_gb" : algo_gb, "algo_order_change" : algo_order_change, "options" : options, "branch" : branch, "round" : round, "cico" : cico, "seed" : random.randint(0, 3)})
+
+    random.shuffle(parameters)
+
+    return parameters
+
+class TestGroupParameters(unittest.TestCase):
+
+    def test_solving_methods_groups(self):
+        random = Random(0)
+
+        for _ in range(5):
+            parameters = random_parameters(random)
+            for variable in ["round", "branch"]:
+                expected = pairwise_groups(parameters, ["id", variable, "seed"], ["id", variable, "seed", "algo_order_change", "monomial_order"], lambda parameter: parameter["algo_order_change"] is None)
+                self.assertEqual(solving_methods_groups(parameters, variable), expected)
+
+    def test_algorithms_groups(self):
+        random = Random(1)
+        is_elimination = lambda parameter: parameter["algo_gb"].startswith("eliminate:giac") or parameter["algo_gb"].startswith("eliminate:libsingular")
+
+        for _ in range(5):
+            parameters = random_parameters(random)
+
+            expected = pairwise_groups(parameters, ["id", "round", "algo_gb", "seed", "options"], ["id", "round", "algo_gb", "seed", "options", "algo_order_change"], is_elimination)
+            self.assertEqual(algorithms_groups(parameters, "round", "groebner_time"), expected)
+
+            expected = pairwise_groups(parameters, ["id", "round", "algo_order_change", "seed", "options"], [], is_elimination, skipped=lambda parameter: parameter["algo_order_change"] is None)
+            self.assertEqual(algorithms_groups(parameters, "round", "transformation_basis_time"), expected)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+from os import chdir, getcwd, makedirs
+from pickle import dump
+from tempfile import TemporaryDirectory
+import unittest
+
+from utils.forbidden_zone import ForbiddenZone
+
+def experiment(id:int, branch:int, round:int, **parameters):
+
+    """
+    Return a parameter dictionnary of a benchmark with the default values of the equality dimensions
+    """
+
+    parameter = {"id" : id, "field_char" : 65537, "monomial_order" : "degrevlex", "constant_sparsity" : 0, "cico" : 1, "algo_gb" : "msolve", "options" : {"prot" : "sage"}, "algo_order_change" : "fglm", "branch" : branch, "round" : round}
+    parameter.update(parameters)
+    return parameter
+
+class TestForbiddenZone(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = getcwd()
+        self.folder = TemporaryDirectory()
+        chdir(self.folder.name)
+        self.folder_results = "benchmark"
+        makedirs(self.folder_results + "/res")
+
+    def tearDown(self):
+        chdir(self.cwd)
+        self.folder.cleanup()
+
+    def test_dominance(self):
+        zone = ForbiddenZone(self.folder_results)
+        zone.add(experiment(1, 2, 3))
+
+        self.assertEqual(zone.dominating_timeout(experiment(2, 2, 3))["id"], 1)
+        self.assertEqual(zone.dominating_timeout(experiment(3, 3, 4))["id"], 1)
+        self.assertIsNone(zone.dominating_timeout(experiment(4, 2, 2)))
+        self.assertIsNone(zone.dominating_timeout(experiment(5, 1, 5)))
+        ### The term order change is not an equality dimension of a timeout of the first Gröbner basis
+        self.assertEqual(zone.dominating_timeout(experiment(6, 2, 4, algo_order_change="gwalk"))["id"], 1)
+        self.assertIsNone(zone.dominating_timeout(experiment(7, 2, 4, algo_gb="singular:std")))
+        self.assertIsNone(zone.dominating_timeout(experiment(8, 2, 4, options={"prot" : None})))
+        self.assertIsNone(zone.dominating_timeout(experiment(9, None, 4)))
+
+    def test_timeout_after_groebner_basis(self):
+        zone = ForbiddenZone(self.folder_results)
+        zone.add(experiment(1, 2, 3), after_groebner_basis=True)
+
+        self.assertEqual(zone.dominating_timeout(experiment(2, 2, 4))["id"], 1)
+        self.assertIsNone(zone.dominating_timeout(experiment(3, 2, 4, algo_order_change="gwalk")))
+
+    def test_shared_between_workers(self):
+        zone = ForbiddenZone(self.folder_results, monotone_dimensions=["round"])
+        other_worker_zone = ForbiddenZone(self.folder_results)
+
+        self.assertEqual(other_worker_zone.monotone_dimensions, ["round"])
+        self.assertIsNone(other_worker_zone.dominating_timeout(experiment(2, 1, 4)))
+
+        zone.add(experiment(1, 3, 3))
+
+        ### The branches are not a monotone dimension of this zone
+        self.assertEqual(other_worker_zone.dominating_timeout(experiment(2, 1, 4))["id"], 1)
+
+    def test_rebuild(self):
+        parameters = [experiment(1, 2, 2), experiment(2, 2, 3), experiment(3, 2, 4, algo_order_change="gwalk")]
+
+        results = {1 : [{"groebner_time" : 1.0, "ideal_dimension" : 0, "transformation_basis_time" : 2.0}], 2 : [{"groebner_time" : 5.0, "ideal_dimension" : 0, "transformation_basis_time" : "memout"}]}
+
+        for (id, dict_list) in results.items():
+            with open(f"{self.folder_results}/res/{id}.pkl", 'wb') as f_pkl:
+                for res_dict in dict_list:
+                    dump(res_dict, f_pkl)
+
+        ForbiddenZone(self.folder_results).rebuild(self.folder_results, parameters)
+
+        zone = ForbiddenZone(self.folder_results)
+
+        self.assertIsNone(zone.dominating_timeout(parameters[0]))
+        self.assertEqual(zone.dominating_timeout(experiment(4, 2, 4))["id"], 2)
+        ### The memout happened in the term order change, another algorithm may not be stopped
+        self.assertIsNone(zone.dominating_timeout(parameters[2]))
+
+if __name__ == "__main__":
+    unittest.main()
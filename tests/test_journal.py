@@ -0,0 +1,82 @@
+from os.path import exists, join
+from pickle import dump, dumps
+from tempfile import TemporaryDirectory
+import unittest
+
+from utils.pickle_utils import RECORD_HEADER, append_journal, change_dict_failed_to_status, compact_journal, journal_path, read_journal, read_result_dicts
+
+def write_results(filename:str, dict_list:list[dict]):
+
+    """
+    Write result dictionnaries in a result pickle file, as the experiments do before the resolution
+    """
+
+    with open(filename, 'wb') as f_pkl:
+        for res_dict in dict_list:
+            dump(res_dict, f_pkl)
+
+class TestJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = TemporaryDirectory()
+        self.filename = join(self.folder.name, "1.pkl")
+        write_results(self.filename, [{"groebner_time" : "failed", "ideal_degree" : "failed"}, {"groebner_time" : "failed", "ideal_degree" : "failed"}])
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_replay(self):
+        append_journal(self.filename, [(0, "groebner_time", 1.5), (1, "groebner_time", 2.5)])
+        append_journal(self.filename, [(0, "ideal_degree", 9)])
+
+        self.assertEqual(read_result_dicts(self.filename), [{"groebner_time" : 1.5, "ideal_degree" : 9}, {"groebner_time" : 2.5, "ideal_degree" : "failed"}])
+
+    def test_record_of_missing_system_is_ignored(self):
+        append_journal(self.filename, [(5, "groebner_time", 1.5)])
+
+        self.assertEqual(len(read_result_dicts(self.filename)), 2)
+
+    def test_torn_last_record(self):
+        append_journal(self.filename, [(0, "groebner_time", 1.5)])
+
+        ### The process is killed during the write of the second record
+        with open(journal_path(self.filename), 'ab') as f_journal:
+            f_journal.write(dumps((1, "groebner_time", 2.5))[:-3])
+
+        self.assertEqual(read_journal(self.filename), [(0, "groebner_time", 1.5)])
+        self.assertEqual(read_result_dicts(self.filename)[1]["groebner_time"], "failed")
+
+    def test_corrupt_record_is_skipped(self):
+        append_journal(self.filename, [(0, "groebner_time", 1.5)])
+
+        with open(journal_path(self.filename), 'ab') as f_journal:
+            f_journal.write(RECORD_HEADER + b"\xff\xfe corrupt")
+
+        append_journal(self.filename, [(1, "groebner_time", 2.5)])
+
+        self.assertEqual(read_journal(self.filename), [(0, "groebner_time", 1.5), (1, "groebner_time", 2.5)])
+
+    def test_compaction(self):
+        append_journal(self.filename, [(0, "groebner_time", 1.5), (1, "ideal_degree", 4)])
+
+        expected = read_result_dicts(self.filename)
+        compact_journal(self.filename)
+
+        self.assertFalse(exists(journal_path(self.filename)))
+        self.assertEqual(read_result_dicts(self.filename), expected)
+
+        ### A journal left by a process killed before its removal is replayed again with the same result
+        append_journal(self.filename, [(0, "groebner_time", 1.5)])
+        self.assertEqual(read_result_dicts(self.filename), expected)
+
+    def test_failed_to_status(self):
+        append_journal(self.filename, [(0, "groebner_time", 1.5)])
+
+        self.assertEqual(change_dict_failed_to_status(self.filename, 0, 2, "timeout"), 5)
+        self.assertEqual(change_dict_failed_to_status(self.filename, 1, 2, "error"), 0)
+        self.assertEqual(change_dict_failed_to_status(self.filename, 1, 2, "timeout"), 6)
+
+        self.assertEqual(read_result_dicts(self.filename), [{"groebner_time" : 1.5, "ideal_degree" : "timeout"}, {"groebner_time" : "error", "ideal_degree" : "error"}])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+from os import chdir, getcwd, makedirs, utime
+from os.path import exists
+from pickle import dump
+from tempfile import TemporaryDirectory
+import unittest
+
+from utils.parameter_index import index_path, parameters_path, read_chain, read_parameter, write_parameters
+
+def chains_parameters(chain_sizes:list[int]):
+
+    """
+    Return parameter dictionnaries with consecutive IDs for chains of the given sizes
+    """
+
+    parameters = []
+
+    for (chain, size) in enumerate(chain_sizes):
+        for round in range(size):
+            parameters.append({"id" : len(parameters) + 1, "chain" : chain, "round" : round + 1})
+
+    return parameters
+
+def write_parameters_without_index(folder_results:str, chain_sizes:list[int], parameters:list[dict]):
+
+    """
+    Write a parameters.pkl file as the benchmarks did before the index
+    """
+
+    with open(parameters_path(folder_results), 'wb') as f_param_pkl:
+        dump(chain_sizes, f_param_pkl)
+        for parameter in parameters:
+            dump(parameter, f_param_pkl)
+
+class TestParameterIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = getcwd()
+        self.folder = TemporaryDirectory()
+        chdir(self.folder.name)
+
+    def tearDown(self):
+        chdir(self.cwd)
+        self.folder.cleanup()
+
+    def test_read_parameter_and_chain(self):
+        folder_results = "indexed"
+        makedirs(folder_results)
+        chain_sizes = [3, 0, 2]
+        parameters = chains_parameters(chain_sizes)
+
+        write_parameters(folder_results, chain_sizes, parameters)
+
+        self.assertTrue(exists(index_path(folder_results)))
+        for parameter in parameters:
+            self.assertEqual(read_parameter(folder_results, parameter["id"]), parameter)
+        self.assertIsNone(read_parameter(folder_results, 42))
+
+        self.assertEqual(read_chain(folder_results, 0), parameters[:3])
+        self.assertEqual(read_chain(folder_results, 1), [])
+        self.assertEqual(read_chain(folder_results, 2), parameters[3:])
+
+    def test_missing_index_is_built(self):
+        folder_results = "without_index"
+        makedirs(folder_results)
+        chain_sizes = [2, 2]
+        parameters = chains_parameters(chain_sizes)
+
+        write_parameters_without_index(folder_results, chain_sizes, parameters)
+
+        self.assertEqual(read_parameter(folder_results, 3), parameters[2])
+        self.assertEqual(read_chain(folder_results, 1), parameters[2:])
+        self.assertTrue(exists(index_path(folder_results)))
+
+    def test_outdated_index_is_built_again(self):
+        folder_results = "outdated"
+        makedirs(folder_results)
+
+        write_parameters(folder_results, [2], chains_parameters([2]))
+
+        ### The parameters file is written again without its index, for instance by an older version
+        chain_sizes = [1, 3]
+        parameters = [dict(parameter, extended=True) for parameter in chains_parameters(chain_sizes)]
+        write_parameters_without_index(folder_results, chain_sizes, parameters)
+        utime(parameters_path(folder_results), ns=(0, 10**18))
+
+        self.assertEqual(read_parameter(folder_results, 4), parameters[3])
+        self.assertEqual(read_chain(folder_results, 1), parameters[1:])
+
+    def test_corrupt_index_is_built_again(self):
+        folder_results = "corrupt"
+        makedirs(folder_results)
+        parameters = chains_parameters([2])
+
+        write_parameters_without_index(folder_results, [2], parameters)
+        with open(index_path(folder_results), 'wb') as f_idx:
+            f_idx.write(b"not an index")
+
+        self.assertEqual(read_parameter(folder_results, 2), parameters[1])
+
+if __name__ == "__main__":
+    unittest.main()
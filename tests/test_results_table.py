@@ -0,0 +1,91 @@
+from os import makedirs
+from os.path import join
+from pickle import dump
+from tempfile import TemporaryDirectory
+import unittest
+
+import numpy as np
+
+from utils.pickle_utils import append_journal
+from utils.results_table import ResultsTable, consolidate_results
+
+PARAMETERS = [
+    {"id" : 1, "permutation" : "anemoi", "algo_gb" : "msolve", "algo_order_change" : None, "round" : 2, "branch" : 2, "number_test" : 2, "seed" : 11},
+    {"id" : 2, "permutation" : "anemoi", "algo_gb" : "singular:std", "algo_order_change" : "fglm", "round" : 3, "branch" : 2, "number_test" : 1, "seed" : 11},
+]
+
+RESULTS = {
+    1 : [
+        {"system_of_equation_shape" : [[3, 2, 3], [4, 2, 3]], "generation_time" : 0.25, "groebner_time" : 1.5, "solving_degree" : 7, "ideal_dimension" : 0, "transformation_basis_time" : "Metrics only", "ideal_degree" : 9, "shape_position" : True, "radical_ideal" : False, "hilbert_series" : "1 + 2*t", "groebner_resources" : {"wall_time" : 1.6, "peak_rss" : 2**20}},
+        {"system_of_equation_shape" : [[3, 2, 3], [4, 2, 3]], "generation_time" : 0.5, "groebner_time" : "timeout", "solving_degree" : None, "ideal_dimension" : "timeout", "transformation_basis_time" : "timeout", "ideal_degree" : "timeout", "shape_position" : "timeout", "radical_ideal" : "timeout"},
+    ],
+    2 : [
+        {"system_of_equation_shape" : [[5, 3, 3]], "generation_time" : 0.75, "groebner_time" : "error", "solving_degree" : -1, "ideal_dimension" : "error", "transformation_basis_time" : "error", "ideal_degree" : "error", "shape_position" : "error", "radical_ideal" : "error", "matrices_status" : "error"},
+    ],
+}
+
+class TestResultsTable(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = TemporaryDirectory()
+        self.folder_results = self.folder.name
+        makedirs(join(self.folder_results, "res"))
+
+        with open(join(self.folder_results, "parameters.pkl"), 'wb') as f_pkl:
+            dump([len(PARAMETERS)], f_pkl)
+            for parameter in PARAMETERS:
+                dump(parameter, f_pkl)
+
+        for (id, results) in RESULTS.items():
+            with open(join(self.folder_results, "res", f"{id}.pkl"), 'wb') as f_pkl:
+                for res_dict in results:
+                    dump(res_dict, f_pkl)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_round_trip(self):
+        self.assertTrue(consolidate_results(self.folder_results))
+
+        table = ResultsTable.load(self.folder_results)
+
+        self.assertEqual(len(table), 3)
+
+        for (id, results) in RESULTS.items():
+            experiment = table.experiment(id)
+            self.assertEqual(len(experiment), len(results))
+            for (row, res_dict) in zip(experiment, results):
+                for (key, value) in row.items():
+                    self.assertEqual(value, res_dict[key], key)
+                    self.assertIs(type(value), type(res_dict[key]), key)
+
+        self.assertIsNone(table.experiment(3))
+
+    def test_columns(self):
+        consolidate_results(self.folder_results)
+        table = ResultsTable.load(self.folder_results)
+
+        mask = table.mask(algo_gb="msolve", groebner_time_status="ok")
+        self.assertEqual(list(table.values("groebner_time", mask)), [1.5])
+        self.assertEqual(table.values("groebner_time_status"), ["ok", "timeout", "error"])
+        self.assertEqual(list(table.values("round")), [2, 2, 3])
+        self.assertEqual(list(table.values("monomials")), [7, 7, 5])
+        self.assertEqual(table.values("algo_order_change"), [None, None, "fglm"])
+        self.assertEqual(table.values("groebner_peak_rss")[0], 2**20)
+        self.assertTrue(np.isnan(table.values("groebner_peak_rss")[1]))
+
+    def test_outdated_table(self):
+        consolidate_results(self.folder_results)
+
+        self.assertFalse(consolidate_results(self.folder_results))
+
+        append_journal(join(self.folder_results, "res", "2.pkl"), [(0, "generation_time", 1.0)])
+
+        self.assertIsNone(ResultsTable.load(self.folder_results))
+        self.assertIsNotNone(ResultsTable.load(self.folder_results, fresh=False))
+
+        self.assertTrue(consolidate_results(self.folder_results))
+        self.assertEqual(ResultsTable.load(self.folder_results).experiment(2)[0]["generation_time"], 1.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+from itertools import product
+from random import Random
+import unittest
+
+from utils.staircase import count_standard_monomials, minimal_monomials
+
+def brute_force_count(leading_exponents:list[tuple[int, ...]], bounds:list[int]):
+
+    """
+    Count the monomials below the bounds that are not divisible by a leading monomial
+    """
+
+    return sum(1 for monomial in product(*[range(bound) for bound in bounds]) if not any(all(d <= e for (d, e) in zip(divisor, monomial)) for divisor in leading_exponents))
+
+class TestStaircase(unittest.TestCase):
+
+    def test_examples(self):
+        ### <x^2, y^3>
+        self.assertEqual(count_standard_monomials([(2, 0), (0, 3)]), 6)
+        ### <x^2, x*y, y^2>
+        self.assertEqual(count_standard_monomials([(2, 0), (1, 1), (0, 2)]), 3)
+        ### Full ring
+        self.assertEqual(count_standard_monomials([(0, 0, 0), (1, 2, 0)]), 0)
+        ### No pure power of the last variable, positive dimension
+        self.assertIsNone(count_standard_monomials([(2, 0), (1, 1)]))
+        self.assertIsNone(count_standard_monomials([(1, 0)], 2))
+
+    def test_minimal_monomials(self):
+        self.assertEqual(minimal_monomials({(1, 1), (2, 1), (1, 3), (0, 2)}), frozenset({(1, 1), (0, 2)}))
+
+    def test_random_zero_dimensional_ideals(self):
+        random = Random(0)
+
+        for _ in range(200):
+            variables = random.randint(1, 4)
+            bounds = [random.randint(1, 5) for _ in range(variables)]
+
+            ### The pure powers make the ideal zero-dimensional, the other leading monomials are below them
+            leading_exponents = [tuple(bound if k == j else 0 for k in range(variables)) for (j, bound) in enumerate(bounds)]
+            leading_exponents += [tuple(random.randint(0, bound) for bound in bounds) for _ in range(random.randint(0, 6))]
+            random.shuffle(leading_exponents)
+
+            self.assertEqual(count_standard_monomials(leading_exponents), brute_force_count(leading_exponents, bounds), leading_exponents)
+
+    def test_random_positive_dimensional_ideals(self):
+        random = Random(1)
+
+        for _ in range(100):
+            variables = random.randint(2, 4)
+            missing = random.randrange(variables)
+
+            ### No leading monomial is a pure power of the missing variable
+            other = (missing + 1) % variables
+            leading_exponents = [tuple(random.randint(1, 3) if k in [missing, other] else random.randint(0, 3) for k in range(variables)) for _ in range(random.randint(1, 5))]
+            leading_exponents += [tuple(3 if k == j else 0 for k in range(variables)) for j in range(variables) if j != missing]
+
+            self.assertIsNone(count_standard_monomials(leading_exponents), leading_exponents)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,17 @@
+from atexit import register
+from collections import defaultdict
+from functools import wraps
+from json import dumps
+from numbers import Real
 from pickle import load
 import numpy as np
 import math
 
+from utils.parameter_index import read_parameter, read_parameter_index
+from utils.pickle_utils import read_result_dicts
+from utils.results_cache import ResultsCache
+from utils.results_table import ResultsTable
+
 ALGOS_COLOR = {
     'libsingular:groebner': '#1f77b4',
     'libsingular:std': '#ff7f0e',
@@ -41,7 +51,8 @@ ALGOS_COLOR = {
     'awalk1': '#2ca02c',
     'awalk2': '#d62728',
     'twalk': '#9467bd',
-    'fwalk': '#8c564b'
+    'fwalk': '#8c564b',
+    'sparse_fglm': '#e377c2'
 
     }
 
@@ -70,7 +81,8 @@ ALGOS_MARKER= {
     'awalk1': 'x',
     'awalk2': '+',
     'twalk': 's',
-    'fwalk': '*'
+    'fwalk': '*',
+    'sparse_fglm': 'D'
     }
 
 NAMES_NICE_PRINTING = {
@@ -84,15 +96,33 @@ NAMES_NICE_PRINTING = {
     'constant_sparsity' : 'Constant sparsity',
     'monomial_order' : 'Monomial order',
     'number_test' : 'Number test',
+    'linear_elimination' : 'Linear elimination',
+    'metrics_only' : 'Metrics only',
+    'matrix_profile' : 'Matrix profile',
 
     'system_of_equation_shape' : 'System of equation shape',
     'generation_time' : 'Generation time',
+    'preprocessing_time' : 'Linear elimination time',
+    'multiplication_nnz' : 'Non zero coefficients of the multiplication matrices',
+    'multiplication_dense_columns' : 'Dense columns of the multiplication matrices',
     'groebner_time' : 'Gröbner time',
     'regularity_degree' : 'Regularity degree',
     'transformation_basis_time' : 'Term order change time',
     'ideal_degree' : 'Ideal degree'
     }
 
+STOPPED_VALUES = ["timeout", "memout", "skipped", "failed", "error", "timeout_generation"] ### Values of the results of the experiments that were stopped, they have no timing
+
+def is_time(value):
+
+    """
+    Is the value of a result a number? The other values are statuses (see STOPPED_VALUES) or the reasons why the step was not performed ("Metrics only", "Positive dimension for FLGM"...)
+
+    :param value: Value of a result
+    """
+
+    return isinstance(value, Real) and not isinstance(value, bool)
+
 def all_equals(list:list):
 
     """Are all the elements of the list equal?
@@ -122,6 +152,23 @@ def all_inf_lowerbound(list:list, lowerbound:int):
     return all(x < lowerbound for x in list if x is not None) if list else True
 
 
+def cached_statistics(statistics):
+
+    """
+    Cache the statistics computed on the results of an experiment read through a ResultsCache, with the results
+    """
+
+    @wraps(statistics)
+    def cached(data_list, *args):
+
+        if getattr(data_list, "cache", None) is None:
+            return statistics(data_list, *args)
+
+        return data_list.cache.statistics(data_list.id, statistics.__name__, args, lambda: statistics(data_list, *args))
+
+    return cached
+
+@cached_statistics
 def statistics_analysis(data_list:list, algo_time_computed:str):
 
     """
@@ -139,7 +186,7 @@ def statistics_analysis(data_list:list, algo_time_computed:str):
 
     for data in data_list:
         time = data[algo_time_computed]
-        if time in ["timeout", "skipped", "failed", "timeout_generation", "Positive dimension for FLGM"] or time == 0:
+        if not is_time(time) or time == 0:
             continue
 
         else:
@@ -154,6 +201,7 @@ def statistics_analysis(data_list:list, algo_time_computed:str):
     return mean_time, ecart_type_time
 
 
+@cached_statistics
 def statistics_analysis_no_log(data_list:list[dict], algo_time_computed:str):
 
     """
@@ -171,7 +219,7 @@ def statistics_analysis_no_log(data_list:list[dict], algo_time_computed:str):
 
     for data in data_list:
         time = data[algo_time_computed]
-        if time in ["timeout", "skipped", "failed", "timeout_generation", "Positive dimension", "Positive dimension for FLGM"]:
+        if not is_time(time):
             continue
 
         else:
@@ -195,6 +243,7 @@ def statistics_analysis_no_log(data_list:list[dict], algo_time_computed:str):
 
     return mean_time, ecart_type_time
 
+@cached_statistics
 def first_monomial_order_plus_transformation_statistics_analysis(data_list:list[dict]):
 
     """
@@ -210,7 +259,7 @@ def first_monomial_order_plus_transformation_statistics_analysis(data_list:list[
     for data in data_list:
         time_gb = data["groebner_time"]
         time_tf = data["transformation_basis_time"]
-        if time_gb in ["timeout", "skipped", "failed"] or time_tf in ["timeout", "skipped", "failed"]:
+        if not is_time(time_gb) or not is_time(time_tf):
             continue
         else:
             times.append(np.log10(time_gb + time_tf))
@@ -245,7 +294,7 @@ def read_pickle_parameters(folder_results:str):
 def read_pickle_parameter_id(folder_results:str, id:int):
 
     """
-    Read the parameter dictionnary corresponding to a certain ID
+    Read the parameter dictionnary corresponding to a certain ID. The parameter is read at its offset in the parameters.idx index, the ID 0 gives the list of number of parameters by thread.
     
     :param folder_results: Name of the folder with results
     :type folder_results: str
@@ -254,14 +303,12 @@ def read_pickle_parameter_id(folder_results:str, id:int):
     
     """
 
-    i = -1
-    with open("./" + folder_results + "/parameters.pkl", "rb") as f_pkl:
-        while i != id :
-            try:
-                param = load(f_pkl)
-            except EOFError:
-                print("Error")
-            i += 1
+    if id == 0:
+        return read_parameter_index(folder_results)["chains"]
+
+    param = read_parameter(folder_results, id)
+    if param is None:
+        print("Error")
     return param
 
 def read_pickle_experiment(folder_results:str, id:int):
@@ -276,20 +323,54 @@ def read_pickle_experiment(folder_results:str, id:int):
 
     """
 
-    data_list = []
-
     filename = "./" + folder_results + "/res/" + str(id) + ".pkl"
     try :
-        with open(filename, "rb") as f_pkl:
-            while True:
-                try:
-                    data = load(f_pkl)
-                    data_list.append(data)
-                except EOFError:
-                    return data_list
+        ### The journal of the changes not yet compacted is replayed on the dictionnaries
+        return read_result_dicts(filename)
     except Exception as e:
         return None
 
+RESULTS_TABLES = {} ### Consolidated tables already loaded, by folder
+
+RESULTS_CACHES = {} ### Caches of the parsed result files, by folder
+
+def save_results_caches():
+
+    """
+    Write the entries added to the caches of the parsed result files
+    """
+
+    for cache in RESULTS_CACHES.values():
+        cache.save()
+
+register(save_results_caches)
+
+def read_experiment(folder_results:str, id:int):
+
+    """
+    Read the result dictionnaries corresponding to a certain ID from the consolidated table of the benchmark when it is up to date, from the cache of the parsed result files otherwise
+    
+    :param folder_results: Name of the folder with results
+    :type folder_results: str
+    :param id: Numberof ID of the experiment
+    :type id: int
+
+    """
+
+    if folder_results not in RESULTS_TABLES:
+        RESULTS_TABLES[folder_results] = ResultsTable.load("./" + folder_results)
+
+    table = RESULTS_TABLES[folder_results]
+
+    if table is None:
+
+        if folder_results not in RESULTS_CACHES:
+            RESULTS_CACHES[folder_results] = ResultsCache(folder_results)
+
+        return RESULTS_CACHES[folder_results].experiment(id)
+
+    return table.experiment(id)
+
 def read_all_experiments(folder_results:str):
 
     """
@@ -339,11 +420,151 @@ def dict_keys_equal_except_keys_specified(d1:dict, d2:dict, keys_to_ignore:list=
             return False
     return True
 
+def parameter_key(parameter:dict, keys_to_ignore:list):
+
+    """
+    Return a hashable key of a parameter dictionnary over all its keys except the ones in the list keys_to_ignore. Two parameters with the same keys have the same key if and only if dict_keys_equal_except_keys_specified is True for them.
+
+    :param parameter: Parameter dictionnary
+    :type parameter: dict
+    :param keys_to_ignore: List of keys to ignore
+    :type keys_to_ignore: list
+    """
+
+    return dumps({k : v for (k, v) in parameter.items() if k not in keys_to_ignore}, sort_keys=True, default=str)
+
+def group_parameters(parameters:list[dict], keys_to_ignore:list, keys_to_ignore_joined:list=None, joined=None, skipped=None):
+
+    """
+    Group the parameters that are equal except for the keys to ignore, in linear time. Every parameter is hashed once over the keys compared, then the groups are read in the buckets.
+
+    The groups are built in the order of the parameters: a parameter not yet in a group starts a new one, with the parameters equal to it except for keys_to_ignore. The parameters equal to it except for keys_to_ignore_joined and for which joined is True are also added to its group (the elimination orders for instance), even if they already are in another group. A parameter for which skipped is True never starts a group.
+
+    :param parameters: List of parameter dictionnaries
+    :type parameters: list[dict]
+    :param keys_to_ignore: Keys that may differ in a group
+    :type keys_to_ignore: list
+    :param keys_to_ignore_joined: Keys that may differ between the first parameter of a group and the joined parameters
+    :type keys_to_ignore_joined: list
+    :param joined: Function returning True for a parameter that may be joined to a group
+    :param skipped: Function returning True for a parameter that doesn't start a group
+
+    :returns: List of groups, the first parameter of a group is the one that started it and the others are in the order of the parameters
+    :rtype: list[list[dict]]
+    """
+
+    buckets = defaultdict(list)
+    buckets_joined = defaultdict(list)
+
+    for (position, parameter) in enumerate(parameters):
+
+        buckets[parameter_key(parameter, keys_to_ignore)].append(position)
+
+        if keys_to_ignore_joined and joined is not None and joined(parameter):
+            buckets_joined[parameter_key(parameter, keys_to_ignore_joined)].append(position)
+
+    treated = set()
+    groups = []
+
+    for (position, parameter) in enumerate(parameters):
+
+        if position in treated:
+            continue
+
+        treated.add(position)
+
+        if skipped is not None and skipped(parameter):
+            continue
+
+        members = set(buckets[parameter_key(parameter, keys_to_ignore)])
+
+        if keys_to_ignore_joined and joined is not None:
+            members.update(buckets_joined[parameter_key(parameter, keys_to_ignore_joined)])
+
+        members.discard(position)
+        treated.update(members)
+
+        groups.append([parameter] + [parameters[member] for member in sorted(members)])
+
+    return groups
+
+def solving_methods_groups(parameters:list[dict], variable_parameter:str):
+
+    """
+    Return the groups of parameters of the figures comparing the ways of solving: the parameters that differ only by the variable parameter, with the elimination orders of the same experiment
+
+    :param parameters: List of parameter dictionnaries
+    :type parameters: list[dict]
+    :param variable_parameter: The parameter we want to see the influence
+    :type variable_parameter: str
+    """
+
+    keys_to_ignore=["id", variable_parameter, "seed"]  ## Keys we ignore as we don"t compare them (they may be different)
+    keys_to_ignore_elimination=["id", variable_parameter, "seed", "algo_order_change", "monomial_order"]
+
+    return group_parameters(parameters, keys_to_ignore, keys_to_ignore_elimination, joined=lambda parameter: parameter["algo_order_change"] is None)
+
+def algorithms_groups(parameters:list[dict], variable_parameter:str, timing_analysed:str):
+
+    """
+    Return the groups of parameters of the figures comparing the algorithms computing either the Gröbner basis or the term order change
+
+    :param parameters: List of parameter dictionnaries
+    :type parameters: list[dict]
+    :param variable_parameter: The parameter we want to see the influence
+    :type variable_parameter: str
+    :param timing_analysed: The part of the computation analysed ("groebner_time" or "transformation_basis_time")
+    :type timing_analysed: str
+    """
+
+    if timing_analysed == "groebner_time":
+        key = "algo_gb"
+
+    elif timing_analysed == "transformation_basis_time":
+        key = "algo_order_change"
+
+    if key == "algo_gb":
+
+        keys_to_ignore=["id", variable_parameter, key, "seed", "options"]  ## Keys we ignore as we don"t compare them (they may be different)
+        keys_to_ignore_elimination=["id", variable_parameter, key, "seed", "options", "algo_order_change"]
+
+    elif key == "algo_order_change":
+
+        keys_to_ignore=["id", variable_parameter, key, "seed", "options"]  ## Keys we ignore as we don"t compare them (they may be different)
+        keys_to_ignore_elimination=[]
+
+    is_elimination = lambda parameter: parameter["algo_gb"].startswith("eliminate:giac") or parameter["algo_gb"].startswith("eliminate:libsingular")
+    skip_elimination = lambda parameter: key == "algo_order_change" and parameter["algo_order_change"] is None ### SKip elimination ideal and elimination order for the transformation basis
+
+    return group_parameters(parameters, keys_to_ignore, keys_to_ignore_elimination, joined=is_elimination, skipped=skip_elimination)
+
+def stop_info(data_list:list[dict], algo_time_computed:str):
+
+    """
+    Return the information of an experiment without timing: 'm' if a system has exceeded the memory limit, 't' if a system has timed out, else 'n'
+
+    :param data_list: List of data
+    :type data_list: list[dict]
+    :param algo_time_computed: Key of the items to analyse in the dictionnary
+    :type algo_time_computed: str
+    """
+
+    values = [data[algo_time_computed] for data in data_list]
+
+    if "memout" in values:
+        return 'm'
+    if "timeout" in values:
+        return 't'
+    return 'n'
+
 def to_list_info(list:list):
     list_info = []
     for el in list:
         if el is None or el is np.nan or el == 'n' or el == 's':
             break
+        elif el == 't' or el == 'm': ### The reason of the stop is kept
+            list_info.append(el)
+            break
         else:
             list_info.append(el)
     return list_info
\ No newline at end of file
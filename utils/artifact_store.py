@@ -0,0 +1,190 @@
+from fcntl import flock, LOCK_EX, LOCK_UN
+from hashlib import sha256
+from os import makedirs, replace, getpid, walk, remove, utime, stat
+from os.path import exists, join
+from pickle import load, dump
+
+def file_size(path:str):
+
+    """
+    Return the size of a file, 0 if it doesn't exist
+    """
+
+    try:
+        return stat(path).st_size
+    except OSError:
+        return 0
+
+class ArtifactStore:
+
+    """
+    Content-addressed store of pickled objects on disk. An object is stored under the hash of the inputs that produced it, so the same inputs always give the same object.
+
+    With a maximal size, the least recently used objects are removed when the store is larger. The size of the store is kept up to date in the file size of its folder, shared by all the processes, so the folder is only walked when the store is full.
+
+    :param folder: Folder of the store
+    :type folder: str
+    :param max_size: Maximal size of the store in bytes, no limit if it is None
+    :type max_size: int
+    """
+
+    def __init__(self, folder:str, max_size:int=None):
+        self.folder = folder
+        self.max_size = max_size
+        self.size_path = join(folder, "size")
+        makedirs(self.folder, exist_ok=True)
+
+    @staticmethod
+    def key(*inputs):
+
+        """
+        Return the hash of the inputs. The inputs are hashed through their string representation, that is stable for Sage rings and polynomials contrary to their pickle.
+
+        :param inputs: Inputs producing the object to store
+        """
+
+        hash_inputs = sha256()
+        for element in inputs:
+            hash_inputs.update(str(element).encode())
+            hash_inputs.update(b"\0")
+        return hash_inputs.hexdigest()
+
+    def path(self, key:str):
+
+        """
+        Return the path of the file of an object
+
+        :param key: Hash of the inputs of the object
+        :type key: str
+        """
+
+        return join(self.folder, key[:2], key + ".pkl")
+
+    def get(self, key:str):
+
+        """
+        Return the object stored under the key, None if there is none. With a maximal size, the modification time of the file is updated for the eviction.
+
+        :param key: Hash of the inputs of the object
+        :type key: str
+        """
+
+        path = self.path(key)
+
+        if not exists(path):
+            return None
+
+        try:
+            with open(path, 'rb') as f_pkl:
+                value = load(f_pkl)
+        except Exception as e:
+            print(f"Cannot read the artifact {key}: {e}", flush=True)
+            return None
+
+        if self.max_size is not None:
+            try:
+                utime(path)
+            except OSError:
+                pass
+
+        return value
+
+    def put(self, key:str, value):
+
+        """
+        Store an object under the key. The file is written next to its final path and renamed, so a reader never sees a partial object. With a maximal size, its size is added to the size of the store and the least recently used objects are evicted if the store is too large.
+
+        :param key: Hash of the inputs of the object
+        :type key: str
+        :param value: Object to store
+        """
+
+        path = self.path(key)
+        makedirs(join(self.folder, key[:2]), exist_ok=True)
+
+        previous_size = file_size(path)
+
+        tmp_path = f"{path}.{getpid()}.tmp"
+
+        try:
+            with open(tmp_path, 'wb') as f_pkl:
+                dump(value, f_pkl)
+                f_pkl.flush()
+            replace(tmp_path, path)
+        except Exception as e:
+            print(f"Cannot store the artifact {key}: {e}", flush=True)
+            return
+
+        if self.max_size is not None:
+            self.update_size(file_size(path) - previous_size)
+
+    def update_size(self, added_size:int):
+
+        """
+        Add the size of a new file to the size of the store, under a lock shared by all the processes. The folder is walked when the size is unknown (first use of the store) or larger than the maximal size.
+
+        :param added_size: Size in bytes added to the store
+        :type added_size: int
+        """
+
+        try:
+
+            with open(self.size_path + ".lock", 'w') as f_lock:
+
+                flock(f_lock, LOCK_EX)
+
+                try:
+                    with open(self.size_path) as f_size:
+                        total_size = int(f_size.read()) + added_size
+                except (OSError, ValueError):
+                    total_size = None
+
+                if total_size is None or total_size > self.max_size:
+                    total_size = self.evict()
+
+                tmp_path = f"{self.size_path}.{getpid()}.tmp"
+                with open(tmp_path, 'w') as f_size:
+                    f_size.write(str(total_size))
+                replace(tmp_path, self.size_path)
+
+                flock(f_lock, LOCK_UN)
+
+        except OSError as e:
+            print(f"Cannot update the size of the store {self.folder}: {e}", flush=True)
+
+    def evict(self):
+
+        """
+        Remove the least recently used objects until the store fits in its maximal size
+
+        :returns: The size in bytes of the store after the eviction
+        :rtype: int
+        """
+
+        files = []
+
+        for (directory, _, file_names) in walk(self.folder):
+            for file_name in file_names:
+                if not file_name.endswith(".pkl"):
+                    continue
+                path = join(directory, file_name)
+                try:
+                    file_stat = stat(path)
+                except OSError:
+                    continue
+                files.append((file_stat.st_mtime, file_stat.st_size, path))
+
+        total_size = sum(size for (_, size, _) in files)
+
+        for (_, size, path) in sorted(files):
+
+            if total_size <= self.max_size:
+                break
+
+            try:
+                remove(path)
+            except OSError:
+                pass
+            total_size -= size
+
+        return total_size
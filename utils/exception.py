@@ -2,4 +2,10 @@ class TimeoutException(Exception):
     """
     Timeout exception class
     """
-    pass
\ No newline at end of file
+    pass
+
+class MemoutException(Exception):
+    """
+    Memory limit exceeded exception class
+    """
+    pass
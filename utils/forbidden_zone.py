@@ -0,0 +1,145 @@
+from json import load, dump, dumps
+from os import makedirs, replace, getpid, listdir
+from os.path import join, exists
+
+from utils.pickle_utils import read_result_dicts, stopped_step
+
+class ForbiddenZone:
+
+    """
+    Forbidden zone of a benchmark shared by all its workers. It contains the timed out experiments: an experiment is dominated by a timed out one when it has the same values on the equality dimensions and greater or equal values on the monotone dimensions (number of branches, rounds...). A dominated experiment is skipped as we know it will be timed out.
+
+    Every timeout is a file of the folder forbidden_zone of the benchmark, written once by the worker that observed it. The workers never write the same file, so no lock is needed to share the zone.
+
+    :param folder_results: Folder with the results of the benchmark
+    :type folder_results: str
+    :param dimensions: Dimensions of the parameters that must be equal, they are read from the folder if it is None
+    :type dimensions: list[str]
+    :param monotone_dimensions: Dimensions of the parameters in which the time of the algebraic attack increases, they are read from the folder if it is None
+    :type monotone_dimensions: list[str]
+    """
+
+    default_dimensions = ["field_char", "monomial_order", "constant_sparsity", "cico", "algo_gb", "options"]
+    default_monotone_dimensions = ["branch", "round"]
+
+    def __init__(self, folder_results:str, dimensions:list[str]=None, monotone_dimensions:list[str]=None):
+        self.folder = join(folder_results, "forbidden_zone")
+        makedirs(self.folder, exist_ok=True)
+
+        config_path = join(self.folder, "dimensions.json")
+
+        if dimensions is not None or monotone_dimensions is not None:
+            self.dimensions = dimensions if dimensions is not None else self.default_dimensions
+            self.monotone_dimensions = monotone_dimensions if monotone_dimensions is not None else self.default_monotone_dimensions
+            self.write(config_path, {"dimensions" : self.dimensions, "monotone_dimensions" : self.monotone_dimensions})
+
+        elif exists(config_path):
+            with open(config_path) as f_json:
+                config = load(f_json)
+            self.dimensions = config["dimensions"]
+            self.monotone_dimensions = config["monotone_dimensions"]
+
+        else:
+            self.dimensions = self.default_dimensions
+            self.monotone_dimensions = self.default_monotone_dimensions
+
+        self.timeouts = {} ### Name of the file -> timed out experiment, the files already read are not read again
+
+    @staticmethod
+    def write(path:str, value):
+
+        """
+        Write a JSON file next to its final path and rename it, so a reader never sees a partial file
+        """
+
+        tmp_path = f"{path}.{getpid()}.tmp"
+        with open(tmp_path, 'w') as f_json:
+            dump(value, f_json)
+        replace(tmp_path, path)
+
+    def refresh(self):
+
+        """
+        Read the timeouts written by the other workers since the last call
+        """
+
+        for file_name in listdir(self.folder):
+            if not file_name.startswith("timeout_") or not file_name.endswith(".json") or file_name in self.timeouts:
+                continue
+            try:
+                with open(join(self.folder, file_name)) as f_json:
+                    self.timeouts[file_name] = load(f_json)
+            except Exception as e:
+                print(f"Cannot read the timeout {file_name}: {e}", flush=True)
+
+    def add(self, parameter:dict, after_groebner_basis:bool=False):
+
+        """
+        Add a timed out experiment to the zone
+
+        :param parameter: Dictionnary of parameters of the timed out experiment
+        :type parameter: dict
+        :param after_groebner_basis: True if the timeout happened after the computation of the Gröbner basis. Then the algorithm of term order change is also an equality dimension as another one may not time out.
+        :type after_groebner_basis: bool
+        """
+
+        dimensions = list(self.dimensions)
+        if after_groebner_basis and "algo_order_change" not in dimensions:
+            dimensions.append("algo_order_change")
+
+        timeout = {"id" : parameter["id"], "equal" : {d : parameter.get(d) for d in dimensions}, "monotone" : {d : parameter.get(d) for d in self.monotone_dimensions}}
+
+        self.write(join(self.folder, f"timeout_{parameter['id']}.json"), timeout)
+
+    def dominating_timeout(self, parameter:dict):
+
+        """
+        Return the timed out experiment dominating the parameter, None if there is none
+
+        :param parameter: Dictionnary of parameters of the experiment to check
+        :type parameter: dict
+        """
+
+        self.refresh()
+
+        for timeout in self.timeouts.values():
+
+            ### The values are compared through their JSON form, the one they have in the files
+            if any(dumps(parameter.get(d), sort_keys=True) != dumps(v, sort_keys=True) for (d, v) in timeout["equal"].items()):
+                continue
+
+            if all(parameter.get(d) is not None and v is not None and parameter[d] >= v for (d, v) in timeout["monotone"].items()):
+                return timeout
+
+        return None
+
+    def rebuild(self, folder_results:str, parameters:list[dict]):
+
+        """
+        Add to the zone the timed out experiments recorded in the results, whose timeout has not been written in the zone (for instance when the run has been stopped in between)
+
+        :param folder_results: Folder with the results of the benchmark
+        :type folder_results: str
+        :param parameters: Dictionnaries of parameters of the experiments of the benchmark
+        :type parameters: list[dict]
+        """
+
+        self.refresh()
+
+        for parameter in parameters:
+
+            file_path = f"./{folder_results}/res/{parameter['id']}.pkl"
+
+            if f"timeout_{parameter['id']}.json" in self.timeouts or not exists(file_path):
+                continue
+
+            try:
+                steps = [stopped_step(res_dict) for res_dict in read_result_dicts(file_path)]
+            except Exception as e:
+                print(f"Cannot read the results {file_path}: {e}", flush=True)
+                continue
+
+            steps = [step for step in steps if step is not None]
+
+            if steps != []:
+                self.add(parameter, after_groebner_basis = min(steps) > 0)
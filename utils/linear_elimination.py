@@ -0,0 +1,112 @@
+from sage.all import PolynomialRing, TermOrder
+
+"""
+
+Preprocessing of a system before the computation of its Gröbner basis: the equations of degree 1 are used to eliminate variables by substitution, and the system is rebuilt in the ring of the remaining variables.
+
+The quotient rings of the system and of the reduced system are isomorphic, so the dimension and the degree of the ideal are the same. The first variable of the ring (X_0, the last one for the elimination order) is never eliminated, so the shape position and the elimination ideal are also read on the same variable.
+
+The solver records the timings and the invariants of the ideal (dimension, degree, shape position, radicality, generators of the elimination ideal in X_0), not the solutions: they are compared with the ones of the system without elimination. The eliminated variables are recorded in the results, their expressions are printed in the log.
+
+"""
+
+def reduced_term_order(term_order, kept:list[int]):
+
+    """
+    Return the term order of the ring of the remaining variables, None if it can't be restricted to them (block and matrix orders)
+
+    :param term_order: Term order of the ring of the system
+    :param kept: Indices of the remaining variables
+    :type kept: list[int]
+    """
+
+    if len(term_order.blocks()) > 1 or term_order.name() == "matrix":
+        return None
+
+    if term_order.weights() is not None:
+        return TermOrder(term_order.name(), tuple(term_order.weights()[index] for index in kept))
+
+    return TermOrder(term_order.name(), len(kept))
+
+def eliminable_variable(equation, protected):
+
+    """
+    Return the variable of an equation of degree 1 to eliminate, None if it has none. The variable eliminated is the last one of the ring, that would be eliminated first by the elimination order.
+
+    :param equation: Polynomial
+    :param protected: Variable that is never eliminated
+    """
+
+    if equation == 0 or equation.degree(std_grading=True) != 1: ### Degree without the weights of the term order
+        return None
+
+    variables = [variable for variable in equation.variables() if variable != protected]
+
+    if variables == []:
+        return None
+
+    gens = equation.parent().gens()
+
+    return max(variables, key=lambda variable: gens.index(variable))
+
+def eliminate_linear_equations(system_of_equations:list):
+
+    """
+    Eliminate the variables of the equations of degree 1 of a system by substitution, until it has no more of them
+
+    :param list system_of_equations: System of equations
+
+    :returns: The reduced system in the ring of the remaining variables, and the substitutions (variable, expression of the variable in the remaining variables) in the order of the elimination. The system is returned unchanged with no substitution when its term order can't be restricted.
+    :rtype: tuple[list, list[tuple]]
+    """
+
+    R = system_of_equations[0].parent()
+    protected = R.gens()[0]
+
+    equations = [equation for equation in system_of_equations if equation != 0]
+    substitutions = []
+
+    eliminated = True
+
+    while eliminated:
+
+        eliminated = False
+
+        for (position, equation) in enumerate(equations):
+
+            variable = eliminable_variable(equation, protected)
+
+            if variable is None:
+                continue
+
+            ### variable = expression, the coefficient of the variable is invertible in the field
+            coefficient = equation.monomial_coefficient(variable)
+            expression = -(equation - coefficient * variable) * ~coefficient
+
+            substitutions = [(substituted, value.subs({variable : expression})) for (substituted, value) in substitutions]
+            substitutions.append((variable, expression))
+
+            equations = [other.subs({variable : expression}) for other in equations[:position] + equations[position+1:]]
+            equations = [other for other in equations if other != 0]
+
+            eliminated = True
+            break
+
+    if substitutions == []:
+        return system_of_equations, []
+
+    eliminated_variables = [variable for (variable, _) in substitutions]
+    kept = [index for (index, variable) in enumerate(R.gens()) if variable not in eliminated_variables]
+
+    term_order = reduced_term_order(R.term_order(), kept)
+
+    if term_order is None:
+        print("Linear elimination skipped: the term order can't be restricted to the remaining variables", flush=True)
+        return system_of_equations, []
+
+    R_reduced = PolynomialRing(R.base(), [str(R.gens()[index]) for index in kept], order=term_order)
+
+    ### A system reduced to nothing is the zero ideal, and a non-zero constant gives the full ring
+    reduced_system = [R_reduced(equation) for equation in equations] if equations != [] else [R_reduced(0)]
+
+    return reduced_system, substitutions
@@ -0,0 +1,218 @@
+from os import getpid, mkdir, rmdir
+from os.path import join, exists, basename, dirname
+from resource import getrlimit, setrlimit, RLIMIT_AS, RLIM_INFINITY
+
+"""
+
+Memory limit of the solver processes. A solver process is moved to its own cgroup v2 with a memory.max when the cgroup of the benchmark is delegated to the user, else its address space is limited with RLIMIT_AS. The limit is inherited by the processes it starts (Singular, Giac, msolve...).
+
+A cgroup v2 can only give the memory controller to its children when it has no process of its own. The processes of the cgroup of the benchmark are then moved to the leaf cgroup pesscy_leaf, and the cgroups of the solvers are created in the cgroup pesscy_solvers next to it (see solvers_cgroup). This needs a cgroup delegated to the user with the memory controller, for instance the one of `systemd-run --user --scope -p Delegate=yes`, containing only the processes of the benchmark.
+
+The limit is the budget of the resolutions, without the memory of the imports of the worker (Sage). It is applied once the worker is warm: the pages of the imports stay charged to the cgroup of the benchmark, and the address space of the worker at that moment is added to RLIMIT_AS. RLIMIT_AS is inherited through exec by the programs started by the solver, with the address space of the worker added: the limit of these programs is only approximate, and the results record which limit was applied under the key memory_limit_mode.
+
+"""
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+LEAF_CGROUP = "pesscy_leaf" ### Cgroup of the processes of the benchmark, next to the cgroup of the solvers
+SOLVERS_CGROUP = "pesscy_solvers" ### Cgroup containing the cgroups of the solvers
+
+def own_cgroup():
+
+    """
+    Return the folder of the cgroup v2 of the current process, None if there is no cgroup v2
+    """
+
+    try:
+        with open("/proc/self/cgroup") as f_cgroup:
+            for line in f_cgroup:
+                if line.startswith("0::"):
+                    path = join(CGROUP_ROOT, line.strip()[3:].lstrip("/"))
+                    return path if exists(join(path, "cgroup.procs")) else None
+    except OSError:
+        pass
+    return None
+
+def enable_memory_controller(path:str):
+
+    """
+    Give the memory controller to the children of a cgroup
+    """
+
+    with open(join(path, "cgroup.subtree_control"), "w") as f_control:
+        f_control.write("+memory")
+
+def solvers_cgroup():
+
+    """
+    Return the cgroup in which the cgroups of the solvers are created, None if the cgroup of the current process is not delegated to the user with the memory controller. The processes of the cgroup of the current process are moved to its leaf cgroup the first time, so that the memory controller can be given to its children.
+    """
+
+    path = own_cgroup()
+
+    if path is None:
+        return None
+
+    ### The current process has already been moved, by itself or by a process of the same benchmark
+    if basename(path) == LEAF_CGROUP:
+        path = dirname(path)
+
+    try:
+        with open(join(path, "cgroup.controllers")) as f_controllers:
+            if "memory" not in f_controllers.read().split():
+                return None
+
+        leaf = join(path, LEAF_CGROUP)
+        solvers = join(path, SOLVERS_CGROUP)
+
+        for folder in [leaf, solvers]:
+            if not exists(folder):
+                mkdir(folder)
+
+        ### The processes started in the meantime are moved by the next pass
+        for _ in range(10):
+            with open(join(path, "cgroup.procs")) as f_procs:
+                pids = f_procs.read().split()
+            if pids == []:
+                break
+            for pid in pids:
+                try:
+                    with open(join(leaf, "cgroup.procs"), "w") as f_leaf:
+                        f_leaf.write(pid)
+                except ProcessLookupError:
+                    pass
+
+        enable_memory_controller(path)
+        enable_memory_controller(solvers)
+
+    except OSError as e:
+        print(f"No delegated cgroup for the memory limit, the limit is applied with RLIMIT_AS: {e}", flush=True)
+        return None
+
+    return solvers
+
+def solver_cgroup(pid:int, parent:str=None):
+
+    """
+    Return the folder of the cgroup of the solver process pid, None if the solvers have no cgroup
+
+    :param pid: PID of the solver process
+    :type pid: int
+    :param parent: Cgroup of the cgroups of the solvers (see solvers_cgroup)
+    :type parent: str
+    """
+
+    return None if parent is None else join(parent, f"pesscy_solver_{pid}")
+
+def address_space():
+
+    """
+    Return the size in bytes of the virtual memory of the current process, 0 if it can't be read
+    """
+
+    try:
+        with open("/proc/self/status") as f_status:
+            for line in f_status:
+                if line.startswith("VmSize:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return 0
+
+def apply_memory_limit(limit:int, parent:str=None):
+
+    """
+    Limit the memory that the current process and its future children may still allocate. The RLIMIT_AS of the process is its current address space plus the limit.
+
+    :param limit: Maximal memory in bytes
+    :type limit: int
+    :param parent: Cgroup where the cgroup of the process is created (see solvers_cgroup), the limit is applied with RLIMIT_AS if it is None
+    :type parent: str
+
+    :returns: "cgroup" if the limit is the memory.max of a cgroup, "rlimit" if it is the RLIMIT_AS of the process
+    :rtype: str
+    """
+
+    path = solver_cgroup(getpid(), parent)
+
+    if path is not None:
+        try:
+            if not exists(path):
+                mkdir(path)
+            with open(join(path, "memory.max"), "w") as f_max:
+                f_max.write(str(limit))
+            with open(join(path, "memory.swap.max"), "w") as f_swap:
+                f_swap.write("0")
+        except OSError:
+            pass
+        else:
+            try:
+                with open(join(path, "cgroup.procs"), "w") as f_procs:
+                    f_procs.write(str(getpid()))
+                return "cgroup"
+            except OSError:
+                pass
+        remove_cgroup(path)
+
+    ### No delegated cgroup, the virtual memory of the process is limited instead of its resident memory. The address space already mapped (Sage and its libraries) is not part of the budget.
+    (_, hard) = getrlimit(RLIMIT_AS)
+    soft = limit + address_space()
+    setrlimit(RLIMIT_AS, (soft if hard == RLIM_INFINITY else min(soft, hard), hard))
+
+    return "rlimit"
+
+def oom_killed(pid:int, parent:str=None):
+
+    """
+    Return True if the kernel has killed a process of the cgroup of the solver process pid because of its memory.max
+
+    :param pid: PID of the solver process
+    :type pid: int
+    :param parent: Cgroup of the cgroups of the solvers (see solvers_cgroup)
+    :type parent: str
+    """
+
+    path = solver_cgroup(pid, parent)
+
+    if path is None:
+        return False
+
+    try:
+        with open(join(path, "memory.events")) as f_events:
+            for line in f_events:
+                (key, value) = line.split()
+                if key == "oom_kill":
+                    return int(value) > 0
+    except (OSError, ValueError):
+        pass
+
+    return False
+
+def remove_cgroup(path:str):
+
+    """
+    Remove the cgroup of a solver process once all its processes have ended
+    """
+
+    if path is None:
+        return
+
+    try:
+        rmdir(path)
+    except OSError:
+        pass
+
+def is_out_of_memory(error:Exception):
+
+    """
+    Return True if an error comes from a failed allocation, in Python or in a library (Singular, Giac...)
+
+    :param error: Error raised by the resolution
+    :type error: Exception
+    """
+
+    if isinstance(error, MemoryError):
+        return True
+
+    message = str(error).lower()
+
+    return any(pattern in message for pattern in ["out of memory", "no more memory", "cannot allocate memory", "std::bad_alloc", "memory exhausted"])
@@ -0,0 +1,213 @@
+from os import replace, stat
+from os.path import exists
+from pickle import load, dump
+
+"""
+
+The parameters.pkl file holds the list of number of parameters by thread, then the parameter dictionnaries. The parameters.idx file next to it holds the byte offset of every parameter, so a parameter or a chain is read without unpickling the parameters before it.
+
+"""
+
+_indexes = {} ### Indexes already read, by folder, with the size and the modification time of the parameters file they describe
+
+def parameters_path(folder_results:str):
+
+    """
+    Return the path of the parameters file of a benchmark
+    """
+
+    return "./" + folder_results + "/parameters.pkl"
+
+def index_path(folder_results:str):
+
+    """
+    Return the path of the offset index of the parameters file of a benchmark
+    """
+
+    return "./" + folder_results + "/parameters.idx"
+
+def parameters_file_state(folder_results:str):
+
+    """
+    Return the size and the modification time of the parameters file, an index is valid only for them
+    """
+
+    file_stat = stat(parameters_path(folder_results))
+    return file_stat.st_size, file_stat.st_mtime_ns
+
+def write_index(folder_results:str, index:dict):
+
+    """
+    Write the offset index of the parameters file atomically
+
+    :param folder_results: Folder with the results of the benchmark
+    :type folder_results: str
+    :param index: Dictionnary with the chains sizes, the offsets of the chains and the offsets of the parameters by ID
+    :type index: dict
+    """
+
+    index["size"], index["mtime"] = parameters_file_state(folder_results)
+
+    tmp_path = index_path(folder_results) + ".tmp"
+    with open(tmp_path, 'wb') as f_idx:
+        dump(index, f_idx)
+    replace(tmp_path, index_path(folder_results))
+
+    _indexes[folder_results] = index
+
+def write_parameters(folder_results:str, number_of_parameters_by_thread_list:list[int], parameters:list[dict]):
+
+    """
+    Write the list of number of parameters by thread and the parameters in the parameters.pkl file, and its offset index
+
+    :param folder_results: Folder with the results of the benchmark
+    :type folder_results: str
+    :param number_of_parameters_by_thread_list: Size of every chain of parameters
+    :type number_of_parameters_by_thread_list: list[int]
+    :param parameters: Parameter dictionnaries, in the order of the chains
+    :type parameters: list[dict]
+    """
+
+    offsets = {}
+
+    with open(parameters_path(folder_results), 'wb') as f_param_pkl:
+
+        dump(number_of_parameters_by_thread_list, f_param_pkl)
+
+        for parameter in parameters:
+            offsets[parameter["id"]] = f_param_pkl.tell()
+            dump(parameter, f_param_pkl)
+            f_param_pkl.flush()
+
+    write_index(folder_results, {"chains" : number_of_parameters_by_thread_list, "chain_offsets" : chain_offsets(number_of_parameters_by_thread_list, list(offsets.values())), "offsets" : offsets})
+
+def chain_offsets(number_of_parameters_by_thread_list:list[int], offsets:list[int]):
+
+    """
+    Return the offset of the first parameter of every chain, None for an empty chain
+
+    :param number_of_parameters_by_thread_list: Size of every chain of parameters
+    :type number_of_parameters_by_thread_list: list[int]
+    :param offsets: Offsets of the parameters in the order of the file
+    :type offsets: list[int]
+    """
+
+    starts = []
+    position = 0
+
+    for chain_size in number_of_parameters_by_thread_list:
+        starts.append(offsets[position] if chain_size > 0 and position < len(offsets) else None)
+        position += chain_size
+
+    return starts
+
+def build_parameter_index(folder_results:str):
+
+    """
+    Read the parameters file once and write its offset index. It is used for the benchmarks whose parameters file has no index or has been written again.
+
+    :param folder_results: Folder with the results of the benchmark
+    :type folder_results: str
+
+    :rtype: dict
+    """
+
+    offsets = {}
+
+    with open(parameters_path(folder_results), 'rb') as f_param_pkl:
+
+        number_of_parameters_by_thread_list = load(f_param_pkl)
+
+        while True:
+            offset = f_param_pkl.tell()
+            try:
+                parameter = load(f_param_pkl)
+            except EOFError:
+                break
+            offsets[parameter["id"]] = offset
+
+    index = {"chains" : number_of_parameters_by_thread_list, "chain_offsets" : chain_offsets(number_of_parameters_by_thread_list, list(offsets.values())), "offsets" : offsets}
+
+    try:
+        write_index(folder_results, index)
+    except OSError as e: ### Read-only results, the index is only kept in memory
+        print(f"Cannot write the index of the parameters: {e}", flush=True)
+        index["size"], index["mtime"] = parameters_file_state(folder_results)
+        _indexes[folder_results] = index
+
+    return index
+
+def read_parameter_index(folder_results:str):
+
+    """
+    Return the offset index of the parameters file of a benchmark. It is built again when it is missing or does not match the parameters file.
+
+    :param folder_results: Folder with the results of the benchmark
+    :type folder_results: str
+
+    :rtype: dict
+    """
+
+    size, mtime = parameters_file_state(folder_results)
+
+    index = _indexes.get(folder_results)
+
+    if index is None and exists(index_path(folder_results)):
+        try:
+            with open(index_path(folder_results), 'rb') as f_idx:
+                index = load(f_idx)
+        except Exception:
+            index = None
+
+    if index is None or index.get("size") != size or index.get("mtime") != mtime:
+        return build_parameter_index(folder_results)
+
+    _indexes[folder_results] = index
+
+    return index
+
+def read_parameter(folder_results:str, id:int):
+
+    """
+    Return the parameter dictionnary of an experiment, None if there is no experiment with this ID
+
+    :param folder_results: Folder with the results of the benchmark
+    :type folder_results: str
+    :param id: ID of the experiment
+    :type id: int
+
+    :rtype: dict
+    """
+
+    offset = read_parameter_index(folder_results)["offsets"].get(id)
+
+    if offset is None:
+        return None
+
+    with open(parameters_path(folder_results), 'rb') as f_param_pkl:
+        f_param_pkl.seek(offset)
+        return load(f_param_pkl)
+
+def read_chain(folder_results:str, chain_number:int):
+
+    """
+    Return the parameter dictionnaries of a chain
+
+    :param folder_results: Folder with the results of the benchmark
+    :type folder_results: str
+    :param chain_number: Position of the chain in the list of number of parameters by thread
+    :type chain_number: int
+
+    :rtype: list[dict]
+    """
+
+    index = read_parameter_index(folder_results)
+
+    offset = index["chain_offsets"][chain_number]
+
+    if offset is None:
+        return []
+
+    with open(parameters_path(folder_results), 'rb') as f_param_pkl:
+        f_param_pkl.seek(offset)
+        return [load(f_param_pkl) for _ in range(index["chains"][chain_number])]
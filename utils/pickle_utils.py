@@ -1,9 +1,196 @@
-from pickle import load, dump, UnpicklingError
+from os import open as os_open, write, fsync, close, replace, remove, O_WRONLY, O_APPEND, O_CREAT
+from io import BytesIO
+from os.path import exists
+from pickle import load, dump, dumps, UnpicklingError
+
+### Keys of the results of the steps of the resolution, with the number of the step (None for the keys that are not a step, such as the status of the optional profile of the multiplication matrices measured after the other steps)
+RESULT_STEPS = [("groebner_time", 0), ("solving_degree", None), ("ideal_dimension", 1), ("transformation_basis_time", 2), ("radical_ideal", 3), ("shape_position", 4), ("ideal_degree", 5), ("matrices_status", None)]
+
+def journal_path(filename:str):
+
+    """
+    Return the path of the journal of a result pickle file
+    
+    :param filename: Name of the result file
+    :type filename: str
+    """
+
+    return filename + ".journal"
+
+def append_journal(filename:str, records:list[tuple]):
+
+    """
+    Append records (system index, key, value) to the journal of a result pickle file.
+
+    The records are written with a single write on a file opened in append mode and synchronised on the disk. If the process is killed during the write, only the last record may be torn and it is ignored when the journal is read.
+    
+    :param filename: Name of the result file
+    :type filename: str
+    :param records: List of tuples (index of the experiment, key, new value)
+    :type records: list[tuple]
+    """
+
+    data = b"".join(dumps(record) for record in records)
+
+    fd = os_open(journal_path(filename), O_WRONLY | O_APPEND | O_CREAT, 0o644)
+    try:
+        while data:
+            written = write(fd, data)
+            data = data[written:]
+        fsync(fd)
+    finally:
+        close(fd)
+
+def read_journal(filename:str):
+
+    """
+    Read the records (system index, key, value) of the journal of a result pickle file. A torn last record is ignored. A corrupt record followed by valid ones is skipped with a message giving its offset, and the reading goes on from the next record.
+    
+    :param filename: Name of the result file
+    :type filename: str
+    """
+
+    records = []
+
+    if not exists(journal_path(filename)):
+        return records
+
+    with open(journal_path(filename), 'rb') as f_journal:
+        data = f_journal.read()
+
+    stream = BytesIO(data)
+    offset = 0
+
+    while offset < len(data):
+
+        record = read_journal_record(stream, offset)
+
+        if record is not None:
+            records.append(record)
+            offset = stream.tell()
+            continue
+
+        ### The next record starts with the protocol header of the pickles, the first one that can be read is kept
+        next_offset = data.find(RECORD_HEADER, offset + 1)
+
+        while next_offset != -1 and read_journal_record(stream, next_offset) is None:
+            next_offset = data.find(RECORD_HEADER, next_offset + 1)
+
+        if next_offset == -1:
+            ### Last record torn by a killed process
+            break
+
+        print(f"Corrupt record at the offset {offset} of {journal_path(filename)}, skipped", flush=True)
+        offset = next_offset
+
+    return records
+
+RECORD_HEADER = dumps(None)[:2] ### Opcode and version of the protocol at the start of every record
+
+def read_journal_record(stream:BytesIO, offset:int):
+
+    """
+    Return the record (system index, key, value) of a journal starting at an offset, None if it can't be read. The stream is left at the end of the record.
+
+    :param stream: Content of the journal
+    :type stream: BytesIO
+    :param offset: Offset of the record
+    :type offset: int
+    """
+
+    stream.seek(offset)
+
+    try:
+        record = load(stream)
+    except Exception:
+        return None
+
+    if not isinstance(record, tuple) or len(record) != 3:
+        return None
+
+    return record
+
+def read_result_dicts(filename:str):
+
+    """
+    Read the result dictionnaries of a result pickle file and replay its journal on them. The list returned is the one of the file after all the changes.
+    
+    :param filename: Name of the result file
+    :type filename: str
+    """
+
+    dict_list = []
+
+    with open(filename, 'rb') as f_pkl:
+        while True:
+            try:
+                dict_list.append(load(f_pkl))
+            except EOFError:
+                break
+
+    ### Every record sets a value, replaying the journal several times gives the same result
+    for (i, key, new_value) in read_journal(filename):
+        if i < len(dict_list):
+            dict_list[i][key] = new_value
+
+    return dict_list
+
+def compact_journal(filename:str):
+
+    """
+    Fold the journal of a result pickle file in it and remove the journal.
+
+    The new file is written next to the old one and then renamed, so the result file is never torn. If the process is killed before the removal of the journal, it is replayed again on the new file with the same result.
+    
+    :param filename: Name of the result file
+    :type filename: str
+    """
+
+    if not exists(journal_path(filename)):
+        return
+
+    dict_list = read_result_dicts(filename)
+
+    tmp_filename = filename + ".tmp"
+
+    with open(tmp_filename, 'wb') as f_pkl:
+        for res_dict in dict_list:
+            dump(res_dict, f_pkl)
+        f_pkl.flush()
+        fsync(f_pkl.fileno())
+
+    replace(tmp_filename, filename)
+    remove(journal_path(filename))
+
+def plain_value(value):
+
+    """
+    Return the value with the Sage numbers (Integer, RealNumber...) converted to Python int and float, so that the result files may be read without Sage
+    
+    :param value: Value of a result
+    """
+
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+
+    if isinstance(value, (list, tuple)):
+        return type(value)(plain_value(element) for element in value)
+
+    if isinstance(value, dict):
+        return {key : plain_value(element) for (key, element) in value.items()}
+
+    if hasattr(value, "__index__"):
+        return int(value)
+
+    if hasattr(value, "__float__"):
+        return float(value)
+
+    return value
 
 def change_dict_pkl(filename:str, i:int, n:int, key, new_value):
 
     """
-    Change values in the dictionnaries in the result pickle file
+    Change values in the dictionnaries in the result pickle file. The change is appended to the journal of the file.
     
     :param filename: Name of the file
     :type filename: str
@@ -15,23 +202,7 @@ def change_dict_pkl(filename:str, i:int, n:int, key, new_value):
     :param new_value: New value of the key
     """
 
-    dict_list = []
-
-    with open(filename, 'rb') as f_pkl:
-        j = 0
-        while j < n:
-            res_dict = load(f_pkl)
-            if j==i:
-                res_dict[key] = new_value
-            dict_list.append(res_dict)
-            j+=1
-    f_pkl.close()
-
-    with open(filename, 'wb') as f_pkl:
-        for res_dict in dict_list:
-            dump(res_dict, f_pkl)
-            f_pkl.flush()
-    f_pkl.close()
+    append_journal(filename, [(i, key, plain_value(new_value))])
 
 
 def change_dict_failed_to_timeout(filename:str, i:int, n:int):
@@ -47,67 +218,80 @@ def change_dict_failed_to_timeout(filename:str, i:int, n:int):
     :type n: int
     """
 
+    return change_dict_failed_to_status(filename, i, n, "timeout")
+
+
+def change_dict_failed_to_status(filename:str, i:int, n:int, status:str):
+
+    """
+    Change all the "failed" value to the status of the stop of the resolution ("timeout", "memout", or "error" for an error of the solver) in the dictionnaries result
+
+    :param filename: Name of the file
+    :type filename: str
+    :param i: Number of the experiment in the pickle file
+    :type i: int
+    :param n: Total number of experiment
+    :type n: int
+    :param status: Status of the stopped steps
+    :type status: str
+
+    :returns: The first step that has been stopped (0 for the Gröbner basis, 6 if every step had ended)
+    :rtype: int
+    """
+
     timeout_algo = 6
 
-    dict_list = []
-    with open(filename, 'rb') as f_pkl:
-        j = 0
-        while j < n:
-            res_dict = load(f_pkl)
-            changed = False
-            if j==i:
-                if res_dict["groebner_time"] == "failed":
-                    res_dict["groebner_time"] = "timeout"
-                    if not changed:
-                        changed = True
-                        timeout_algo = 0
-
-                if res_dict["solving_degree"] == "failed":
-                    res_dict["solving_degree"] = "timeout"
-
-                if res_dict["ideal_dimension"] == "failed":
-                    res_dict["ideal_dimension"] = "timeout"
-                    if not changed:
-                        changed = True
-                        timeout_algo = 1
-
-                if res_dict["transformation_basis_time"] == "failed":
-                    res_dict["transformation_basis_time"] = "timeout"
-                    if not changed:
-                        changed = True
-                        timeout_algo = 2
-
-                if res_dict["radical_ideal"] == "failed":
-                    res_dict["radical_ideal"] = "timeout"
-                    if not changed:
-                        changed = True
-                        timeout_algo = 3
-
-                if res_dict["shape_position"] == "failed":
-                    res_dict["shape_position"] = "timeout"
-                    if not changed:
-                        changed = True
-                        timeout_algo = 4
-
-                if res_dict["ideal_degree"] == "failed":
-                    res_dict["ideal_degree"] = "timeout"
-                    if not changed:
-                        changed = True
-                        timeout_algo = 5
-
-            dict_list.append(res_dict)
-            j+=1
-    f_pkl.close()
-    
-    with open(filename, 'wb') as f_pkl:
-        for res_dict in dict_list:
-            dump(res_dict, f_pkl)
-            f_pkl.flush()
-    f_pkl.close()
+    res_dict = read_result_dicts(filename)[i]
+
+    records = []
+
+    ### The first key still "failed" gives the step of the computation that timed out
+    for (key, step) in RESULT_STEPS:
+        if res_dict.get(key) == "failed":
+            records.append((i, key, status))
+            if step is not None and timeout_algo == 6:
+                timeout_algo = step
+
+    if records != []:
+        append_journal(filename, records)
 
     return timeout_algo
 
 
+def stopped_step(res_dict:dict, statuses:list[str]=["timeout", "memout"]):
+
+    """
+    Return the first step of the resolution stopped with one of the statuses (0 for the Gröbner basis, see change_dict_failed_to_status), None if no step has been stopped
+
+    :param res_dict: Dictionnary of results of a system
+    :type res_dict: dict
+    :param statuses: Statuses of a stopped step
+    :type statuses: list[str]
+    """
+
+    for (key, step) in RESULT_STEPS:
+        if step is not None and res_dict.get(key) in statuses:
+            return step
+
+    return None
+
+
+def reset_result_dict(filename:str, i:int, res_dict:dict):
+
+    """
+    Replace all the values of the dictionnary i of the results by the ones of res_dict, through the journal of the file
+
+    :param filename: Name of the file
+    :type filename: str
+    :param i: Number of the experiment in the pickle file
+    :type i: int
+    :param res_dict: New dictionnary of results
+    :type res_dict: dict
+    """
+
+    append_journal(filename, [(i, key, plain_value(value)) for (key, value) in res_dict.items()])
+
+
 def change_dict_failed_to_skipped(filename:str, i:int, n:int):
 
     """
@@ -121,43 +305,16 @@ def change_dict_failed_to_skipped(filename:str, i:int, n:int):
     :type n: int
     """
 
+    res_dict = read_result_dicts(filename)[i]
 
-    dict_list = []
-    with open(filename, 'rb') as f_pkl:
-        j = 0
-        while j < n:
-            res_dict = load(f_pkl)
-            if j==i:
-                if res_dict["groebner_time"] == "failed":
-                    res_dict["groebner_time"] = "skipped"
-
-                if res_dict["solving_degree"] == "failed":
-                    res_dict["solving_degree"] = "skipped"
-
-                if res_dict["ideal_dimension"] == "failed":
-                    res_dict["ideal_dimension"] = "skipped"
-
-                if res_dict["transformation_basis_time"] == "failed":
-                    res_dict["transformation_basis_time"] = "skipped"
-
-                if res_dict["radical_ideal"] == "failed":
-                    res_dict["radical_ideal"] = "skipped"
-
-                if res_dict["shape_position"] == "failed":
-                    res_dict["shape_position"] = "skipped"
-
-                if res_dict["ideal_degree"] == "failed":
-                    res_dict["ideal_degree"] = "skipped"
-                    
-            dict_list.append(res_dict)
-            j+=1
-    f_pkl.close()
-    
-    with open(filename, 'wb') as f_pkl:
-        for res_dict in dict_list:
-            dump(res_dict, f_pkl)
-            f_pkl.flush()
-    f_pkl.close()
+    records = []
+
+    for key in ["groebner_time", "solving_degree", "ideal_dimension", "transformation_basis_time", "radical_ideal", "shape_position", "ideal_degree"]:
+        if res_dict.get(key) == "failed":
+            records.append((i, key, "skipped"))
+
+    if records != []:
+        append_journal(filename, records)
 
 
 def read_pkl_file(filepath:str):
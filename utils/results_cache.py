@@ -0,0 +1,172 @@
+from fcntl import flock, LOCK_EX, LOCK_UN
+from math import isnan
+from os import replace, stat, getpid
+from os.path import exists
+from pickle import load, dump
+
+import numpy as np
+
+from utils.pickle_utils import read_result_dicts, journal_path
+
+def file_state(path:str):
+
+    """
+    Return the size and the modification time of a file, None if it does not exist
+    """
+
+    try:
+        file_stat = stat(path)
+    except FileNotFoundError:
+        return None
+    return (file_stat.st_size, file_stat.st_mtime_ns)
+
+def restore_nan(value):
+
+    """
+    Return the value with its NaN replaced by np.nan. The analysis tests the statistics with "is np.nan", that is False for a NaN read from a pickle file.
+    """
+
+    if isinstance(value, float) and isnan(value):
+        return np.nan
+
+    if isinstance(value, tuple):
+        return tuple(restore_nan(element) for element in value)
+
+    return value
+
+class ExperimentResults(list):
+
+    """
+    Result dictionnaries of an experiment read through a ResultsCache, the statistics computed on them are cached with them
+
+    :param results: Result dictionnaries
+    :type results: list[dict]
+    :param cache: Cache of the results of the benchmark
+    :type cache: ResultsCache
+    :param id: ID of the experiment
+    :type id: int
+    """
+
+    def __init__(self, results:list[dict], cache, id:int):
+        super().__init__(results)
+        self.cache = cache
+        self.id = id
+
+class ResultsCache:
+
+    """
+    Persistent cache of the parsed result files of a benchmark and of the statistics computed on them, stored in the analysis_cache.pkl file of the benchmark. An entry is valid as long as the size and the modification time of the result file and of its journal have not changed, so running the analysis again during a benchmark only reads the new result files.
+
+    :param folder_results: Folder with the results of the benchmark
+    :type folder_results: str
+    """
+
+    def __init__(self, folder_results:str):
+
+        self.folder_results = folder_results
+        self.path = "./" + folder_results + "/analysis_cache.pkl"
+        self.entries = self.read_entries()
+        self.modified = set() ### IDs of the entries to write
+
+    def read_entries(self):
+
+        """
+        Return the entries of the cache file, by ID
+        """
+
+        if not exists(self.path):
+            return {}
+
+        try:
+            with open(self.path, 'rb') as f_pkl:
+                return load(f_pkl)
+        except Exception as e:
+            print(f"Cannot read the cache {self.path}: {e}", flush=True)
+            return {}
+
+    def experiment(self, id:int):
+
+        """
+        Return the result dictionnaries of an experiment, None if it has no readable result file. The result file is read only if it has changed since it was cached.
+
+        :param id: ID of the experiment
+        :type id: int
+
+        :rtype: ExperimentResults
+        """
+
+        res_path = "./" + self.folder_results + "/res/" + str(id) + ".pkl"
+        state = (file_state(res_path), file_state(journal_path(res_path)))
+
+        if state[0] is None:
+            return None
+
+        entry = self.entries.get(id)
+
+        if entry is None or entry["state"] != state:
+
+            try:
+                ### The journal of the changes not yet compacted is replayed on the dictionnaries
+                results = read_result_dicts(res_path)
+            except Exception:
+                return None
+
+            entry = {"state" : state, "results" : results, "statistics" : {}}
+            self.entries[id] = entry
+            self.modified.add(id)
+
+        return ExperimentResults(entry["results"], self, id)
+
+    def statistics(self, id:int, name:str, args:tuple, compute):
+
+        """
+        Return a statistic of the results of an experiment, computed only if it is not in the cache
+
+        :param id: ID of the experiment
+        :type id: int
+        :param name: Name of the statistic
+        :type name: str
+        :param args: Arguments of the statistic besides the results
+        :type args: tuple
+        :param compute: Function computing the statistic
+        """
+
+        statistics = self.entries[id]["statistics"]
+        key = (name,) + tuple(args)
+
+        if key not in statistics:
+            statistics[key] = compute()
+            self.modified.add(id)
+
+        return restore_nan(statistics[key])
+
+    def save(self):
+
+        """
+        Write the modified entries in the cache file. The file is read again under a lock before, so the entries written by other processes (the pool of the batch rendering) are kept.
+        """
+
+        if not self.modified:
+            return
+
+        try:
+
+            with open(self.path + ".lock", 'w') as f_lock:
+
+                flock(f_lock, LOCK_EX)
+
+                entries = self.read_entries()
+                entries.update({id : self.entries[id] for id in self.modified})
+
+                tmp_path = f"{self.path}.{getpid()}.tmp"
+                with open(tmp_path, 'wb') as f_pkl:
+                    dump(entries, f_pkl)
+                replace(tmp_path, self.path)
+
+                flock(f_lock, LOCK_UN)
+
+        except OSError as e:
+            print(f"Cannot write the cache {self.path}: {e}", flush=True)
+            return
+
+        self.modified.clear()
@@ -0,0 +1,425 @@
+from json import load as load_json, dump as dump_json, dumps, loads
+from os import makedirs, replace, scandir
+from os.path import exists, join
+from pickle import load
+from time import sleep
+
+import numpy as np
+
+from utils.pickle_utils import read_result_dicts
+
+"""
+
+The results of a benchmark are consolidated in one columnar table, stored in the table folder of the benchmark. Every row is a system of an experiment. Every column is a .npy file that is memory-mapped when the table is loaded, and table.json describes the columns.
+
+    - The numeric results have a float64 column with the value (NaN when there is no number) and an int8 status column with the code of the status in STATUSES.
+    - The parameters with integer values have an int64 column (-1 when the parameter is missing).
+    - The parameters and the results with other values have an int32 column of codes of a list of categories (their JSON representation).
+
+"""
+
+TABLE_FOLDER = "table"
+
+STATUSES = ["ok", "failed", "error", "timeout", "memout", "skipped", "timeout_generation", "failed_generation", "Positive dimension", "Positive dimension for FLGM", "Full Ring", "Metrics only", "none", "missing", "other"] ### Status of a numeric result, "ok" when it is a number, "missing" when the result has no such key
+
+NUMERIC_RESULTS = ["generation_time", "preprocessing_time", "groebner_time", "solving_degree", "ideal_dimension", "transformation_basis_time", "ideal_degree", "shape_position", "radical_ideal", "multiplication_nnz", "multiplication_dense_columns"]
+
+INTEGER_RESULTS = ["solving_degree", "ideal_dimension", "ideal_degree", "multiplication_nnz", "multiplication_dense_columns"] ### Numeric results given back as integers
+
+BOOLEAN_RESULTS = ["shape_position", "radical_ideal"] ### Numeric results given back as booleans
+
+RESOURCES_RESULTS = ["reading_resources", "preprocessing_resources", "ring_conversion_resources", "groebner_resources", "dimension_resources", "staircase_resources", "matrices_resources", "hilbert_resources", "radicality_resources", "transformation_resources", "shape_degree_resources", "elimination_polynomial_resources"]
+
+CATEGORY_RESULTS = ["system_of_equation_shape", "race_winner", "hilbert_series", "matrices_status", "memory_limit_mode"]
+
+INTEGER_PARAMETERS = ["id", "round", "branch", "cico", "constant_sparsity", "number_test", "seed"]
+
+CATEGORY_PARAMETERS = ["version", "permutation", "algo_gb", "options", "algo_order_change", "field_char", "monomial_order", "linear_elimination", "metrics_only", "matrix_profile"]
+
+def results_state(folder_results:str):
+
+    """
+    Return the number of result files and journals of a benchmark and the latest modification time, the table is up to date when they have not changed
+
+    :param folder_results: Folder with the results of the benchmark
+    :type folder_results: str
+
+    :rtype: list[int]
+    """
+
+    number = 0
+    last_modification = 0
+
+    for entry in scandir(join(folder_results, "res")):
+        if entry.name.endswith(".pkl") or entry.name.endswith(".journal"):
+            number += 1
+            last_modification = max(last_modification, entry.stat().st_mtime_ns)
+
+    return [number, last_modification]
+
+def read_all_parameters(folder_results:str):
+
+    """
+    Return the parameter dictionnaries of a benchmark in the order of the file
+    """
+
+    parameters = []
+
+    with open(join(folder_results, "parameters.pkl"), 'rb') as f_pkl:
+        _ = load(f_pkl) ### List of number of parameters by thread
+        while True:
+            try:
+                parameters.append(load(f_pkl))
+            except EOFError:
+                break
+
+    return parameters
+
+def status_code(value):
+
+    """
+    Return the status code and the float value of a numeric result
+
+    :param value: Value of the result
+    """
+
+    if isinstance(value, (bool, int, float)) and not isinstance(value, str):
+        return 0, float(value)
+
+    if value is None:
+        return STATUSES.index("none"), np.nan
+
+    if isinstance(value, str) and value in STATUSES:
+        return STATUSES.index(value), np.nan
+
+    try:
+        return 0, float(value)
+    except (TypeError, ValueError):
+        return STATUSES.index("other"), np.nan
+
+class CategoryColumn:
+
+    """
+    Column of codes of categories, the categories are the JSON representations of the values
+    """
+
+    def __init__(self):
+        self.categories = []
+        self.codes = {}
+        self.values = []
+
+    def append(self, value):
+
+        category = dumps(value, sort_keys=True, default=str)
+        code = self.codes.get(category)
+
+        if code is None:
+            code = len(self.categories)
+            self.codes[category] = code
+            self.categories.append(category)
+
+        self.values.append(code)
+
+def write_column(folder_table:str, name:str, values:np.ndarray):
+
+    """
+    Write a column of the table atomically
+    """
+
+    tmp_path = join(folder_table, name + ".tmp.npy")
+    np.save(tmp_path, values)
+    replace(tmp_path, join(folder_table, name + ".npy"))
+
+def consolidate_results(folder_results:str, force:bool=False):
+
+    """
+    Build the columnar table of the results of a benchmark. The table is not built again when the result files have not changed since the last consolidation.
+
+    :param folder_results: Folder with the results of the benchmark
+    :type folder_results: str
+    :param force: True to build the table even if it is up to date
+    :type force: bool
+
+    :returns: True if the table has been built
+    :rtype: bool
+    """
+
+    folder_table = join(folder_results, TABLE_FOLDER)
+    state = results_state(folder_results)
+
+    if not force and exists(join(folder_table, "table.json")):
+        with open(join(folder_table, "table.json")) as f_json:
+            if load_json(f_json).get("results_state") == state:
+                return False
+
+    makedirs(folder_table, exist_ok=True)
+
+    numeric = {key : [] for key in NUMERIC_RESULTS}
+    status = {key : [] for key in NUMERIC_RESULTS}
+    peak_rss = {key : [] for key in RESOURCES_RESULTS}
+    wall_time = {key : [] for key in RESOURCES_RESULTS}
+    integers = {key : [] for key in INTEGER_PARAMETERS + ["test", "monomials"]}
+    categories = {key : CategoryColumn() for key in CATEGORY_PARAMETERS + CATEGORY_RESULTS}
+
+    for parameter in read_all_parameters(folder_results):
+
+        try:
+            results = read_result_dicts(join(folder_results, "res", str(parameter["id"]) + ".pkl"))
+        except Exception:
+            continue
+
+        for (test, result) in enumerate(results):
+
+            if not isinstance(result, dict):
+                continue
+
+            for key in INTEGER_PARAMETERS:
+                value = parameter.get(key)
+                integers[key].append(value if isinstance(value, int) else -1)
+
+            integers["test"].append(test)
+
+            shape = result.get("system_of_equation_shape")
+            integers["monomials"].append(sum(equation_shape[0] for equation_shape in shape) if isinstance(shape, list) else -1)
+
+            for key in CATEGORY_PARAMETERS:
+                categories[key].append(parameter.get(key))
+
+            for key in CATEGORY_RESULTS:
+                categories[key].append(result.get(key))
+
+            for key in NUMERIC_RESULTS:
+                code, value = status_code(result[key]) if key in result else (STATUSES.index("missing"), np.nan)
+                status[key].append(code)
+                numeric[key].append(value)
+
+            for key in RESOURCES_RESULTS:
+                resources = result.get(key)
+                resources = resources if isinstance(resources, dict) else {}
+                peak_rss[key].append(resources.get("peak_rss") if resources.get("peak_rss") is not None else np.nan)
+                wall_time[key].append(resources.get("wall_time") if resources.get("wall_time") is not None else np.nan)
+
+    columns = {}
+
+    for key in NUMERIC_RESULTS:
+        write_column(folder_table, key, np.array(numeric[key], dtype=np.float64))
+        write_column(folder_table, key + "_status", np.array(status[key], dtype=np.int8))
+        columns[key] = "numeric"
+        columns[key + "_status"] = "status"
+
+    for key in RESOURCES_RESULTS:
+        step = key[:-len("_resources")]
+        write_column(folder_table, step + "_peak_rss", np.array(peak_rss[key], dtype=np.float64))
+        write_column(folder_table, step + "_wall_time", np.array(wall_time[key], dtype=np.float64))
+        columns[step + "_peak_rss"] = "numeric"
+        columns[step + "_wall_time"] = "numeric"
+
+    for (key, values) in integers.items():
+        write_column(folder_table, key, np.array(values, dtype=np.int64))
+        columns[key] = "integer"
+
+    for (key, column) in categories.items():
+        write_column(folder_table, key, np.array(column.values, dtype=np.int32))
+        columns[key] = "category"
+
+    ### The description is written last, a table is only read through it
+    tmp_path = join(folder_table, "table.json.tmp")
+    with open(tmp_path, 'w') as f_json:
+        dump_json({"rows" : len(integers["id"]), "columns" : columns, "categories" : {key : column.categories for (key, column) in categories.items()}, "statuses" : STATUSES, "results_state" : state}, f_json)
+    replace(tmp_path, join(folder_table, "table.json"))
+
+    print(f"Table of {folder_results}: {len(integers['id'])} rows", flush=True)
+
+    return True
+
+def consolidate_results_continuously(folder_results:str, interval:float=60):
+
+    """
+    Consolidate the results of a running benchmark every interval seconds, until the process is stopped
+
+    :param folder_results: Folder with the results of the benchmark
+    :type folder_results: str
+    :param interval: Time between two consolidations, in seconds
+    :type interval: float
+    """
+
+    while True:
+        consolidate_results(folder_results)
+        sleep(interval)
+
+class ResultsTable:
+
+    """
+    Columnar table of the results of a benchmark, built by consolidate_results. The columns are memory-mapped and the rows are selected with vectorized filters.
+
+    :param folder_results: Folder with the results of the benchmark
+    :type folder_results: str
+    """
+
+    def __init__(self, folder_results:str):
+
+        self.folder_table = join(folder_results, TABLE_FOLDER)
+
+        with open(join(self.folder_table, "table.json")) as f_json:
+            description = load_json(f_json)
+
+        self.rows = description["rows"]
+        self.kinds = description["columns"]
+        self.categories = description["categories"]
+        self.statuses = description["statuses"]
+        self.results_state = description["results_state"]
+        self.columns = {}
+
+        self.experiment_rows = None
+
+    @staticmethod
+    def load(folder_results:str, fresh:bool=True):
+
+        """
+        Return the table of a benchmark, None if it has not been consolidated or, when fresh is True, if the result files have changed since the consolidation
+
+        :param folder_results: Folder with the results of the benchmark
+        :type folder_results: str
+        :param fresh: True to only return an up to date table
+        :type fresh: bool
+
+        :rtype: ResultsTable
+        """
+
+        if not exists(join(folder_results, TABLE_FOLDER, "table.json")):
+            return None
+
+        try:
+            table = ResultsTable(folder_results)
+        except Exception:
+            return None
+
+        if fresh and table.results_state != results_state(folder_results):
+            return None
+
+        return table
+
+    def __len__(self):
+        return self.rows
+
+    def column(self, name:str):
+
+        """
+        Return the memory-mapped column of a name
+
+        :param name: Name of the column
+        :type name: str
+
+        :rtype: np.ndarray
+        """
+
+        if name not in self.columns:
+            self.columns[name] = np.load(join(self.folder_table, name + ".npy"), mmap_mode='r')
+
+        return self.columns[name]
+
+    def decode(self, name:str, code:int):
+
+        """
+        Return the value of a code of a category column
+        """
+
+        return loads(self.categories[name][code])
+
+    def mask(self, **conditions):
+
+        """
+        Return the boolean mask of the rows satisfying all the conditions. A condition is a value or a list of values for a column, the status columns take the status names.
+
+        Example: table.mask(algo_gb="msolve", round=[3, 4], groebner_time_status="timeout")
+
+        :rtype: np.ndarray
+        """
+
+        mask = np.ones(self.rows, dtype=bool)
+
+        for (name, value) in conditions.items():
+
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+
+            if self.kinds[name] == "category":
+                codes = [self.categories[name].index(category) for category in (dumps(element, sort_keys=True, default=str) for element in values) if category in self.categories[name]]
+            elif self.kinds[name] == "status":
+                codes = [self.statuses.index(element) for element in values]
+            else:
+                codes = list(values)
+
+            mask &= np.isin(self.column(name), codes)
+
+        return mask
+
+    def values(self, name:str, mask:np.ndarray=None):
+
+        """
+        Return the values of a column for the rows of a mask, the categories are decoded
+
+        :param name: Name of the column
+        :type name: str
+        :param mask: Boolean mask of the rows, all the rows if it is None
+        :type mask: np.ndarray
+        """
+
+        column = self.column(name) if mask is None else self.column(name)[mask]
+
+        if self.kinds[name] == "category":
+            decoded = [self.decode(name, code) for code in range(len(self.categories[name]))]
+            return [decoded[code] for code in column]
+
+        if self.kinds[name] == "status":
+            return [self.statuses[code] for code in column]
+
+        return np.asarray(column)
+
+    def experiment(self, id:int):
+
+        """
+        Return the result dictionnaries of an experiment, with the keys of the table, None if the experiment has no result. The non numeric results are given back as their status, as in the result files.
+
+        :param id: ID of the experiment
+        :type id: int
+
+        :rtype: list[dict]
+        """
+
+        if self.experiment_rows is None:
+            ids = np.asarray(self.column("id"))
+            starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]]) if self.rows > 0 else np.array([], dtype=np.int64)
+            ends = np.r_[starts[1:], self.rows]
+            self.experiment_rows = {int(ids[start]) : (int(start), int(end)) for (start, end) in zip(starts, ends)}
+
+        if id not in self.experiment_rows:
+            return None
+
+        start, end = self.experiment_rows[id]
+
+        results = []
+
+        for row in range(start, end):
+
+            result = {}
+
+            for key in NUMERIC_RESULTS:
+
+                status = self.statuses[self.column(key + "_status")[row]]
+
+                if status == "ok":
+                    value = float(self.column(key)[row])
+                    result[key] = int(value) if key in INTEGER_RESULTS else bool(value) if key in BOOLEAN_RESULTS else value
+                elif status == "none":
+                    result[key] = None
+                elif status not in ["missing", "other"]:
+                    result[key] = status
+
+            for key in CATEGORY_RESULTS:
+                value = self.decode(key, self.column(key)[row])
+                if value is not None:
+                    result[key] = value
+
+            results.append(result)
+
+        return results
@@ -0,0 +1,101 @@
+from os import remove
+from os.path import exists
+
+from utils.pickle_utils import read_result_dicts, journal_path
+
+def result_path(folder_results:str, id:int):
+
+    """
+    Return the path of the result file of an experiment
+    """
+
+    return f"./{folder_results}/res/{id}.pkl"
+
+def unfinished_indices(file_path:str, number_test:int):
+
+    """
+    Return the indices of the systems of an experiment whose results are not final: a value is still "failed" because the run has been stopped before the end of their resolution.
+
+    :param file_path: Path to the result file of the experiment
+    :type file_path: str
+    :param number_test: Number of systems of the experiment
+    :type number_test: int
+
+    :returns: The indices of the systems to solve again, None if the experiment must be performed from the beginning (no result file or not all the systems written)
+    :rtype: list[int]
+    """
+
+    if not exists(file_path):
+        return None
+
+    try:
+        results = read_result_dicts(file_path)
+    except Exception as e:
+        print(f"Cannot read the results {file_path}: {e}", flush=True)
+        return None
+
+    if len(results) < number_test:
+        return None
+
+    return [i for i in range(number_test) if "failed" in results[i].values()]
+
+def remove_results(file_path:str):
+
+    """
+    Remove the result file of an experiment and its journal, before performing it again from the beginning
+    """
+
+    for path in [file_path, journal_path(file_path)]:
+        if exists(path):
+            remove(path)
+
+def resume_chains(folder_results:str, chains:list[list[dict]]):
+
+    """
+    Return the chains of experiments without the experiments whose results are all final
+
+    :param folder_results: Folder with the results of the benchmark
+    :type folder_results: str
+    :param chains: List of chains of dictionnaries of parameters
+    :type chains: list[list[dict]]
+
+    :rtype: list[list[dict]]
+    """
+
+    resumed_chains = []
+    finished = 0
+
+    for chain in chains:
+
+        resumed_chain = [parameter for parameter in chain if unfinished_indices(result_path(folder_results, parameter["id"]), parameter.get("number_test", 1)) != []]
+        finished += len(chain) - len(resumed_chain)
+
+        if resumed_chain != []:
+            resumed_chains.append(resumed_chain)
+
+    print(f"Resume: {finished} experiments already performed, {sum(len(chain) for chain in resumed_chains)} left", flush=True)
+
+    return resumed_chains
+
+def prepare_resume(folder_results:str, parameter:dict):
+
+    """
+    Return the indices of the systems of an experiment to solve again. The results of an experiment to perform from the beginning are removed.
+
+    :param folder_results: Folder with the results of the benchmark
+    :type folder_results: str
+    :param parameter: Dictionnary of parameters of the experiment
+    :type parameter: dict
+
+    :returns: The indices of the systems to solve again, None if the experiment is performed from the beginning
+    :rtype: list[int]
+    """
+
+    file_path = result_path(folder_results, parameter["id"])
+
+    indices = unfinished_indices(file_path, parameter.get("number_test", 1))
+
+    if indices is None:
+        remove_results(file_path)
+
+    return indices
@@ -0,0 +1,113 @@
+from time import monotonic
+
+from utils.system_store import SystemStore, source_hash
+
+class RoundCheckpoints(SystemStore):
+
+    """
+    Checkpoints of the symbolic state of a permutation after each round. The state after k rounds only depends on the instance (permutation, field, order, branches, cico, seed) and on the constants of the first k rounds, so the generation of the system for r+1 rounds starts from the state saved by the generation for r rounds and applies a single round.
+
+    The key of a state also holds the hash of the source code of the permutation (see source_hash), a checkpoint saved by an older version of the permutation is never restored.
+
+    A checkpoint also holds the generation time of its rounds. The clock of the checkpoints starts when a state is restored (or none is found) and doesn't count the writing of the checkpoints, so generation_time gives the time to generate the whole system, the time of the rounds restored included.
+
+    The polynomials of a state are stored in the polynomial ring of the instance that saved them. They are converted, by the names of the variables, to the polynomial ring of the instance that restores them.
+
+    :param instance: Parameters of the instance, the number of rounds excluded, starting with the name of the permutation
+    :type instance: tuple
+    :param folder: Folder of the checkpoints
+    :type folder: str
+    """
+
+    def __init__(self, instance:tuple, folder:str="results/cache/rounds"):
+        super().__init__(folder)
+        self.instance = instance
+        self.version = source_hash(f"permutations.{instance[0]}")
+        self.restored_time = 0
+        self.start_time = monotonic()
+
+    def round_key(self, round:int, constants_prefix:list):
+
+        """
+        Return the key of the state after round rounds with the constants constants_prefix
+        """
+
+        return self.key(*self.instance, self.version, round, [list(constants) for constants in constants_prefix])
+
+    def save(self, round:int, constants_list:list, state):
+
+        """
+        Save the state after round rounds
+
+        :param round: Number of rounds applied
+        :type round: int
+        :param constants_list: Constants of all the rounds of the instance, only the ones of the first round rounds are part of the key
+        :type constants_list: list
+        :param state: Symbolic state and equations after round rounds
+        """
+
+        generation_time = self.generation_time()
+
+        start_save = monotonic()
+        self.put(self.round_key(round, constants_list[:round]), (state, generation_time))
+        self.start_time += monotonic() - start_save
+
+    def restore(self, constants_list:list, max_round:int, ring):
+
+        """
+        Return the number of rounds and the state of the most advanced checkpoint with the same first constants, (0, None) if there is none
+
+        :param constants_list: Constants of all the rounds of the instance
+        :type constants_list: list
+        :param max_round: Maximal number of rounds of the checkpoint
+        :type max_round: int
+        :param ring: Polynomial ring of the instance, the polynomials of the state are converted to it
+        """
+
+        for round in range(max_round, 0, -1):
+            checkpoint = self.get(self.round_key(round, constants_list[:round]))
+            if checkpoint is not None:
+                (state, self.restored_time) = checkpoint
+                state = to_ring(state, ring, {})
+                self.start_time = monotonic()
+                return round, state
+
+        self.restored_time = 0
+        self.start_time = monotonic()
+
+        return 0, None
+
+    def generation_time(self):
+
+        """
+        Return the generation time of the rounds restored plus the time elapsed since the restoration, without the writing of the checkpoints
+        """
+
+        return self.restored_time + monotonic() - self.start_time
+
+def to_ring(value, ring, homomorphisms:dict):
+
+    """
+    Convert the polynomials of a (nested) list or tuple to the ring, the variables are identified by their names
+
+    :param value: Polynomial, list or tuple to convert
+    :param ring: Polynomial ring of destination
+    :param homomorphisms: Homomorphisms already built, by ring of origin
+    :type homomorphisms: dict
+    """
+
+    if isinstance(value, (list, tuple)):
+        return type(value)(to_ring(element, ring, homomorphisms) for element in value)
+
+    source = value.parent()
+
+    if source is ring:
+        return value
+
+    if source not in homomorphisms:
+        if hasattr(source, "variable_names"):
+            homomorphisms[source] = source.hom([ring(name) for name in source.variable_names()], ring)
+        else: ### Element of the field
+            homomorphisms[source] = ring
+
+    return homomorphisms[source](value)
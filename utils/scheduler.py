@@ -0,0 +1,582 @@
+from json import load as load_json, dump as dump_json
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+from os import sched_setaffinity, replace, getpid
+from os.path import dirname, normpath, join, exists
+from pickle import load
+from signal import signal, SIGTERM, SIG_DFL
+from time import monotonic
+
+from psutil import Process as PsutilProcess, NoSuchProcess, AccessDenied, virtual_memory
+
+from utils.artifact_store import ArtifactStore
+from utils.pickle_utils import read_result_dicts
+from utils.solver_pool import SolverPool
+from utils.utils_all import kill_process_tree
+
+HOLD = "hold" ### Answer of next_task when the next experiments don't fit in the free memory
+
+def process_tree_rss(pid:int):
+
+    """
+    Return the resident set size of a process and of its children, 0 if the process has ended
+    """
+
+    rss = 0
+    try:
+        process = PsutilProcess(pid)
+        for member in [process] + process.children(recursive=True):
+            try:
+                rss += member.memory_info().rss
+            except (NoSuchProcess, AccessDenied):
+                pass
+    except (NoSuchProcess, AccessDenied):
+        pass
+    return rss
+
+def experiment_memory(file_path:str, memory_limit:int=None):
+
+    """
+    Return the peak memory of the resolution of a system and the number of monomials of the systems of a performed experiment, read from its result file. The peak is None if it is not known (experiment skipped, results without resources).
+
+    :param file_path: Path to the result file of the experiment
+    :type file_path: str
+    :param memory_limit: Memory limit of the resolution of a system, it is the peak of a system stopped by a memout
+    :type memory_limit: int
+
+    :returns: (peak in bytes, number of monomials)
+    :rtype: tuple[int, int]
+    """
+
+    try:
+        results = read_result_dicts(file_path)
+    except Exception:
+        return None, None
+
+    peak = None
+    monomials = None
+
+    for result in results:
+
+        for (key, value) in result.items():
+            if key.endswith("_resources") and isinstance(value, dict) and value.get("peak_rss") is not None:
+                peak = max(peak or 0, value["peak_rss"])
+            elif value == "memout" and memory_limit is not None:
+                peak = max(peak or 0, memory_limit)
+
+        shape = result.get("system_of_equation_shape")
+        if isinstance(shape, list):
+            monomials = max(monomials or 0, sum(equation_shape[0] for equation_shape in shape))
+
+    return peak, monomials
+
+def load_chains(folder_results:str):
+
+    """
+    Read the parameters.pkl file once and return the chains of experiments. A chain is a list of experiments with the same parameters except the number of branches and rounds, sorted such that the easiest experiments come first.
+
+    :param folder_results: Folder with the results of the benchmark
+    :type folder_results: str
+
+    :returns: List of chains of dictionnaries of parameters
+    :rtype: list[list[dict]]
+    """
+
+    chains = []
+
+    with open("./"+folder_results+"/parameters.pkl", 'rb') as f_pkl:
+
+        parameters_by_thread_list = load(f_pkl)
+
+        for chain_size in parameters_by_thread_list:
+            chains.append([load(f_pkl) for _ in range(chain_size)])
+
+    return [chain for chain in chains if chain != []]
+
+def chain_signature(chain:list[dict]):
+
+    """
+    Return a key identifying a chain between two runs. The ID, the seed and the version change from one run to another, they are not part of the key.
+
+    :param chain: Chain of dictionnaries of parameters
+    :type chain: list[dict]
+    """
+
+    return ArtifactStore.key(*[sorted((k, v) for (k, v) in parameter.items() if k not in ["id", "seed", "version"]) for parameter in chain])
+
+def scheduler_worker(connection, cores:int, first_core:int, run_experiment, experiment_args:tuple, memory_limit:int=None):
+
+    """
+    Loop of a worker of the scheduler. The worker is pinned to its cores, asks the scheduler for an experiment, performs it and sends back its duration, until it receives None.
+
+    :param connection: Worker end of the pipe
+    :param cores: Number of cores of the worker
+    :type cores: int
+    :param first_core: First core of the worker, the worker is not pinned if it is None
+    :type first_core: int
+    :param run_experiment: Function performing one experiment, called with the parameter, the solver pool, the number of cores and experiment_args
+    :param experiment_args: Other arguments of run_experiment
+    :type experiment_args: tuple
+    :param memory_limit: Maximal memory in bytes of the resolution of a system, no limit if it is None
+    :type memory_limit: int
+    """
+
+    signal(SIGTERM, SIG_DFL)
+
+    if first_core is not None:
+        sched_setaffinity(0, range(first_core, first_core + cores))
+
+    ### The solver processes are shared by all the experiments of the worker
+    solver_pool = SolverPool(cores, memory_limit)
+
+    try:
+        connection.send(None)
+
+        while True:
+
+            task = connection.recv()
+
+            if task is None:
+                break
+
+            start = monotonic()
+            run_experiment(task, solver_pool, cores, *experiment_args)
+            connection.send(monotonic() - start)
+
+    finally:
+        solver_pool.close()
+
+class ChainScheduler:
+
+    """
+    Scheduler of the chains of experiments over a set of worker processes.
+
+    The chains are dispatched longest first, their length being estimated from the durations of the previous runs (chain_timings.json next to the results folder) or from their number of experiments. The experiments of a chain are given one by one to its worker, in the order of the chain. A worker without chain left steals the end of the remaining experiments of the longest running chain, so that all the workers finish together. As a timeout prunes the next experiments of its chain through the forbidden zone, an experiment is only started once the earlier experiments of its chain that may dominate it (lower or equal on all the monotone dimensions) have ended: the worker then checks the forbidden zone again before performing it, the timeouts of these experiments being written in the zone before their end. A worker stops when no running chain has experiments left to steal.
+
+    An experiment is only started when its estimated memory fits in the free memory of the machine, minus the memory still to be reached by the running experiments and a margin. Its estimate is the peak memory of the same experiment in the previous runs (chain_memory.json next to the results folder), else the peak of the last experiment of its chain multiplied by the growth of the number of monomials of the systems along the chain. A worker whose next experiment doesn't fit takes another chain, or waits until an experiment ends. An experiment is always started when no other one is running.
+
+    :param folder_results: Folder with the results of the benchmark
+    :type folder_results: str
+    :param chains: List of chains of dictionnaries of parameters
+    :type chains: list[list[dict]]
+    :param run_experiment: Function performing one experiment, see scheduler_worker
+    :param experiment_args: Other arguments of run_experiment
+    :type experiment_args: tuple
+    :param worker_number: Number of workers
+    :type worker_number: int
+    :param first_core: First core to use, the workers are not pinned if it is None
+    :type first_core: int
+    :param cores_per_worker: Number of cores of each worker
+    :type cores_per_worker: int
+    :param memory_limit: Maximal memory in bytes of the resolution of a system, no limit if it is None
+    :type memory_limit: int
+    :param memory_margin: Part of the memory of the machine kept free
+    :type memory_margin: float
+    :param admission_interval: Time in seconds between two checks of the free memory when workers are waiting
+    :type admission_interval: float
+    :param monotone_dimensions: Monotone dimensions of the forbidden zone shared by the experiments, None if the experiments of a chain don't prune each other
+    :type monotone_dimensions: list[str]
+    """
+
+    def __init__(self, folder_results:str, chains:list[list[dict]], run_experiment, experiment_args:tuple, worker_number:int, first_core:int=None, cores_per_worker:int=1, memory_limit:int=None, memory_margin:float=0.1, admission_interval:float=5, monotone_dimensions:list[str]=None):
+        self.folder_results = folder_results
+        self.chains = chains
+        self.run_experiment = run_experiment
+        self.experiment_args = experiment_args
+        self.worker_number = worker_number
+        self.first_core = first_core
+        self.cores_per_worker = cores_per_worker
+        self.memory_limit = memory_limit
+        self.memory_margin = memory_margin
+        self.admission_interval = admission_interval
+        self.monotone_dimensions = monotone_dimensions
+
+        self.timings_path = join(dirname(normpath(folder_results)), "chain_timings.json")
+        self.memory_path = join(dirname(normpath(folder_results)), "chain_memory.json")
+        self.signatures = [chain_signature(chain) for chain in chains]
+        self.positions = {parameter["id"] : k for chain in chains for (k, parameter) in enumerate(chain)} ### Index of every experiment in its chain
+
+        self.chain_durations = [0 for _ in chains]
+        self.chain_done = [0 for _ in chains]
+        self.ended = set() ### IDs of the experiments ended in this run
+
+        self.costs = self.estimate_costs()
+
+        ### Peak memory of a system and number of monomials of every experiment, by chain and by index in the chain: from the previous runs, then from this run
+        previous_memory = self.read_history(self.memory_path)
+        self.memory = [{int(k) : tuple(v) for (k, v) in previous_memory.get(signature, {}).items()} for signature in self.signatures]
+        self.memory_estimates = {} ### Worker -> estimated memory of its running experiment
+
+        ### Segment: [index of the chain, remaining experiments], the longest chains first
+        self.pending = [[c, list(chain)] for (c, chain) in sorted(enumerate(chains), key=lambda x: -self.costs[x[0]])]
+
+    def read_history(self, path:str):
+
+        """
+        Return the measures of the chains in the previous runs stored in a JSON file (durations, memory)
+        """
+
+        if not exists(path):
+            return {}
+
+        try:
+            with open(path) as f_json:
+                return load_json(f_json)
+        except Exception as e:
+            print(f"Cannot read the measures of the previous runs in {path}: {e}", flush=True)
+            return {}
+
+    def write_history(self, path:str, history:dict):
+
+        """
+        Write the measures of the chains in a JSON file, through a temporary file
+        """
+
+        tmp_path = f"{path}.{getpid()}.tmp"
+
+        try:
+            with open(tmp_path, 'w') as f_json:
+                dump_json(history, f_json)
+            replace(tmp_path, path)
+        except Exception as e:
+            print(f"Cannot write the measures of the run in {path}: {e}", flush=True)
+
+    def read_timings(self):
+
+        """
+        Return the durations of the chains in the previous runs
+        """
+
+        return self.read_history(self.timings_path)
+
+    def estimate_costs(self):
+
+        """
+        Return the estimated duration of every chain. A chain never run is estimated with the mean duration by experiment of the known chains, or with its number of experiments if there is none.
+        """
+
+        timings = self.read_timings()
+
+        known = [(timings[signature], len(chain)) for (signature, chain) in zip(self.signatures, self.chains) if signature in timings]
+
+        if known != []:
+            time_by_experiment = sum(t for (t, _) in known) / sum(n for (_, n) in known)
+        else:
+            time_by_experiment = 1
+
+        return [timings[signature] if signature in timings else len(chain) * time_by_experiment for (signature, chain) in zip(self.signatures, self.chains)]
+
+    def write_timings(self):
+
+        """
+        Add the durations of the chains fully performed to the timings of the previous runs
+        """
+
+        timings = self.read_timings()
+
+        for (c, chain) in enumerate(self.chains):
+            if self.chain_done[c] == len(chain):
+                timings[self.signatures[c]] = self.chain_durations[c]
+
+        self.write_history(self.timings_path, timings)
+
+    def write_memory(self):
+
+        """
+        Add the peak memory of the experiments performed to the ones of the previous runs
+        """
+
+        history = self.read_history(self.memory_path)
+
+        for (c, memory) in enumerate(self.memory):
+            if memory != {}:
+                history.setdefault(self.signatures[c], {}).update({str(k) : list(v) for (k, v) in memory.items()})
+
+        self.write_history(self.memory_path, history)
+
+    def record_memory(self, c:int, parameter:dict):
+
+        """
+        Read the peak memory and the number of monomials of a performed experiment
+
+        :param c: Index of the chain
+        :type c: int
+        :param parameter: Dictionnary of parameters of the experiment
+        :type parameter: dict
+        """
+
+        (peak, monomials) = experiment_memory(f"./{self.folder_results}/res/{parameter['id']}.pkl", self.memory_limit)
+
+        if peak is not None:
+            self.memory[c][self.positions[parameter["id"]]] = (peak, monomials)
+
+    def estimate_memory(self, c:int, parameter:dict):
+
+        """
+        Return the estimated memory of an experiment in bytes, 0 if nothing is known about its chain
+
+        :param c: Index of the chain
+        :type c: int
+        :param parameter: Dictionnary of parameters of the experiment
+        :type parameter: dict
+        """
+
+        k = self.positions[parameter["id"]]
+        memory = self.memory[c]
+
+        if k in memory:
+            peak = memory[k][0]
+
+        else:
+            known = sorted(j for j in memory if j < k)
+
+            if known == []:
+                return 0
+
+            (peak, monomials) = memory[known[-1]]
+
+            ### The growth of the number of monomials between the last two known experiments is extended to the next ones
+            if len(known) >= 2 and monomials and memory[known[-2]][1]:
+                growth = max(1, monomials / memory[known[-2]][1]) ** (1 / (known[-1] - known[-2]))
+                peak = peak * growth ** (k - known[-1])
+
+        if self.memory_limit is not None:
+            peak = min(peak, self.memory_limit)
+
+        ### The systems of an experiment are solved at the same time on the cores of the worker
+        return int(peak * max(1, min(self.cores_per_worker, parameter.get("number_test", 1))))
+
+    def admissible(self, c:int, parameter:dict, worker:int):
+
+        """
+        Return True if the experiment fits in the free memory of the machine
+
+        :param c: Index of the chain
+        :type c: int
+        :param parameter: Dictionnary of parameters of the experiment
+        :type parameter: dict
+        :param worker: Index of the worker that would perform it
+        :type worker: int
+        """
+
+        estimate = self.estimate_memory(c, parameter)
+
+        others = {w : e for (w, e) in self.memory_estimates.items() if w != worker}
+
+        if estimate == 0 or others == {}:
+            return True
+
+        ### The running experiments may not have reached their peak yet, the rest of their estimate is reserved
+        reserved = sum(max(0, e - process_tree_rss(self.processes[w].pid)) for (w, e) in others.items())
+
+        memory = virtual_memory()
+        free = memory.available - reserved - self.memory_margin * memory.total
+
+        return estimate <= free
+
+    def may_prune(self, earlier:dict, parameter:dict):
+
+        """
+        Return True if a timeout of an earlier experiment of a chain would put the parameter in the forbidden zone
+
+        :param earlier: Dictionnary of parameters of the earlier experiment
+        :type earlier: dict
+        :param parameter: Dictionnary of parameters of the experiment to check
+        :type parameter: dict
+        """
+
+        if self.monotone_dimensions is None:
+            return False
+
+        return all(earlier.get(d) is not None and parameter.get(d) is not None and earlier[d] <= parameter[d] for d in self.monotone_dimensions)
+
+    def ready(self, c:int, parameter:dict):
+
+        """
+        Return True if all the earlier experiments of the chain that may prune the parameter have ended
+
+        :param c: Index of the chain
+        :type c: int
+        :param parameter: Dictionnary of parameters of the experiment
+        :type parameter: dict
+        """
+
+        chain = self.chains[c]
+
+        return all(earlier["id"] in self.ended for earlier in chain[:self.positions[parameter["id"]]] if self.may_prune(earlier, parameter))
+
+    def remaining_cost(self, segment:list):
+
+        """
+        Return the estimated duration of the remaining experiments of a segment
+        """
+
+        (c, remaining) = segment
+        return len(remaining) * self.costs[c] / len(self.chains[c])
+
+    def steal(self, worker:int, segments:list):
+
+        """
+        Give to a worker the end of the longest remaining segment of another worker. The segment is split at the experiment the closest to its middle that is ready (see ready).
+
+        :param worker: Index of the worker
+        :type worker: int
+        :param segments: Segment of chain treated by every worker
+        :type segments: list
+
+        :returns: The next experiment of the worker, HOLD if no experiment can be stolen for now, None if there is nothing left to steal
+        """
+
+        victims = [segment for segment in segments if segment is not None and len(segment[1]) >= 2]
+
+        if victims == []:
+            return None
+
+        for victim in sorted(victims, key=self.remaining_cost, reverse=True):
+
+            (c, remaining) = victim
+            half = len(remaining) // 2
+
+            ### The first experiment of a segment is the next one of its worker, it is not stolen
+            for k in sorted(range(1, len(remaining)), key=lambda k: abs(k - half)):
+
+                if self.ready(c, remaining[k]) and self.admissible(c, remaining[k], worker):
+                    segments[worker] = [c, remaining[k:]]
+                    del remaining[k:]
+                    return (c, segments[worker][1].pop(0))
+
+        ### The experiments left may be ready once the running ones have ended
+        return HOLD
+
+    def next_task(self, worker:int, segments:list):
+
+        """
+        Return the next experiment of a worker, HOLD if the next experiments don't fit in the free memory, None if there is nothing left to do
+
+        :param worker: Index of the worker
+        :type worker: int
+        :param segments: Segment of chain treated by every worker
+        :type segments: list
+        """
+
+        if segments[worker] is not None and segments[worker][1] != []:
+
+            (c, remaining) = segments[worker]
+
+            if self.ready(c, remaining[0]) and self.admissible(c, remaining[0], worker):
+                return (c, remaining.pop(0))
+
+            ### The next experiment of the chain is too large for now or waits for the end of earlier experiments stolen by another worker, the chain is given back and another one is looked for
+            self.pending.insert(0, segments[worker])
+
+        segments[worker] = None
+
+        for segment in self.pending:
+            if self.ready(segment[0], segment[1][0]) and self.admissible(segment[0], segment[1][0], worker):
+                self.pending.remove(segment)
+                segments[worker] = segment
+                (c, remaining) = segment
+                return (c, remaining.pop(0))
+
+        if self.pending != []:
+            return HOLD
+
+        return self.steal(worker, segments)
+
+    def run(self):
+
+        """
+        Start the workers and give them the experiments until all the chains are performed
+        """
+
+        connections = []
+        processes = []
+        self.processes = processes
+
+        for k in range(self.worker_number):
+            connection, worker_connection = Pipe()
+            first_core = None if self.first_core is None else self.first_core + k * self.cores_per_worker
+            process = Process(target=scheduler_worker, args=(worker_connection, self.cores_per_worker, first_core, self.run_experiment, self.experiment_args, self.memory_limit))
+            process.start()
+            worker_connection.close()
+            connections.append(connection)
+            processes.append(process)
+
+        segments = [None] * self.worker_number
+        current = [None] * self.worker_number ### (index of the chain, parameter) being performed by every worker
+        running = set(range(self.worker_number))
+        idle = [] ### Workers waiting for an experiment
+
+        try:
+
+            while running:
+
+                busy = [connections[k] for k in running if k not in idle]
+
+                ### The workers held for the memory are checked again after a while even if no experiment ends
+                for connection in wait(busy, self.admission_interval if idle != [] else None):
+
+                    worker = connections.index(connection)
+                    self.memory_estimates.pop(worker, None)
+
+                    try:
+                        message = connection.recv()
+                    except EOFError:
+                        ### The worker has crashed, the rest of its segment is given to another worker
+                        if current[worker] is None:
+                            print(f"Worker {worker} has stopped unexpectedly before its first experiment", flush=True)
+                        else:
+                            print(f"Worker {worker} has stopped unexpectedly during the experiment {current[worker][1]['id']}", flush=True)
+                            ### The experiment will not end, the next ones of its chain must not wait for it
+                            self.ended.add(current[worker][1]["id"])
+                        if segments[worker] is not None and segments[worker][1] != []:
+                            self.pending.insert(0, segments[worker])
+                        segments[worker] = None
+                        running.remove(worker)
+                        continue
+
+                    if message is not None:
+                        (c, parameter) = current[worker]
+                        self.chain_durations[c] += message
+                        self.chain_done[c] += 1
+                        self.record_memory(c, parameter)
+                        self.ended.add(parameter["id"])
+
+                    idle.append(worker)
+
+                for worker in list(idle):
+
+                    task = self.next_task(worker, segments)
+
+                    if task == HOLD:
+                        continue
+
+                    idle.remove(worker)
+
+                    if task is None:
+                        connections[worker].send(None)
+                        running.remove(worker)
+                        continue
+
+                    (c, parameter) = task
+                    current[worker] = task
+                    self.memory_estimates[worker] = self.estimate_memory(c, parameter)
+                    print(f"Worker {worker}: experiment {parameter['id']}", flush=True)
+                    connections[worker].send(parameter)
+
+            for process in processes:
+                process.join()
+
+        finally:
+
+            ### Kill the workers left after an interruption
+            for process in processes:
+                if process.is_alive():
+                    kill_process_tree(process)
+                    process.join()
+
+            for connection in connections:
+                connection.close()
+
+            self.write_timings()
+            self.write_memory()
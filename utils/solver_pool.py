@@ -0,0 +1,328 @@
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+from os import getpid
+from time import monotonic
+import traceback
+
+from utils.exception import TimeoutException, MemoutException
+from utils.pickle_utils import change_dict_failed_to_status
+from utils.memory_limit import apply_memory_limit, solvers_cgroup, solver_cgroup, oom_killed, remove_cgroup, is_out_of_memory
+from utils.utils_all import redirect_all_output, kill_process_tree
+
+def solver_worker(connection, memory_limit:int=None, cgroup:str=None):
+
+    """
+    Loop of a long-lived solver process. Sage is imported once when the worker starts, then the worker solves the jobs received on the pipe until it receives None.
+
+    A job is the tuple of the inputs of the solve function of utils/systems_solver.py, the same one that is stored in the temporary file given to the script. Its last element is the dictionnary of the keyword arguments of the solver (solver options).
+
+    A job whose memory exceeds the limit is answered with "memout" instead of "done", the pool then replaces the worker. A job raising another error is answered with "failed" and the worker goes on with the next jobs, the results of the system that are still "failed" get the status "error": the error would happen again, the system is not solved again when the benchmark is resumed.
+
+    :param connection: Worker end of the pipe
+    :param memory_limit: Maximal memory in bytes of the worker and of the processes it starts, no limit if it is None
+    :type memory_limit: int
+    :param cgroup: Cgroup of the cgroups of the solvers (see solvers_cgroup), the memory is limited with RLIMIT_AS if it is None
+    :type cgroup: str
+    """
+
+    ### The heavy import of Sage is done here, once for all the jobs of the worker
+    from utils.systems_solver import solve
+
+    ### The limit is applied once Sage is imported, the memory of the import is not part of the budget of the jobs (see utils/memory_limit.py)
+    memory_limit_mode = None
+    if memory_limit is not None:
+        memory_limit_mode = apply_memory_limit(memory_limit, cgroup)
+
+    connection.send("ready")
+
+    log_file = None
+
+    while True:
+
+        try:
+            job = connection.recv()
+        except EOFError:
+            break
+
+        if job is None:
+            break
+
+        (file_log_result_path, file_output_result_path, i, number_test, system_of_equations, algo_gb, monomial_order, algo_order_change, options, solver_options) = job
+
+        ### Each job has its own log file, the outputs (also the ones of the C libraries) are appended to it
+        previous_log_file = log_file
+        log_file = redirect_all_output(file_log_result_path, 'a')
+        if previous_log_file is not None:
+            previous_log_file.close()
+
+        reply = "done"
+
+        try:
+            solve(file_log_result_path, file_output_result_path, i, number_test, system_of_equations, algo_gb, monomial_order, algo_order_change, options=options, memory_limit_mode=memory_limit_mode, **solver_options)
+            ### A process started by the solver (Singular, Giac...) may have been killed by the kernel for the memory of the cgroup
+            if memory_limit is not None and oom_killed(getpid(), cgroup):
+                print("Memory limit exceeded by a process of the solver", flush=True)
+                reply = "memout"
+        except Exception as e:
+            if is_out_of_memory(e):
+                print(f"Memory limit exceeded: {e}", flush=True)
+                reply = "memout"
+            else:
+                print(f"Error of the solver: {e}", flush=True)
+                print(traceback.format_exc(), flush=True)
+                _ = change_dict_failed_to_status(file_output_result_path, i, number_test, "error")
+                reply = "failed"
+        finally:
+            log_file.flush()
+            connection.send(reply)
+
+class SolverWorker:
+
+    """
+    Long-lived process solving systems of equations received on a pipe
+
+    :param memory_limit: Maximal memory in bytes of the worker, no limit if it is None
+    :type memory_limit: int
+    :param cgroup: Cgroup of the pool
+    :type cgroup: str
+    """
+
+    def __init__(self, memory_limit:int=None, cgroup:str=None):
+        self.cgroup = cgroup
+        self.connection, worker_connection = Pipe()
+        self.process = Process(target=solver_worker, args=(worker_connection, memory_limit, cgroup))
+        self.process.start()
+        worker_connection.close()
+        self.ready = False
+
+    def wait_ready(self):
+
+        """
+        Wait until the worker has imported Sage
+        """
+
+        if not self.ready:
+            self.connection.recv()
+            self.ready = True
+
+    def kill(self):
+
+        """
+        Kill the worker and all the processes it started (Singular, Giac, msolve...)
+        """
+
+        kill_process_tree(self.process)
+        self.process.join()
+        self.connection.close()
+        remove_cgroup(solver_cgroup(self.process.pid, self.cgroup))
+
+    def oom_killed(self):
+
+        """
+        Return True if the kernel has killed a process of the worker because of its memory limit
+        """
+
+        return self.cgroup is not None and oom_killed(self.process.pid, self.cgroup)
+
+    def close(self):
+
+        """
+        Ask the worker to stop once its current job is done
+        """
+
+        try:
+            self.connection.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(5)
+        if self.process.is_alive():
+            kill_process_tree(self.process)
+            self.process.join()
+        self.connection.close()
+        remove_cgroup(solver_cgroup(self.process.pid, self.cgroup))
+
+class SolverPool:
+
+    """
+    Pool of pre-warmed solver workers. It replaces the start of a new Python process (and the import of Sage) for every system of equations.
+
+    One more worker than needed is kept in advance. When a worker is killed after a timeout, the next job is given to the spare worker that is already warm while the replacement imports Sage in the background.
+
+    :param int size: Number of jobs that may be solved at the same time
+    :param int memory_limit: Maximal memory in bytes of each job, no limit if it is None
+    """
+
+    def __init__(self, size:int=1, memory_limit:int=None):
+        self.size = size
+        self.memory_limit = memory_limit
+        self.cgroup = solvers_cgroup() if memory_limit is not None else None
+        self.workers = [self.new_worker() for _ in range(size + 1)]
+
+    def new_worker(self):
+
+        """
+        Start a new worker with the memory limit of the pool
+        """
+
+        return SolverWorker(self.memory_limit, self.cgroup)
+
+    def take_worker(self):
+
+        """
+        Return an idle worker, the ones that are already warm first
+        """
+
+        for worker in self.workers:
+            if worker.ready or worker.connection.poll():
+                self.workers.remove(worker)
+                return worker
+
+        return self.workers.pop(0)
+
+    def release(self, worker:SolverWorker):
+
+        """
+        Put back a worker whose job has ended in the idle workers, or replace it if its process has stopped
+
+        :param worker: Worker whose job has ended
+        :type worker: SolverWorker
+        """
+
+        if worker.process.is_alive():
+            self.workers.append(worker)
+        else:
+            self.replace(worker)
+
+    def replace(self, worker:SolverWorker):
+
+        """
+        Kill a worker and start a new one in the background
+
+        :param worker: Worker to replace
+        :type worker: SolverWorker
+        """
+
+        worker.kill()
+        self.workers.append(self.new_worker())
+
+    def solve(self, job:tuple, timeout:float):
+
+        """
+        Solve a system of equations on a warm worker
+
+        :param job: Inputs of the solve function of utils/systems_solver.py
+        :type job: tuple
+        :param timeout: Timeout for the resolution of the system
+        :type timeout: float
+
+        :raises TimeoutException: The resolution has timed out, the worker has been killed and replaced
+        :raises MemoutException: The resolution has exceeded the memory limit, the worker has been replaced
+        """
+
+        worker = self.take_worker()
+        worker.wait_ready()
+
+        try:
+            worker.connection.send(job)
+
+            if not worker.connection.poll(timeout):
+                self.replace(worker)
+                raise TimeoutException()
+
+            reply = worker.connection.recv()
+
+        except (EOFError, BrokenPipeError):
+            ### The worker has crashed (for instance in a C library), the results stay at "failed" unless it has been killed for its memory
+            print("The solver process has stopped unexpectedly", flush=True)
+            memout = worker.oom_killed()
+            self.replace(worker)
+            if memout:
+                raise MemoutException()
+            return
+
+        except KeyboardInterrupt:
+            self.replace(worker)
+            raise
+
+        if reply == "memout":
+            ### The memory of a worker that failed to allocate is not trusted anymore
+            self.replace(worker)
+            raise MemoutException()
+
+        self.release(worker)
+
+    def solve_many(self, jobs:list[tuple], timeout:float, parallel:int=None):
+
+        """
+        Solve several independent systems of equations at the same time, at most size of them (or parallel) are running at once. Every system has its own timeout starting when it is given to a worker.
+
+        :param jobs: List of inputs of the solve function of utils/systems_solver.py
+        :type jobs: list[tuple]
+        :param timeout: Timeout for the resolution of each system
+        :type timeout: float
+        :param parallel: Maximal number of jobs running at the same time, the size of the pool if it is None
+        :type parallel: int
+
+        :returns: For every job, "done", "failed", "timeout", "memout" or "crashed"
+        :rtype: list[str]
+        """
+
+        if parallel is None:
+            parallel = self.size
+
+        status = [None] * len(jobs)
+        next_job = 0
+        running = {} ### Connection of the worker -> (worker, index of the job, deadline)
+
+        try:
+
+            while next_job < len(jobs) or running != {}:
+
+                ### Give jobs to the workers up to the size of the pool
+
+                while next_job < len(jobs) and len(running) < min(parallel, self.size):
+                    worker = self.take_worker()
+                    worker.wait_ready()
+                    worker.connection.send(jobs[next_job])
+                    running[worker.connection] = (worker, next_job, monotonic() + timeout)
+                    next_job += 1
+
+                next_deadline = min(deadline for (_, _, deadline) in running.values())
+
+                for connection in wait(list(running.keys()), max(0, next_deadline - monotonic())):
+                    (worker, index, _) = running.pop(connection)
+                    try:
+                        status[index] = connection.recv()
+                        if status[index] == "memout":
+                            self.replace(worker)
+                        else:
+                            self.release(worker)
+                    except EOFError:
+                        print("The solver process has stopped unexpectedly", flush=True)
+                        status[index] = "memout" if worker.oom_killed() else "crashed"
+                        self.replace(worker)
+
+                now = monotonic()
+                for connection in list(running.keys()):
+                    (worker, index, deadline) = running[connection]
+                    if deadline <= now:
+                        running.pop(connection)
+                        status[index] = "timeout"
+                        self.replace(worker)
+
+        except KeyboardInterrupt:
+            for (worker, _, _) in running.values():
+                self.replace(worker)
+            raise
+
+        return status
+
+    def close(self):
+
+        """
+        Stop all the workers
+        """
+
+        for worker in self.workers:
+            worker.close()
+        self.workers = []
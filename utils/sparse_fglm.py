@@ -0,0 +1,207 @@
+from random import Random
+
+from sage.all import ideal
+from sage.matrix.berlekamp_massey import berlekamp_massey
+
+import numpy as np
+
+"""
+
+Term order change of a zero-dimensional ideal in shape position to the lexicographic order, with the sparse multiplication matrix by the last variable (X_0 in the reversed ring of the solver) instead of the dense linear algebra of FGLM.
+
+The multiplication matrix is built from the normal forms of the products of X_0 by the standard monomials of the first Gröbner basis, most of them being standard monomials too. The sequence of the projections of its powers on a random linear form is computed with numpy, the minimal polynomial of X_0 is read on it with the Berlekamp-Massey algorithm. When its degree is the degree of the ideal, the ideal is in shape position and the other variables are polynomials in X_0 given by the projections of their normal forms (Bostan, Salvy, Schost). The cost is O(D * nnz) for D the degree of the ideal and nnz the number of non zero coefficients of the matrix, instead of O(D^3).
+
+"""
+
+def multiplication_matrix_transpose(groebner_basis:list, variable, standard_monomials:list):
+
+    """
+    Return the transpose of the matrix of the multiplication by a variable on the standard monomials, in the CSR format: the row j holds the normal form of the product of the variable by the standard monomial j
+
+    :param list groebner_basis: Gröbner basis of a zero-dimensional ideal
+    :param variable: Variable of the ring of the Gröbner basis
+    :param list standard_monomials: Standard monomials of the Gröbner basis
+
+    :returns: The arrays indptr, indices and data of the matrix
+    :rtype: tuple[np.ndarray, np.ndarray, list[int]]
+    """
+
+    index = {monomial : position for (position, monomial) in enumerate(standard_monomials)}
+
+    indptr = [0]
+    indices = []
+    data = []
+
+    for monomial in standard_monomials:
+
+        product = variable * monomial
+
+        if product in index: ### Most of the products stay in the staircase, their column is a unit vector
+            indices.append(index[product])
+            data.append(1)
+
+        else:
+            normal_form = product.reduce(groebner_basis)
+            for (coefficient, term) in zip(normal_form.coefficients(), normal_form.monomials()):
+                indices.append(index[term])
+                data.append(int(coefficient))
+
+        indptr.append(len(indices))
+
+    return np.array(indptr, dtype=np.int64), np.array(indices, dtype=np.int64), data
+
+def multiplication_matrices_profile(groebner_basis:list, standard_monomials:list=None):
+
+    """
+    Return the density of the matrices of the multiplication by every variable on the standard monomials of a zero-dimensional ideal: their number of non zero coefficients and of dense columns, the normal forms of the products that are not standard monomials (the other columns are unit vectors). The cost of the term order change depends on them.
+
+    :param list groebner_basis: Gröbner basis of a zero-dimensional ideal
+    :param list standard_monomials: Standard monomials of the Gröbner basis, computed if it is None
+
+    :returns: The number of non zero coefficients ('nnz') and of dense columns ('dense_columns') of every matrix, by name of variable
+    :rtype: dict[str, dict[str, int]]
+    """
+
+    R = groebner_basis[0].parent()
+    if standard_monomials is None:
+        standard_monomials = list(ideal(groebner_basis).normal_basis())
+    index = {monomial : position for (position, monomial) in enumerate(standard_monomials)}
+
+    profile = {}
+
+    for variable in R.gens():
+        _, indices, _ = multiplication_matrix_transpose(groebner_basis, variable, standard_monomials)
+        dense_columns = sum(1 for monomial in standard_monomials if variable * monomial not in index)
+        profile[str(variable)] = {"nnz" : len(indices), "dense_columns" : dense_columns}
+
+    return profile
+
+def modular_dtype(characteristic:int):
+
+    """
+    Return the numpy type of the coefficients modulo the characteristic: int64 when the product of two of them fits in it, else Python integers
+    """
+
+    return np.int64 if characteristic.bit_length() <= 31 else object
+
+def transpose_product(matrix_transpose:tuple, vector:np.ndarray, characteristic:int):
+
+    """
+    Return the product of the transpose of a CSR matrix by a vector, modulo the characteristic
+
+    :param tuple matrix_transpose: Arrays indptr, indices and data of the matrix
+    :param np.ndarray vector: Vector with coefficients lower than the characteristic
+    :param int characteristic: Characteristic of the prime field
+    """
+
+    indptr, indices, data = matrix_transpose
+
+    products = data * vector[indices] % characteristic
+
+    ### The sums of the rows are differences of the cumulative sum, the empty rows (zero normal forms) give 0
+    cumulative = np.concatenate((np.zeros(1, dtype=products.dtype), np.cumsum(products)))
+
+    return (cumulative[indptr[1:]] - cumulative[indptr[:-1]]) % characteristic
+
+def krylov_projections(matrix_transpose:tuple, characteristic:int, linear_form:np.ndarray, targets:list[tuple], lengths:list[int]):
+
+    """
+    Return the sequences u(M^k v) for k lower than the length of every target v, where u is the linear form and M the matrix. They are computed with the powers of the transpose of M applied to u, the targets being sparse.
+
+    :param tuple matrix_transpose: Arrays indptr, indices and data of the transpose of M
+    :param int characteristic: Characteristic of the prime field
+    :param np.ndarray linear_form: Coefficients of u
+    :param list[tuple] targets: Vectors v, as the arrays of the indices and of the coefficients of their non zero coefficients
+    :param list[int] lengths: Lengths of the sequences
+
+    :rtype: list[list[int]]
+    """
+
+    dtype = modular_dtype(characteristic)
+    indptr, indices, data = matrix_transpose
+    matrix_transpose = (indptr, indices, np.array(data, dtype=dtype))
+    targets = [(np.asarray(target_indices, dtype=np.int64), np.array(coefficients, dtype=dtype)) for (target_indices, coefficients) in targets]
+
+    sequences = [[] for _ in targets]
+    vector = np.array(linear_form, dtype=dtype) % characteristic
+
+    for k in range(max(lengths)):
+
+        if k > 0:
+            vector = transpose_product(matrix_transpose, vector, characteristic)
+
+        for (sequence, (target_indices, coefficients), length) in zip(sequences, targets, lengths):
+            if k < length:
+                sequence.append(int((vector[target_indices] * coefficients % characteristic).sum() % characteristic))
+
+    return sequences
+
+def sparse_fglm(groebner_basis:list, seed:int=None, standard_monomials:list=None):
+
+    """
+    Return the Gröbner basis for the lexicographic order of a zero-dimensional ideal in shape position, from a Gröbner basis for any order, None if the ideal is not in shape position
+
+    :param list groebner_basis: Gröbner basis of a zero-dimensional ideal over a prime field
+    :param int seed: Seed of the random linear form
+    :param list standard_monomials: Standard monomials of the Gröbner basis, computed if it is None
+
+    :returns: The polynomials X_i - g_i(X_0) and the minimal polynomial of X_0, in the ring with the lexicographic order
+    :rtype: list
+    """
+
+    R = groebner_basis[0].parent()
+    field = R.base()
+
+    if not field.is_prime_field():
+        return None
+
+    characteristic = int(field.characteristic())
+    last_variable = R.gens()[-1]
+
+    if standard_monomials is None:
+        standard_monomials = list(ideal(groebner_basis).normal_basis())
+    degree = len(standard_monomials)
+    index = {monomial : position for (position, monomial) in enumerate(standard_monomials)}
+
+    matrix_transpose = multiplication_matrix_transpose(groebner_basis, last_variable, standard_monomials)
+
+    ### The sequence of 1 gives the minimal polynomial, the ones of the other variables their parametrization
+    targets = [([index[R(1)]], [1])]
+    for variable in R.gens()[:-1]:
+        normal_form = variable.reduce(groebner_basis)
+        targets.append(([index[term] for term in normal_form.monomials()], [int(coefficient) for coefficient in normal_form.coefficients()]))
+
+    generator = Random(seed)
+    linear_form = np.array([generator.randrange(characteristic) for _ in range(degree)], dtype=modular_dtype(characteristic))
+
+    sequences = krylov_projections(matrix_transpose, characteristic, linear_form, targets, [2 * degree] + [degree] * (len(targets) - 1))
+
+    minimal_polynomial = berlekamp_massey([field(element) for element in sequences[0]]).monic()
+
+    if minimal_polynomial.degree() != degree:
+        return None
+
+    ### The minimal polynomial of the sequence has the degree of the ideal, then it is the one of X_0 and N_1 is invertible modulo it
+    R_univariate = minimal_polynomial.parent()
+
+    def numerator(sequence:list[int]):
+        ### Polynomial part of the product of the minimal polynomial by the sum of sequence[k] / T^(k+1)
+        return (minimal_polynomial * R_univariate(list(reversed([field(element) for element in sequence])))).shift(-degree)
+
+    inverse_numerator_one = numerator(sequences[0][:degree]).inverse_mod(minimal_polynomial)
+
+    R_lex = R.change_ring(order="lex")
+    position = len(R.gens()) - 1
+
+    def in_lex_ring(polynomial):
+        return R_lex({tuple(exponent if j == position else 0 for j in range(len(R.gens()))) : coefficient for (exponent, coefficient) in polynomial.dict().items()})
+
+    lex_basis = []
+
+    for (variable, sequence) in zip(R.gens()[:-1], sequences[1:]):
+        parametrization = numerator(sequence) * inverse_numerator_one % minimal_polynomial
+        lex_basis.append(R_lex(variable) - in_lex_ring(parametrization))
+
+    lex_basis.append(in_lex_ring(minimal_polynomial))
+
+    return lex_basis
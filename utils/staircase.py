@@ -0,0 +1,103 @@
+"""
+
+Degree of a zero-dimensional ideal read on the leading monomials of a Gröbner basis for any monomial order: it is the number of standard monomials, the monomials that are not divisible by a leading monomial (the staircase of the ideal).
+
+The monomials are counted on the exponent vectors, without Sage, by splitting on the exponent of the last variable: between two consecutive exponents of this variable among the leading monomials, the leading monomials dividing a monomial don't change, so the count of the other variables is computed once for the whole range.
+
+"""
+
+def minimal_monomials(monomials:set[tuple[int, ...]]):
+
+    """
+    Return the monomials that are not divisible by another monomial of the set, they generate the same monomial ideal
+
+    :param monomials: Exponent vectors
+    :type monomials: set[tuple[int, ...]]
+
+    :rtype: frozenset[tuple[int, ...]]
+    """
+
+    sorted_monomials = sorted(monomials, key=sum)
+    minimal = []
+
+    for monomial in sorted_monomials:
+        if not any(all(d <= e for (d, e) in zip(divisor, monomial)) for divisor in minimal):
+            minimal.append(monomial)
+
+    return frozenset(minimal)
+
+def count_standard_monomials(leading_exponents:list[tuple[int, ...]], number_variables:int=None):
+
+    """
+    Return the number of standard monomials of a monomial ideal, that is the degree of a zero-dimensional ideal whose Gröbner basis has these leading monomials. Return None if the number is infinite (ideal of positive dimension), 0 for the full ring.
+
+    :param leading_exponents: Exponent vectors of the leading monomials of a Gröbner basis
+    :type leading_exponents: list[tuple[int, ...]]
+    :param number_variables: Number of variables, the length of the exponent vectors if it is None
+    :type number_variables: int
+
+    :rtype: int
+    """
+
+    if number_variables is None:
+        number_variables = len(leading_exponents[0]) if leading_exponents else 0
+
+    memory = {} ### Counts already computed, by monomial ideal of the first variables
+
+    def count(monomials:frozenset, variables:int):
+
+        if (monomials, variables) in memory:
+            return memory[(monomials, variables)]
+
+        if (0,) * variables in monomials: ### The monomial 1 is a leading monomial
+            result = 0
+
+        elif variables == 0:
+            result = 1
+
+        else:
+
+            breakpoints = sorted(set([0] + [monomial[-1] for monomial in monomials]))
+            result = 0
+
+            for (position, exponent) in enumerate(breakpoints):
+
+                ### The leading monomials dividing a monomial with this exponent of the last variable, projected on the other variables
+                projected = minimal_monomials(set(monomial[:-1] for monomial in monomials if monomial[-1] <= exponent))
+                sub_count = count(projected, variables - 1)
+
+                if sub_count is None:
+                    result = None
+                    break
+
+                if position == len(breakpoints) - 1:
+                    if sub_count > 0: ### Infinitely many exponents of the last variable
+                        result = None
+                    break
+
+                result += sub_count * (breakpoints[position + 1] - exponent)
+
+        memory[(monomials, variables)] = result
+
+        return result
+
+    return count(minimal_monomials(set(tuple(int(e) for e in exponents) for exponents in leading_exponents)), number_variables)
+
+def groebner_basis_degree(groebner_basis:list):
+
+    """
+    Return the degree of the ideal of a Gröbner basis of Sage polynomials, computed on its leading monomials for the term order of their ring. Return None if the ideal has positive dimension.
+
+    :param list groebner_basis: Gröbner basis
+
+    :rtype: int
+    """
+
+    groebner_basis = [polynomial for polynomial in groebner_basis if polynomial != 0]
+
+    if groebner_basis == []:
+        return None
+
+    number_variables = groebner_basis[0].parent().ngens()
+
+    return count_standard_monomials([polynomial.lm().exponents()[0] for polynomial in groebner_basis], number_variables)
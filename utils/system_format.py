@@ -0,0 +1,331 @@
+from json import dumps, loads
+
+import numpy as np
+
+"""
+
+Binary format of the generated systems of equations, it may be read without Sage.
+
+The file starts with the magic number, the length of the JSON header (8 bytes, little endian) and the header. The header contains the characteristic of the prime field, the names of the variables, the monomial order and for every system its generation time, its status and the offsets of its equations. Every equation is stored as two arrays aligned on 8 bytes: the matrix of the exponents of its terms (one row by term, one column by variable) as unsigned integers of the smallest size fitting the exponents, and its coefficients modulo the characteristic as uint64. The arrays are read with numpy.memmap, without loading the whole file.
+
+"""
+
+MAGIC = b"PESSCYS1"
+
+def align(offset:int):
+
+    """
+    Return the first offset aligned on 8 bytes after offset
+    """
+
+    return (offset + 7) // 8 * 8
+
+def exponent_dtype(max_exponent:int):
+
+    """
+    Return the smallest unsigned integer type fitting the exponents
+    """
+
+    for dtype in [np.uint8, np.uint16, np.uint32]:
+        if max_exponent <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+def write_systems(path:str, characteristic:int, variables:list[str], order:dict, systems:list[tuple]):
+
+    """
+    Write systems of equations in the binary format
+
+    :param path: Path to the file
+    :type path: str
+    :param characteristic: Characteristic of the prime field
+    :type characteristic: int
+    :param variables: Names of the variables of the polynomial ring
+    :type variables: list[str]
+    :param order: Monomial order of the polynomial ring, see term_order_to_json
+    :type order: dict
+    :param systems: List of (equations, generation time). The equations are a list of (exponents, coefficients) of the polynomials, or the status of the generation ("timeout", "failed", None...) if there is no system
+    :type systems: list[tuple]
+    """
+
+    max_exponent = max([int(np.max(exponents)) for (equations, _) in systems if isinstance(equations, list) for (exponents, _) in equations if len(exponents) > 0] + [0])
+    dtype = exponent_dtype(max_exponent)
+
+    arrays = []
+    systems_header = []
+
+    for (equations, generation_time) in systems:
+
+        if not isinstance(equations, list):
+            systems_header.append({"generation_time" : generation_time, "status" : str(equations), "equations" : []})
+            continue
+
+        equations_header = []
+
+        for (exponents, coefficients) in equations:
+            exponents = np.asarray(exponents, dtype=dtype).reshape(len(coefficients), len(variables))
+            coefficients = np.asarray([int(c) % characteristic for c in coefficients], dtype=np.uint64)
+            equations_header.append({"terms" : len(coefficients)})
+            arrays.append(exponents)
+            arrays.append(coefficients)
+
+        systems_header.append({"generation_time" : generation_time, "status" : None, "equations" : equations_header})
+
+    header = {"format" : 1, "characteristic" : int(characteristic), "variables" : list(variables), "order" : order, "exponent_dtype" : dtype.name, "systems" : systems_header}
+
+    ### The offsets depend on the length of the header that contains them, they are computed with a header of the final length
+    placeholder = 10**18
+    for system in systems_header:
+        for equation in system["equations"]:
+            equation["exponents"] = placeholder
+            equation["coefficients"] = placeholder
+
+    data_start = align(len(MAGIC) + 8 + len(dumps(header).encode()))
+
+    offset = data_start
+    array_offsets = []
+    for array in arrays:
+        array_offsets.append(offset)
+        offset = align(offset + array.nbytes)
+
+    k = 0
+    for system in systems_header:
+        for equation in system["equations"]:
+            equation["exponents"] = array_offsets[k]
+            equation["coefficients"] = array_offsets[k+1]
+            k += 2
+
+    header_bytes = dumps(header).encode()
+    header_bytes += b" " * (data_start - len(MAGIC) - 8 - len(header_bytes))
+
+    with open(path, 'wb') as f_sys:
+        f_sys.write(MAGIC)
+        f_sys.write(len(header_bytes).to_bytes(8, "little"))
+        f_sys.write(header_bytes)
+        for (array, array_offset) in zip(arrays, array_offsets):
+            f_sys.write(b"\0" * (array_offset - f_sys.tell()))
+            f_sys.write(array.tobytes())
+        f_sys.flush()
+
+class SystemsFile:
+
+    """
+    Reader of a file of systems of equations in the binary format. The arrays of the equations are mapped in memory, they are not copied.
+
+    :param path: Path to the file
+    :type path: str
+    """
+
+    def __init__(self, path:str):
+        self.path = path
+
+        with open(path, 'rb') as f_sys:
+            if f_sys.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a file of systems of equations")
+            header_length = int.from_bytes(f_sys.read(8), "little")
+            self.header = loads(f_sys.read(header_length).decode())
+
+        self.characteristic = self.header["characteristic"]
+        self.variables = self.header["variables"]
+        self.order = self.header["order"]
+        self.dtype = np.dtype(self.header["exponent_dtype"])
+
+    def __len__(self):
+        return len(self.header["systems"])
+
+    def generation_time(self, i:int):
+
+        """
+        Return the generation time of the system i
+        """
+
+        return self.header["systems"][i]["generation_time"]
+
+    def status(self, i:int):
+
+        """
+        Return the status of the generation of the system i, None if the system has been generated
+        """
+
+        return self.header["systems"][i]["status"]
+
+    def equations(self, i:int):
+
+        """
+        Return the list of (exponents, coefficients) of the equations of the system i as arrays mapped in memory
+
+        :param i: Index of the system
+        :type i: int
+        """
+
+        equations = []
+
+        for equation in self.header["systems"][i]["equations"]:
+            terms = equation["terms"]
+            if terms == 0: ### The zero polynomial, an empty array can't be mapped
+                equations.append((np.zeros((0, len(self.variables)), dtype=self.dtype), np.zeros(0, dtype=np.uint64)))
+                continue
+            exponents = np.memmap(self.path, dtype=self.dtype, mode='r', offset=equation["exponents"], shape=(terms, len(self.variables)))
+            coefficients = np.memmap(self.path, dtype=np.uint64, mode='r', offset=equation["coefficients"], shape=(terms,))
+            equations.append((exponents, coefficients))
+
+        return equations
+
+    def shape(self, i:int):
+
+        """
+        Return the shape of the system i: for every equation, its number of monomials, the indices of its variables and its total degree
+
+        :param i: Index of the system
+        :type i: int
+        """
+
+        system_shape = []
+
+        for (exponents, coefficients) in self.equations(i):
+            used = np.any(exponents > 0, axis=0) if len(coefficients) > 0 else np.zeros(len(self.variables), dtype=bool)
+            indices = [int(self.variables[k].split('_')[1]) for k in range(len(self.variables)) if used[k]]
+            degree = int(exponents.sum(axis=1, dtype=np.uint64).max()) if len(coefficients) > 0 else -1
+            system_shape.append((len(coefficients), indices, degree))
+
+        return system_shape
+
+    def equation_to_str(self, exponents, coefficients):
+
+        """
+        Return the string of an equation without building it in Sage
+        """
+
+        terms = []
+
+        for (exponent, coefficient) in zip(exponents, coefficients):
+            monomial = "*".join(name if e == 1 else f"{name}^{int(e)}" for (name, e) in zip(self.variables, exponent) if e != 0)
+            if monomial == "":
+                terms.append(str(int(coefficient)))
+            elif coefficient == 1:
+                terms.append(monomial)
+            else:
+                terms.append(f"{int(coefficient)}*{monomial}")
+
+        return " + ".join(terms) if terms != [] else "0"
+
+    def ring(self):
+
+        """
+        Return the Sage polynomial ring of the systems
+        """
+
+        from sage.all import GF, PolynomialRing
+
+        return PolynomialRing(GF(self.characteristic), self.variables, order=term_order_from_json(self.order, len(self.variables)))
+
+    def to_sage(self, i:int, ring=None):
+
+        """
+        Return the system i as a list of Sage polynomials, None or its status if it has not been generated
+
+        :param i: Index of the system
+        :type i: int
+        :param ring: Polynomial ring of the polynomials, the one of the file if it is None
+        """
+
+        status = self.status(i)
+
+        if status is not None:
+            return None if status == "None" else status
+
+        if ring is None:
+            ring = self.ring()
+
+        return [ring({tuple(int(e) for e in exponent) : int(coefficient) for (exponent, coefficient) in zip(exponents, coefficients)}) for (exponents, coefficients) in self.equations(i)]
+
+class SystemReference:
+
+    """
+    Reference to a system of equations of a file in the binary format. It is sent to the solver processes instead of the Sage polynomials, that are only built by the process solving the system.
+
+    :param path: Path to the file
+    :type path: str
+    :param index: Index of the system in the file
+    :type index: int
+    """
+
+    def __init__(self, path:str, index:int):
+        self.path = path
+        self.index = index
+
+    def to_sage(self):
+
+        """
+        Return the system as a list of Sage polynomials
+        """
+
+        return SystemsFile(self.path).to_sage(self.index)
+
+def sage_to_columns(system_of_equations:list):
+
+    """
+    Return the list of (exponents, coefficients) of the equations of a Sage system of equations
+
+    :param system_of_equations: List of Sage polynomials
+    :type system_of_equations: list
+    """
+
+    equations = []
+
+    for equation in system_of_equations:
+        terms = equation.dict()
+        equations.append(([tuple(int(e) for e in exponent) for exponent in terms.keys()], [int(coefficient) for coefficient in terms.values()]))
+
+    return equations
+
+def term_order_to_json(term_order):
+
+    """
+    Return a description of a Sage term order that may be stored in JSON
+
+    :param term_order: Sage term order
+    """
+
+    blocks = term_order.blocks()
+
+    if len(blocks) > 1:
+        return {"blocks" : [term_order_to_json(block) for block in blocks], "length" : len(term_order)}
+
+    name = term_order.name()
+
+    if name == "matrix":
+        return {"name" : name, "matrix" : [[int(e) for e in row] for row in term_order.matrix()], "length" : len(term_order)}
+
+    if term_order.weights() is not None:
+        return {"name" : name, "weights" : [int(w) for w in term_order.weights()], "length" : len(term_order)}
+
+    return {"name" : name, "length" : len(term_order)}
+
+def term_order_from_json(order:dict, n_vars:int):
+
+    """
+    Return the Sage term order of a description made by term_order_to_json
+
+    :param order: Description of the term order
+    :type order: dict
+    :param n_vars: Number of variables of the ring
+    :type n_vars: int
+    """
+
+    from sage.all import TermOrder, matrix
+
+    if "blocks" in order:
+        term_order = None
+        for block in order["blocks"]:
+            block_order = term_order_from_json(block, block["length"])
+            term_order = block_order if term_order is None else term_order + block_order
+        return term_order
+
+    if order["name"] == "matrix":
+        return TermOrder(matrix(order["matrix"]))
+
+    if "weights" in order:
+        return TermOrder(order["name"], tuple(order["weights"]))
+
+    return TermOrder(order["name"], n_vars)
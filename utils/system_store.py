@@ -0,0 +1,125 @@
+from functools import lru_cache
+from hashlib import sha256
+from importlib import import_module
+
+from utils.artifact_store import ArtifactStore
+from utils.utils_all import run_processes_with_timeout
+
+@lru_cache(maxsize=None)
+def source_hash(module_name:str):
+
+    """
+    Return the hash of the source files of a module and of the modules of the tool it imports from (utils.matrices_generation for the permutations...). It is part of the keys of the cache: a change of the code of a generator makes its cached systems unreachable instead of serving them.
+
+    :param module_name: Name of the module, for instance permutations.griffin
+    :type module_name: str
+    """
+
+    module = import_module(module_name)
+
+    module_names = {module_name}
+    for element in vars(module).values():
+        name = getattr(element, "__module__", None)
+        if isinstance(name, str) and name.split(".")[0] in ["permutations", "utils"]:
+            module_names.add(name)
+
+    hash_sources = sha256()
+    for name in sorted(module_names):
+        try:
+            with open(import_module(name).__file__, 'rb') as f_source:
+                hash_sources.update(f_source.read())
+        except (OSError, TypeError, ImportError):
+            hash_sources.update(name.encode())
+        hash_sources.update(b"\0")
+    return hash_sources.hexdigest()
+
+class SystemStore(ArtifactStore):
+
+    """
+    Cache on disk of the generated systems of equations, shared by the benchmarks, the generations and the random comparisons. A system is stored under the hash of the name of its generator, of its source code (see source_hash) and of all the inputs of the generation (field, order, branches, rounds, cico, seed, constant vectors...).
+
+    The least recently used systems are removed when the cache is larger than its maximal size (see ArtifactStore).
+
+    :param folder: Folder of the cache
+    :type folder: str
+    :param max_size: Maximal size of the cache in bytes
+    :type max_size: int
+    :param enabled: False to neither read nor write the cache, the systems are always generated
+    :type enabled: bool
+    """
+
+    def __init__(self, folder:str="results/cache/systems", max_size:int=20 * 2**30, enabled:bool=True):
+        super().__init__(folder, max_size)
+        self.enabled = enabled
+
+    def get(self, key:str):
+
+        """
+        Return the system stored under the key, None if there is none or if the cache is disabled
+
+        :param key: Hash of the inputs of the generation
+        :type key: str
+        """
+
+        if not self.enabled:
+            return None
+
+        return super().get(key)
+
+    def put(self, key:str, value):
+
+        """
+        Store a system under the key, unless the cache is disabled
+
+        :param key: Hash of the inputs of the generation
+        :type key: str
+        :param value: System of equations and its generation time
+        """
+
+        if not self.enabled:
+            return
+
+        super().put(key, value)
+
+    def generate(self, permutation:str, target, args_list:list[tuple], timeout:float, cores:int=1):
+
+        """
+        Return the systems of equations of every tuple of arguments of the generator, from the cache when they have already been generated by the same code, else by running the generator (see run_processes_with_timeout). The systems generated are added to the cache, unless it is disabled.
+
+        :param permutation: Name of the permutation (or random) of the generator
+        :type permutation: str
+        :param target: Generator of the system of equations, its first argument is the Queue where it puts the system and its generation time
+        :param args_list: List of tuples of arguments of the generator without the Queue
+        :type args_list: list[tuple]
+        :param timeout: Timeout for each generation
+        :type timeout: float
+        :param cores: Maximal number of generations at the same time
+        :type cores: int
+
+        :returns: For every tuple of arguments, ("done", (system, generation time)), ("timeout", None) or ("failed", error message)
+        :rtype: list[tuple[str, any]]
+        """
+
+        ### The source code of the generator is part of the key, the generator may be a partial function (see import_perm)
+        version = source_hash(getattr(target, "func", target).__module__)
+
+        keys = [self.key(permutation, version, *args) for args in args_list]
+
+        outcomes = [None] * len(args_list)
+
+        for (i, key) in enumerate(keys):
+            cached = self.get(key)
+            if cached is not None:
+                print(f"System {i} read from the cache", flush=True)
+                outcomes[i] = ("done", cached)
+
+        missing_indices = [i for i in range(len(args_list)) if outcomes[i] is None]
+
+        generation_outcomes = run_processes_with_timeout(target, [args_list[i] for i in missing_indices], timeout, cores)
+
+        for (i, outcome) in zip(missing_indices, generation_outcomes):
+            outcomes[i] = outcome
+            if outcome[0] == "done" and outcome[1][0] is not None:
+                self.put(keys[i], outcome[1])
+
+        return outcomes
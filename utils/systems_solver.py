@@ -1,13 +1,26 @@
 from sys import argv
+from os import sched_getaffinity, sched_setaffinity
+from multiprocessing import Queue, Process
+from queue import Empty
+from time import monotonic
 import traceback
-from sage.all import ideal, PolynomialRing, parent
+from sage.all import ideal, PolynomialRing, parent, matrix
 from sage.libs.singular.option import opt, opt_ctx
 from sage.libs.singular.function import singular_function
 from pickle import load
 from re import search
 
-from utils.pickle_utils import change_dict_pkl
-from utils.timer import Chronograph
+from utils.artifact_store import ArtifactStore
+from utils.linear_elimination import eliminate_linear_equations
+from utils.staircase import groebner_basis_degree
+from utils.memory_limit import is_out_of_memory
+from utils.pickle_utils import change_dict_pkl, change_dict_failed_to_status
+from utils.sparse_fglm import sparse_fglm, multiplication_matrices_profile
+from utils.system_format import SystemReference, term_order_to_json
+from utils.timer import Chronograph, ResourceMonitor
+from utils.utils_all import kill_process_tree
+
+ARTIFACT_STORE_MAX_SIZE = 10 * 2**30 ### Maximal size in bytes of the store of the first Gröbner bases, the least recently used ones are removed above it
 
 def is_shape_position_polynomial_var(p, special_var):
 
@@ -107,143 +120,153 @@ def computation_shape_position_and_ideal_degree(gb_lex:list):
                     return -1, "Not shape position"
         
         return degree, isRadical
-    
-def solve(file_log_result_path:str, file_output_result_path:str, i:int, number_test:int, system_of_equations:list, algo_gb:str, monomial_order:str, algo_order_change:str, options:dict[str, list[dict[str, any]]]=None):
 
-    """Compute the LEX groebner basis either by computing straight LEX or Monomial Order and Change order algorithm
-    
-    :param str file_log_result_path: Path to the log file
-    :param str file_output_result_path: Path to the file containing result
-    :param int i: Number of the system of equations to solve
-    :param int number_test: Total number of systems of equations to solve
-    :param list system_of_equations: System of equations to solve
-    :param str algo_gb: Algorithm to compute the Gröbner basis
-    :param str monomial_order: Monomial order to use for the computation of the first Gröbner basis
-    :param str algo_order_change: Algorithm to use for the temr order change step
-    :param dict[str, list[dict[str, any]]] options: Options for the Gröbner basis algorithm
-    
+def leading_ideal_hilbert_series(groebner_basis:list):
+
+    """Return the Hilbert series of the ideal generated by the leading monomials of a Gröbner basis, graded by the weights of the term order. For a degree order, it is the affine Hilbert series of the ideal (a polynomial for a zero-dimensional ideal, whose value at 1 is its degree).
+
+    :param list groebner_basis: Gröbner basis
     """
 
-    ### Reset the options of Singular library
-    opt.reset_default()
+    R = groebner_basis[0].parent()
+    leading_ideal = ideal([polynomial.lm() for polynomial in groebner_basis if polynomial != 0])
 
-    R = system_of_equations[0].parent()
-    field = R.base()
-    variables_list = R.gens()
-    reverse_variables_list = list(reversed(variables_list))
+    if R.term_order().weights() is not None:
+        return leading_ideal.hilbert_series(grading=R.term_order().weights())
 
-    R_reversed = PolynomialRing(field, reverse_variables_list, order=monomial_order) ### We reverse the order of the variable list as the last ones must be the one not to eliminate (for dimension 0, it is X_0)
+    return leading_ideal.hilbert_series()
 
-    new_system_of_equations = []
+def is_radical_zero_dimensional(groebner_basis:list, standard_monomials:list=None):
 
-    for equation in system_of_equations:
-        equation = R_reversed(equation)
-        new_system_of_equations.append(equation)
+    """Return whether a zero-dimensional ideal over a finite field is radical, from a Gröbner basis for any term order.
 
-    I = ideal(new_system_of_equations)
-    
-    ### Init the solving degree to -1
-    solving_degree = -1
+    By Seidenberg's lemma, the ideal is radical if and only if the minimal polynomial of every variable in the quotient ring is squarefree. It is the minimal polynomial of the matrix of the multiplication by the variable on the standard monomials.
 
-    timer_find_groebner_basis = Chronograph("Gröbner basis computation using {}".format(algo_gb)) 
+    :param list groebner_basis: Gröbner basis of a zero-dimensional ideal
+    :param list standard_monomials: Standard monomials of the Gröbner basis, computed if it is None
 
-    ### Try to compute the first Gröbner basis
+    :rtype: bool
+    """
 
-    try:
-        if algo_gb.startswith("libsingular"):
+    I = ideal(groebner_basis)
+    R = I.ring()
 
-            if algo_gb == 'libsingular:groebner_direct':
+    if standard_monomials is None:
+        standard_monomials = list(I.normal_basis())
+    index = {monomial : position for (position, monomial) in enumerate(standard_monomials)}
 
-                if options is not None:
-                    with opt_ctx(**options):
-                        groebner = singular_function('groebner')
-                        groebner_basis = groebner(I)
+    for variable in R.gens():
 
-                else:
+        multiplication_matrix = matrix(R.base(), len(standard_monomials), len(standard_monomials), sparse=True)
+
+        for (column, monomial) in enumerate(standard_monomials):
+            normal_form = (variable * monomial).reduce(groebner_basis)
+            for (coefficient, term) in zip(normal_form.coefficients(), normal_form.monomials()):
+                multiplication_matrix[index[term], column] = coefficient
+
+        minimal_polynomial = multiplication_matrix.minimal_polynomial()
+
+        if minimal_polynomial.gcd(minimal_polynomial.derivative()).degree() > 0:
+            return False
+
+    return True
+
+def compute_groebner_basis(I, algo_gb:str, monomial_order:str, options:dict[str, list[dict[str, any]]], system_of_equations:list):
+
+    """Compute the first Gröbner basis of the ideal with the algorithm asked
+    
+    :param I: Ideal generated by the system of equations in the ring with the reversed variables
+    :param str algo_gb: Algorithm to compute the Gröbner basis
+    :param str monomial_order: Monomial order to use for the computation of the first Gröbner basis
+    :param dict[str, list[dict[str, any]]] options: Options for the Gröbner basis algorithm
+    :param list system_of_equations: System of equations in the original ring
+
+    :returns: The Gröbner basis
+    """
+
+    R = system_of_equations[0].parent()
+    field = R.base()
+    variables_list = R.gens()
+
+    if algo_gb.startswith("libsingular"):
+
+        if algo_gb == 'libsingular:groebner_direct':
+
+            if options is not None:
+                with opt_ctx(**options):
                     groebner = singular_function('groebner')
-                    groebner_basis = std(I)
+                    groebner_basis = groebner(I)
 
-            elif algo_gb == 'libsingular:std_direct':
+            else:
+                groebner = singular_function('groebner')
+                groebner_basis = std(I)
 
-                if options is not None:
-                    with opt_ctx(**options):
-                        std = singular_function('std')
-                        groebner_basis = std(I)
+        elif algo_gb == 'libsingular:std_direct':
 
-                else:
+            if options is not None:
+                with opt_ctx(**options):
                     std = singular_function('std')
                     groebner_basis = std(I)
 
-            elif algo_gb == 'libsingular:slimgb_direct':
+            else:
+                std = singular_function('std')
+                groebner_basis = std(I)
 
-                if options is not None:
-                    with opt_ctx(**options):
-                        slimgb = singular_function('slimgb')
-                        groebner_basis = slimgb(I)
+        elif algo_gb == 'libsingular:slimgb_direct':
 
-                else:
+            if options is not None:
+                with opt_ctx(**options):
                     slimgb = singular_function('slimgb')
                     groebner_basis = slimgb(I)
 
-            elif algo_gb == 'libsingular:stdhilb_direct':
+            else:
+                slimgb = singular_function('slimgb')
+                groebner_basis = slimgb(I)
 
-                if options is not None:
-                    with opt_ctx(**options):
-                        stdhilb = singular_function('stdhilb')
-                        groebner_basis = stdhilb(I)
+        elif algo_gb == 'libsingular:stdhilb_direct':
 
-                else:
+            if options is not None:
+                with opt_ctx(**options):
                     stdhilb = singular_function('stdhilb')
                     groebner_basis = stdhilb(I)
 
-            elif algo_gb == 'libsingular:stdfglm_direct':
+            else:
+                stdhilb = singular_function('stdhilb')
+                groebner_basis = stdhilb(I)
 
-                if options is not None:
-                    with opt_ctx(**options):
-                        stdfglm = singular_function('stdfglm')
-                        groebner_basis = stdfglm(I)
+        elif algo_gb == 'libsingular:stdfglm_direct':
 
-                else:
+            if options is not None:
+                with opt_ctx(**options):
                     stdfglm = singular_function('stdfglm')
                     groebner_basis = stdfglm(I)
 
-            elif algo_gb == 'libsingular:sba_direct':
+            else:
+                stdfglm = singular_function('stdfglm')
+                groebner_basis = stdfglm(I)
 
-                if options is not None:
+        elif algo_gb == 'libsingular:sba_direct':
 
-                    if "orders" in options.keys():
-                        internal_module_order = options["orders"][0] ### https://www.singular.uni-kl.de/Manual/4-0-3/sing_391.htm#SEC430
-                        rewrite_order = options["orders"][1] ### https://www.singular.uni-kl.de/Manual/4-0-3/sing_391.htm#SEC430
-                        options.pop("orders", None)
-                        with opt_ctx(**options):
-                            sba = singular_function('sba')
-                            groebner_basis = sba(I, internal_module_order, rewrite_order)
-                    
-                    else:
-                        with opt_ctx(**options):
-                            sba = singular_function('sba')
-                            groebner_basis = sba(I)
+            if options is not None:
 
+                if "orders" in options.keys():
+                    internal_module_order = options["orders"][0] ### https://www.singular.uni-kl.de/Manual/4-0-3/sing_391.htm#SEC430
+                    rewrite_order = options["orders"][1] ### https://www.singular.uni-kl.de/Manual/4-0-3/sing_391.htm#SEC430
+                    options.pop("orders", None)
+                    with opt_ctx(**options):
+                        sba = singular_function('sba')
+                        groebner_basis = sba(I, internal_module_order, rewrite_order)
+                
                 else:
-                    sba = singular_function('sba')
-                    groebner_basis = sba(I)
+                    with opt_ctx(**options):
+                        sba = singular_function('sba')
+                        groebner_basis = sba(I)
 
             else:
+                sba = singular_function('sba')
+                groebner_basis = sba(I)
 
-                if options is not None: 
-                    if "prot" in options.keys():
-                        prot = options["prot"]
-                        options.pop("prot", None)
-                        with opt_ctx(**options):
-                            groebner_basis = I.groebner_basis(algo_gb, prot=prot)
-                    else:
-                        with opt_ctx(**options):
-                            groebner_basis = I.groebner_basis(algo_gb)
-
-                else:
-                    groebner_basis = I.groebner_basis(algo_gb)
-
-        elif algo_gb.startswith("singular"):
+        else:
 
             if options is not None: 
                 if "prot" in options.keys():
@@ -251,7 +274,6 @@ def solve(file_log_result_path:str, file_output_result_path:str, i:int, number_t
                     options.pop("prot", None)
                     with opt_ctx(**options):
                         groebner_basis = I.groebner_basis(algo_gb, prot=prot)
-                    options["prot"] = prot
                 else:
                     with opt_ctx(**options):
                         groebner_basis = I.groebner_basis(algo_gb)
@@ -259,95 +281,417 @@ def solve(file_log_result_path:str, file_output_result_path:str, i:int, number_t
             else:
                 groebner_basis = I.groebner_basis(algo_gb)
 
-        elif algo_gb == "magma:GroebnerBasis":
+    elif algo_gb.startswith("singular"):
 
-            if options is not None:
+        if options is not None: 
+            if "prot" in options.keys():
+                prot = options["prot"]
+                options.pop("prot", None)
+                with opt_ctx(**options):
+                    groebner_basis = I.groebner_basis(algo_gb, prot=prot)
+                options["prot"] = prot
+            else:
+                with opt_ctx(**options):
+                    groebner_basis = I.groebner_basis(algo_gb)
 
-                groebner_basis = I.groebner_basis(algo_gb, prot=options["prot"])
+        else:
+            groebner_basis = I.groebner_basis(algo_gb)
 
-            else:
+    elif algo_gb == "magma:GroebnerBasis":
 
-                groebner_basis = I.groebner_basis(algo_gb)
+        if options is not None:
+
+            groebner_basis = I.groebner_basis(algo_gb, prot=options["prot"])
 
-        elif algo_gb == "giac:gbasis":
+        else:
 
-            ### invlex is not supported by Giac, we reverse the variables in the ring and use the lex order to have the same behaviour as invlex.
+            groebner_basis = I.groebner_basis(algo_gb)
 
-            if monomial_order == "invlex" or monomial_order == "Inverse lexicographic term order":
-                R_giac_invlex = PolynomialRing(field, variables_list, order="lex")
-                I = ideal([R_giac_invlex(equation) for equation in system_of_equations])
-                groebner_basis = I.groebner_basis(algo_gb)
+    elif algo_gb == "giac:gbasis":
 
-            else:
+        ### invlex is not supported by Giac, we reverse the variables in the ring and use the lex order to have the same behaviour as invlex.
+
+        if monomial_order == "invlex" or monomial_order == "Inverse lexicographic term order":
+            R_giac_invlex = PolynomialRing(field, variables_list, order="lex")
+            I = ideal([R_giac_invlex(equation) for equation in system_of_equations])
+            groebner_basis = I.groebner_basis(algo_gb)
+
+        else:
+            groebner_basis = I.groebner_basis(algo_gb)
+
+    elif algo_gb.startswith("eliminate:giac:"):
+
+        ### Use the elimination_ideal function of Sage with Giac
+
+        variables_to_eliminate_number = int(algo_gb[-1])
+        variables_to_eliminate = variables_list[variables_to_eliminate_number+1:]
+        groebner_basis = list(set(I.elimination_ideal(variables_to_eliminate, algorithm='giac:eliminate').gens()))
+        vars_to_keep = [variables_list[i] for i in range(variables_to_eliminate_number+1)]
+
+        groebner_basis_reduced = []
+
+        for e in groebner_basis:
+            if set(e.variables()) <= set(vars_to_keep) and e != field(0):
+                groebner_basis_reduced.append(e)
+
+        groebner_basis_reduced = list(set(groebner_basis_reduced))
+        groebner_basis=groebner_basis_reduced
+
+    elif algo_gb.startswith("eliminate:libsingular:"):
+
+        ### Use the elimination_ideal function of Sage with Singular
+
+        variables_to_eliminate_number = int(algo_gb[-1])
+        variables_to_eliminate = variables_list[variables_to_eliminate_number+1:]
+        groebner_basis = list(set(I.elimination_ideal(list(reversed(variables_to_eliminate)), algorithm='libsingular:eliminate').gens()))
+
+    else :
+
+        """
+            Only "prot" option is supported for now for Magma and Giac
+            No options are available for msolve and Macaulay2
+        """
+
+        if options is not None:
+
+            if algo_gb.startswith("msolve") or algo_gb.startswith("macaulay2"):
+                print("No option is possible for this algorithm")
                 groebner_basis = I.groebner_basis(algo_gb)
 
-        elif algo_gb.startswith("eliminate:giac:"):
+            else :
+                groebner_basis = I.groebner_basis(algo_gb, prot=options["prot"])
+
+        else:
+
+            groebner_basis = I.groebner_basis(algo_gb)
+
+    return groebner_basis
 
-            ### Use the elimination_ideal function of Sage with Giac
+def race_worker(q, I, algo_gb:str, monomial_order:str, options:dict[str, list[dict[str, any]]], system_of_equations:list):
 
-            variables_to_eliminate_number = int(algo_gb[-1])
-            variables_to_eliminate = variables_list[variables_to_eliminate_number+1:]
-            groebner_basis = list(set(I.elimination_ideal(variables_to_eliminate, algorithm='giac:eliminate').gens()))
-            vars_to_keep = [variables_list[i] for i in range(variables_to_eliminate_number+1)]
+    """Compute the first Gröbner basis with one backend of a race and put the result in the Queue
+    
+    :param q: Queue shared by the backends of the race
+    :param I: Ideal generated by the system of equations in the ring with the reversed variables
+    :param str algo_gb: Backend of the race
+    :param str monomial_order: Monomial order to use for the computation of the first Gröbner basis
+    :param dict[str, list[dict[str, any]]] options: Options for the Gröbner basis algorithm
+    :param list system_of_equations: System of equations in the original ring
+    """
 
-            groebner_basis_reduced = []
+    try:
+        groebner_basis = compute_groebner_basis(I, algo_gb, monomial_order, options, system_of_equations)
+        q.put((algo_gb, "done", list(groebner_basis)))
+    except Exception as e:
+        q.put((algo_gb, "failed", str(e)))
 
-            for e in groebner_basis:
-                if set(e.variables()) <= set(vars_to_keep) and e != field(0):
-                    groebner_basis_reduced.append(e)
+def race_groebner_basis(I, race_backends:list[str], monomial_order:str, options:dict[str, list[dict[str, any]]], system_of_equations:list):
 
-            groebner_basis_reduced = list(set(groebner_basis_reduced))
-            groebner_basis=groebner_basis_reduced
+    """Compute the first Gröbner basis with several backends at the same time, each one on its own core. The first basis computed is kept and the other backends are killed.
+    
+    :param I: Ideal generated by the system of equations in the ring with the reversed variables
+    :param list[str] race_backends: Algorithms racing to compute the Gröbner basis
+    :param str monomial_order: Monomial order to use for the computation of the first Gröbner basis
+    :param dict[str, list[dict[str, any]]] options: Options for the Gröbner basis algorithms
+    :param list system_of_equations: System of equations in the original ring
 
-        elif algo_gb.startswith("eliminate:libsingular:"):
+    :returns: The winning backend (None if they all failed), its Gröbner basis and, for every backend, the time when it finished or was stopped
+    """
 
-            ### Use the elimination_ideal function of Sage with Singular
+    cores = sorted(sched_getaffinity(0))
 
-            variables_to_eliminate_number = int(algo_gb[-1])
-            variables_to_eliminate = variables_list[variables_to_eliminate_number+1:]
-            groebner_basis = list(set(I.elimination_ideal(list(reversed(variables_to_eliminate)), algorithm='libsingular:eliminate').gens()))
+    q = Queue()
+    processes = {}
+    start = monotonic()
 
-        else :
+    for (k, backend) in enumerate(race_backends):
+        process = Process(target=race_worker, args=(q, I, backend, monomial_order, options, system_of_equations))
+        process.start()
+        try:
+            sched_setaffinity(process.pid, {cores[k % len(cores)]})
+        except OSError:
+            pass
+        processes[backend] = process
 
-            """
-                Only "prot" option is supported for now for Magma and Giac
-                No options are available for msolve and Macaulay2
-            """
+    backend_times = {}
+    winner = None
+    groebner_basis = None
 
-            if options is not None:
+    try:
 
-                if algo_gb.startswith("msolve") or algo_gb.startswith("macaulay2"):
-                    print("No option is possible for this algorithm")
-                    groebner_basis = I.groebner_basis(algo_gb)
+        while winner is None and len(backend_times) < len(race_backends):
 
-                else :
-                    groebner_basis = I.groebner_basis(algo_gb, prot=options["prot"])
+            try:
+                (backend, outcome, result) = q.get(timeout=1)
+            except Empty:
+                ### A backend may have crashed without answering
+                for (backend, process) in processes.items():
+                    if backend not in backend_times and not process.is_alive():
+                        backend_times[backend] = "crashed"
+                continue
+
+            backend_times[backend] = monotonic() - start
 
+            if outcome == "done":
+                winner, groebner_basis = backend, result
             else:
+                print(f"{backend} has failed: {result}", flush=True)
+                backend_times[backend] = "failed"
 
-                groebner_basis = I.groebner_basis(algo_gb)
+    finally:
 
-        groebner_computation_time = timer_find_groebner_basis.time_measure()
+        for (backend, process) in processes.items():
+            if process.is_alive():
+                kill_process_tree(process)
+                process.join()
+            if backend not in backend_times:
+                backend_times[backend] = monotonic() - start
 
-        ### Depending on the algorithm used to compute the Gröbner basis, the solving degree is returned. Then, we read the log file to return it
+    return winner, groebner_basis, backend_times
 
-        if options is not None and "prot" in options.keys() and options["prot"] == "sage" and (algo_gb.startswith("singular") or algo_gb.startswith("magma:GroebnerBasis")):
+def solve_metrics(file_output_result_path:str, i:int, number_test:int, groebner_basis:list, ideal_dimension:int):
 
-            print("Intermediate Gröbner basis computed", flush=True)
+    """Store the Hilbert series and the radicality of the ideal computed from the first Gröbner basis, instead of the results of the term order change. The ideal degree is the one of the staircase, already stored.
 
-            with open(file_log_result_path, "r") as f:
-                last_line = f.readlines()[-2].strip()
-            
-            match = search(r":\s*(\d+)", last_line)
-            if match:
-                solving_degree = int(match.group(1))
+    :param str file_output_result_path: Path to the file containing result
+    :param int i: Number of the system of equations to solve
+    :param int number_test: Total number of systems of equations to solve
+    :param list groebner_basis: First Gröbner basis
+    :param int ideal_dimension: Dimension of the ideal
+
+    :returns: The standard monomials of the Gröbner basis of a zero-dimensional ideal, None for the other ideals
+    :rtype: list
+    """
+
+    change_dict_pkl(file_output_result_path, i, number_test, "transformation_basis_time", "Metrics only")
+    change_dict_pkl(file_output_result_path, i, number_test, "shape_position", "Metrics only")
+
+    if ideal_dimension == -1:
+
+        change_dict_pkl(file_output_result_path, i, number_test, "ideal_degree", "Full Ring")
+        change_dict_pkl(file_output_result_path, i, number_test, "radical_ideal", "Full Ring")
+        change_dict_pkl(file_output_result_path, i, number_test, "hilbert_series", "Full Ring")
+
+        return None
+
+    resources_hilbert = ResourceMonitor("Hilbert series")
+    hilbert_series = leading_ideal_hilbert_series(groebner_basis)
+    print("Hilbert series:", hilbert_series, flush=True)
+
+    change_dict_pkl(file_output_result_path, i, number_test, "hilbert_series", str(hilbert_series))
+    change_dict_pkl(file_output_result_path, i, number_test, "hilbert_resources", resources_hilbert.measure())
+
+    if ideal_dimension > 0:
+
+        change_dict_pkl(file_output_result_path, i, number_test, "ideal_degree", "Positive dimension")
+        change_dict_pkl(file_output_result_path, i, number_test, "radical_ideal", "Positive dimension")
+
+        return None
+
+    resources_radicality = ResourceMonitor("Radicality of the ideal")
+    standard_monomials = list(ideal(groebner_basis).normal_basis())
+    radical_ideal = is_radical_zero_dimensional(groebner_basis, standard_monomials)
+    print("Radical ideal:", radical_ideal, flush=True)
+
+    change_dict_pkl(file_output_result_path, i, number_test, "radical_ideal", radical_ideal)
+    change_dict_pkl(file_output_result_path, i, number_test, "radicality_resources", resources_radicality.measure())
+
+    return standard_monomials
+
+def solve_matrices_profile(file_output_result_path:str, i:int, number_test:int, groebner_basis:list, standard_monomials:list=None):
+
+    """Store the density of the multiplication matrices of a zero-dimensional ideal (see multiplication_matrices_profile). The profile is measured once the results of the resolution are stored and has its own status 'matrices_status' ("failed" until it ends, then "done", or "error" when it raises an error), so a timeout or a memout of the profile never stops a step of the resolution.
+
+    :param str file_output_result_path: Path to the file containing result
+    :param int i: Number of the system of equations to solve
+    :param int number_test: Total number of systems of equations to solve
+    :param list groebner_basis: First Gröbner basis
+    :param list standard_monomials: Standard monomials of the Gröbner basis when they have already been computed
+    """
+
+    change_dict_pkl(file_output_result_path, i, number_test, "matrices_status", "failed")
+
+    try:
+        resources_matrices = ResourceMonitor("Density of the multiplication matrices")
+        profile = multiplication_matrices_profile(groebner_basis, standard_monomials)
+
+        change_dict_pkl(file_output_result_path, i, number_test, "multiplication_matrices", profile)
+        change_dict_pkl(file_output_result_path, i, number_test, "multiplication_nnz", sum(density["nnz"] for density in profile.values()))
+        change_dict_pkl(file_output_result_path, i, number_test, "multiplication_dense_columns", sum(density["dense_columns"] for density in profile.values()))
+        change_dict_pkl(file_output_result_path, i, number_test, "matrices_resources", resources_matrices.measure())
+        change_dict_pkl(file_output_result_path, i, number_test, "matrices_status", "done")
+
+    except Exception as e:
+        print(f"Error Multiplication matrices computation: {e}")
+        ResourceMonitor.stop_all()
+        if is_out_of_memory(e):
+            raise
+        ### The error would happen again, the profile is not measured again when the benchmark is resumed
+        change_dict_pkl(file_output_result_path, i, number_test, "matrices_status", "error")
+
+def solve(file_log_result_path:str, file_output_result_path:str, i:int, number_test:int, system_of_equations:list, algo_gb:str, monomial_order:str, algo_order_change:str, options:dict[str, list[dict[str, any]]]=None, artifact_store_folder:str=None, race_backends:list[str]=None, linear_elimination:bool=False, metrics_only:bool=False, matrix_profile:bool=False, memory_limit_mode:str=None):
+
+    """Compute the LEX groebner basis either by computing straight LEX or Monomial Order and Change order algorithm
+    
+    :param str file_log_result_path: Path to the log file
+    :param str file_output_result_path: Path to the file containing result
+    :param int i: Number of the system of equations to solve
+    :param int number_test: Total number of systems of equations to solve
+    :param list system_of_equations: System of equations to solve, or a SystemReference to a system stored in the binary format
+    :param str algo_gb: Algorithm to compute the Gröbner basis
+    :param str monomial_order: Monomial order to use for the computation of the first Gröbner basis, the one of the ring of the system if it is None. When variables are eliminated, the order of the reduced ring is used instead.
+    :param str algo_order_change: Algorithm to use for the temr order change step
+    :param dict[str, list[dict[str, any]]] options: Options for the Gröbner basis algorithm
+    :param str artifact_store_folder: Folder of the store of the first Gröbner bases, None to always compute them
+    :param list[str] race_backends: Algorithms racing to compute the first Gröbner basis instead of algo_gb, the first one to finish is kept. None to only use algo_gb.
+    :param bool linear_elimination: True to eliminate the variables of the equations of degree 1 by substitution before the computation of the Gröbner basis
+    :param bool metrics_only: True to only compute the dimension, the degree, the Hilbert series and the radicality of the ideal from the first Gröbner basis, without the term order change. The results are flagged with the key metrics_only.
+    :param bool matrix_profile: True to also measure the density of the multiplication matrices of the zero-dimensional ideals from the first Gröbner basis, after the other results (see solve_matrices_profile)
+    :param str memory_limit_mode: How the memory limit of the solver process is applied ("cgroup", or "rlimit" when it is only approximate for the programs started by the solver), None if there is no limit (see utils/memory_limit.py)
+    
+    """
+
+    ### Reset the options of Singular library
+    opt.reset_default()
+
+    ### The resources (wall time, CPU times, peak RSS) of every stage are stored next to its time, under the key {stage}_resources. The stages never overlap.
+
+    ### A system stored in the binary format is built here, in the solver process
+    if isinstance(system_of_equations, SystemReference):
+        resources_reading = ResourceMonitor("Reading of the system")
+        system_of_equations = system_of_equations.to_sage()
+        change_dict_pkl(file_output_result_path, i, number_test, "reading_resources", resources_reading.measure())
+
+    if metrics_only:
+        change_dict_pkl(file_output_result_path, i, number_test, "metrics_only", True)
+
+    if memory_limit_mode is not None:
+        change_dict_pkl(file_output_result_path, i, number_test, "memory_limit_mode", memory_limit_mode)
+
+    if linear_elimination:
+
+        ### The reduced system has the same dimension, degree and elimination ideal in X_0, the substitutions giving the eliminated variables are only printed
+        timer_preprocessing = Chronograph("Linear elimination")
+        resources_preprocessing = ResourceMonitor("Linear elimination")
+
+        system_of_equations, substitutions = eliminate_linear_equations(system_of_equations)
+
+        change_dict_pkl(file_output_result_path, i, number_test, "preprocessing_time", timer_preprocessing.time_measure())
+        change_dict_pkl(file_output_result_path, i, number_test, "preprocessing_resources", resources_preprocessing.measure())
+        change_dict_pkl(file_output_result_path, i, number_test, "eliminated_variables", [str(variable) for (variable, _) in substitutions])
+
+        for (variable, expression) in substitutions:
+            print("Substitution:", variable, "=", expression, flush=True)
+
+        ### The term order given for all the variables of the system doesn't fit the ring of the remaining variables (weighted orders), the one of the reduced ring is its restriction
+        if substitutions != []:
+            monomial_order = system_of_equations[0].parent().term_order()
+
+    resources_ring_conversion = ResourceMonitor("Ring conversion")
+
+    R = system_of_equations[0].parent()
+
+    if monomial_order is None:
+        monomial_order = R.term_order()
+    field = R.base()
+    variables_list = R.gens()
+    reverse_variables_list = list(reversed(variables_list))
+
+    R_reversed = PolynomialRing(field, reverse_variables_list, order=monomial_order) ### We reverse the order of the variable list as the last ones must be the one not to eliminate (for dimension 0, it is X_0)
+
+    new_system_of_equations = []
+
+    for equation in system_of_equations:
+        equation = R_reversed(equation)
+        new_system_of_equations.append(equation)
+
+    I = ideal(new_system_of_equations)
+
+    change_dict_pkl(file_output_result_path, i, number_test, "ring_conversion_resources", resources_ring_conversion.measure())
+
+    ### Init the solving degree to -1
+    solving_degree = -1
+
+    ### For an elimination order or an elimination algorithm, there is no term order change after the first Gröbner basis
+    elimination_order = monomial_order == "lex" or monomial_order == "Lexicographic term order" or monomial_order == "invlex" or monomial_order == "Inverse lexicographic term order" or monomial_order == "neglex" or algo_gb.startswith("eliminate")
+
+    ### The first Gröbner basis followed by a term order change is stored to be reused by the other term order change algorithms. The winner of a race is not known in advance, then the basis is not stored.
+    if artifact_store_folder is not None and not elimination_order and race_backends is None:
+        artifact_store = ArtifactStore(artifact_store_folder, ARTIFACT_STORE_MAX_SIZE)
+        ### The string of a ring doesn't give its term order, the same polynomials may be a system for degrevlex, deglex or a weighted order
+        basis_key = artifact_store.key(R_reversed, term_order_to_json(R_reversed.term_order()), new_system_of_equations, algo_gb, options)
+    else:
+        artifact_store = None
+
+    timer_find_groebner_basis = Chronograph("Gröbner basis computation using {}".format(algo_gb))
+    resources_groebner = ResourceMonitor("Gröbner basis computation using {}".format(algo_gb))
+
+    ### Try to compute the first Gröbner basis
+
+    try:
+
+        stored_basis = artifact_store.get(basis_key) if artifact_store is not None else None
+
+        if stored_basis is not None:
+
+            ### The basis has already been computed for another term order change algorithm or before a timeout of the term order change, its computation time is the one measured at that moment
+
+            groebner_basis, groebner_computation_time, solving_degree = stored_basis
+            print("Intermediate Gröbner basis read from the artifact store", flush=True)
+
+        elif race_backends is not None:
+
+            winner, groebner_basis, backend_times = race_groebner_basis(I, race_backends, monomial_order, options, system_of_equations)
+
+            groebner_computation_time = timer_find_groebner_basis.time_measure()
+
+            change_dict_pkl(file_output_result_path, i, number_test, "race_winner", winner)
+            change_dict_pkl(file_output_result_path, i, number_test, "race_times", backend_times)
+
+            if winner is None:
+                raise Exception("All the backends of the race have failed")
+
+            print("Intermediate Gröbner basis computed by", winner, flush=True)
+
+            ### The rest of the resolution depends on the backend that won
+            algo_gb = winner
+            elimination_order = elimination_order or algo_gb.startswith("eliminate")
+
+        else:
+
+            groebner_basis = compute_groebner_basis(I, algo_gb, monomial_order, options, system_of_equations)
+
+            groebner_computation_time = timer_find_groebner_basis.time_measure()
+
+            ### Depending on the algorithm used to compute the Gröbner basis, the solving degree is returned. Then, we read the log file to return it
+
+            if options is not None and "prot" in options.keys() and options["prot"] == "sage" and (algo_gb.startswith("singular") or algo_gb.startswith("magma:GroebnerBasis")):
+
+                print("Intermediate Gröbner basis computed", flush=True)
+
+                with open(file_log_result_path, "r") as f:
+                    last_line = f.readlines()[-2].strip()
+                
+                match = search(r":\s*(\d+)", last_line)
+                if match:
+                    solving_degree = int(match.group(1))
+
+            if artifact_store is not None:
+                artifact_store.put(basis_key, (groebner_basis, groebner_computation_time, solving_degree))
 
         change_dict_pkl(file_output_result_path, i, number_test, "groebner_time", groebner_computation_time)
+        change_dict_pkl(file_output_result_path, i, number_test, "groebner_resources", resources_groebner.measure())
         change_dict_pkl(file_output_result_path, i, number_test, "solving_degree", solving_degree)
+        change_dict_pkl(file_output_result_path, i, number_test, "groebner_basis_reused", stored_basis is not None)
         
     except Exception as e:
         print(f"Error Gröbner computation: {e}")
         print(traceback.format_exc())
+        ResourceMonitor.stop_all()
+        if is_out_of_memory(e): ### The solver process reports the memout
+            raise
+        ### The error would happen again, the system is not solved again when the benchmark is resumed
+        _ = change_dict_failed_to_status(file_output_result_path, i, number_test, "error")
         return
 
     """
@@ -358,12 +702,47 @@ def solve(file_log_result_path:str, file_output_result_path:str, i:int, number_t
     I = ideal(groebner_basis)
 
     ### Compute the dimension of the ideal, what is supposed to be efficient starting from a Gröbner basis
+    resources_dimension = ResourceMonitor("Dimension of the ideal")
     ideal_dimension = I.dimension() ### Too much time in some cases for positive dimension
     # ideal_dimension = 1 ### Possible to fix the dimension here
 
     change_dict_pkl(file_output_result_path, i, number_test, "ideal_dimension", ideal_dimension)
+    change_dict_pkl(file_output_result_path, i, number_test, "dimension_resources", resources_dimension.measure())
+
+    ### The degree of a zero-dimensional ideal is the number of standard monomials of the Gröbner basis computed, without the order change. The elimination algorithms only return the generators of an elimination ideal.
+    staircase_degree = None
+
+    if ideal_dimension == 0 and not algo_gb.startswith("eliminate"):
+
+        resources_staircase = ResourceMonitor("Ideal degree from the staircase")
+        staircase_degree = groebner_basis_degree(groebner_basis)
+        print("Ideal degree (staircase):", staircase_degree, flush=True)
+
+        change_dict_pkl(file_output_result_path, i, number_test, "ideal_degree", staircase_degree)
+        change_dict_pkl(file_output_result_path, i, number_test, "staircase_resources", resources_staircase.measure())
+
+    ### The density of the multiplication matrices predicting the cost of the term order change is only measured on demand, at the end of the resolution. The standard monomials of the first Gröbner basis are computed once for the radicality, the sparse order change and the profile.
+    profile_matrices = matrix_profile and staircase_degree is not None and (not elimination_order or metrics_only)
+    standard_monomials = None
+
+    ### The elimination algorithms have no term order change, their results are always read on the elimination ideal
+    if metrics_only and not algo_gb.startswith("eliminate"):
 
-    if ideal_dimension > 0 and algo_order_change == "fglm":
+        try:
+            standard_monomials = solve_metrics(file_output_result_path, i, number_test, groebner_basis, ideal_dimension)
+        except Exception as e:
+            print(f"Error Metrics computation: {e}")
+            ResourceMonitor.stop_all()
+            if is_out_of_memory(e):
+                raise
+            _ = change_dict_failed_to_status(file_output_result_path, i, number_test, "error")
+
+        if profile_matrices:
+            solve_matrices_profile(file_output_result_path, i, number_test, groebner_basis, standard_monomials)
+
+        return
+
+    if ideal_dimension > 0 and algo_order_change in ["fglm", "sparse_fglm"]:
         print("FGLM can't be used to compute a LEX basis for a positive dimensional ideal")
         change_dict_pkl(file_output_result_path, i, number_test, "transformation_basis_time", "Positive dimension for FLGM")
         change_dict_pkl(file_output_result_path, i, number_test, "ideal_degree", "Positive dimension for FLGM")
@@ -372,7 +751,7 @@ def solve(file_log_result_path:str, file_output_result_path:str, i:int, number_t
         return
     try:
 
-        if monomial_order == "lex" or monomial_order == "Lexicographic term order" or monomial_order == "invlex" or monomial_order == "Inverse lexicographic term order" or monomial_order == "neglex" or algo_gb.startswith("eliminate"):
+        if elimination_order:
             """
                 The original order is an elimination then nothing has to be done.
             """
@@ -385,18 +764,37 @@ def solve(file_log_result_path:str, file_output_result_path:str, i:int, number_t
                 Transform from the first order to an elimination order (lex by default)
             """
 
-            timer_transform_groebner_basis = Chronograph("Transforming Groebner basis using {}".format(algo_order_change)) 
-            new_groebner_basis = I.transformed_basis(algo_order_change)
+            timer_transform_groebner_basis = Chronograph("Transforming Groebner basis using {}".format(algo_order_change))
+            resources_transformation = ResourceMonitor("Transforming Groebner basis using {}".format(algo_order_change))
+            if algo_order_change == "sparse_fglm":
+
+                ### Only the ideals in shape position have a sparse order change, FGLM is used for the others
+                if ideal_dimension == 0:
+                    standard_monomials = list(I.normal_basis())
+                    new_groebner_basis = sparse_fglm(groebner_basis, standard_monomials=standard_monomials)
+                else:
+                    new_groebner_basis = None
+
+                if new_groebner_basis is None:
+                    print("Not in shape position, the order change is done with FGLM", flush=True)
+                    new_groebner_basis = I.transformed_basis("fglm")
+
+            else:
+                new_groebner_basis = I.transformed_basis(algo_order_change)
             transformation_computation_time = timer_transform_groebner_basis.time_measure()
-        
+            change_dict_pkl(file_output_result_path, i, number_test, "transformation_resources", resources_transformation.measure())
+
         change_dict_pkl(file_output_result_path, i, number_test, "transformation_basis_time", transformation_computation_time)
 
         if ideal_dimension == 0:
-            
+
+            resources_shape_degree = ResourceMonitor("Shape position and ideal degree")
             ideal_degree, isRadical = computation_shape_position_and_ideal_degree(new_groebner_basis)
             print("Ideal degree:", ideal_degree, flush=True)
             I = ideal(new_groebner_basis)
-            if ideal_degree == -1 or ideal_degree == -2:
+            if (ideal_degree == -1 or ideal_degree == -2) and staircase_degree is not None:
+                ideal_degree_singular = staircase_degree
+            elif ideal_degree == -1 or ideal_degree == -2:
                 ideal_degree_singular = I.vector_space_dimension() #### This function may take a long time to be computed
                 print("\nIdeal degree Singular:", ideal_degree_singular, flush=True)
             else:
@@ -410,6 +808,7 @@ def solve(file_log_result_path:str, file_output_result_path:str, i:int, number_t
             change_dict_pkl(file_output_result_path, i, number_test, "ideal_degree", ideal_degree_singular)
             change_dict_pkl(file_output_result_path, i, number_test, "shape_position", shape_position)
             change_dict_pkl(file_output_result_path, i, number_test, "radical_ideal", isRadical)
+            change_dict_pkl(file_output_result_path, i, number_test, "shape_degree_resources", resources_shape_degree.measure())
 
 
         elif ideal_dimension == -1:
@@ -426,12 +825,23 @@ def solve(file_log_result_path:str, file_output_result_path:str, i:int, number_t
 
         ### Print the last element of the lex Gröbner basis. For 0 dimensionnal ideal, the univariate polynomial is returned
 
+        resources_elimination_polynomial = ResourceMonitor("Generators of the elimination ideal")
+
         for e in new_groebner_basis:
             if set(e.variables()) <= set([variables_list[i] for i in range(ideal_dimension+1)]) and e != field(0):
                 print("Generator of the elimination ideal:", e, "\n", flush=True)
 
+        change_dict_pkl(file_output_result_path, i, number_test, "elimination_polynomial_resources", resources_elimination_polynomial.measure())
+
     except Exception as e:
         print(f"Error Transformation computation: {e}")
+        ResourceMonitor.stop_all()
+        if is_out_of_memory(e):
+            raise
+        _ = change_dict_failed_to_status(file_output_result_path, i, number_test, "error")
+
+    if profile_matrices:
+        solve_matrices_profile(file_output_result_path, i, number_test, groebner_basis, standard_monomials)
 
 if __name__ == "__main__":
 
@@ -440,7 +850,7 @@ if __name__ == "__main__":
     ### The inputs of the solve function are stored in a file
 
     with open(input_file, "rb") as f:
-        (file_log_result_path, file_output_result_path, i, number_test, system_of_equations, algo_gb, monomial_order, algo_order_change, options) = load(f)
+        (file_log_result_path, file_output_result_path, i, number_test, system_of_equations, algo_gb, monomial_order, algo_order_change, options, solver_options) = load(f)
     f.close()
 
-    solve(file_log_result_path, file_output_result_path, i, number_test, system_of_equations, algo_gb, monomial_order, algo_order_change, options=options)
+    solve(file_log_result_path, file_output_result_path, i, number_test, system_of_equations, algo_gb, monomial_order, algo_order_change, options=options, **solver_options)
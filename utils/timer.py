@@ -1,22 +1,187 @@
-from datetime import datetime
+from os import times, getpid
+from resource import getrusage, RUSAGE_CHILDREN
+from threading import Thread, Event
+from time import monotonic
+
+from psutil import Process, NoSuchProcess, AccessDenied
 
 class Chronograph:
 
     """
-    Class to create a timer
-    
+    Class to create a timer, it uses a monotonic clock that is not changed by the updates of the system time
+
     :param title: Title of the timer
     :type title: str
     """
 
     def __init__(self, title:str):
         self.title = title
-        self.start_time = datetime.now()
+        self.start_time = monotonic()
 
     def time_measure(self):
         """
         Return the time measured by the timer
-        
+
+        """
+        return monotonic() - self.start_time
+
+def reset_peak_rss():
+
+    """
+    Reset the peak resident set size (VmHWM) of the current process, return False if the kernel doesn't allow it
+    """
+
+    try:
+        with open("/proc/self/clear_refs", "w") as f_refs:
+            f_refs.write("5")
+        return True
+    except OSError:
+        return False
+
+def read_peak_rss():
+
+    """
+    Return the peak resident set size (VmHWM) of the current process in bytes, None if it is not available
+    """
+
+    try:
+        with open("/proc/self/status") as f_status:
+            for line in f_status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+class ResourceMonitor:
+
+    """
+    Measure the resources used by a stage of the resolution: the wall time (monotonic clock), the user and system CPU times and the peak resident set size of the process and of its children (Singular, Giac, msolve...).
+
+    The peak of the process is its VmHWM, reset at the start of the stage when no other monitor is running (a reset would erase the peak of the other stage), else the peak sampled by the thread. The memory of the children is sampled by a thread, and the peak of the children that have ended comes from getrusage.
+
+    The children may outlive a stage (interfaces of Singular, Giac or Magma kept by a solver process reused for several systems), only the CPU time they used since the start of the stage is counted.
+
+    :param title: Title of the stage
+    :type title: str
+    :param sampling_interval: Time between two samples of the memory of the children
+    :type sampling_interval: float
+    """
+
+    running = set() ### Monitors not measured yet, their sampling threads are stopped by stop_all
+
+    def __init__(self, title:str, sampling_interval:float=0.1):
+        self.title = title
+        self.sampling_interval = sampling_interval
+
+        self.process = Process(getpid())
+        self.peak_reset = ResourceMonitor.running == set() and reset_peak_rss()
+        self.start_children_times = self.children_cpu_times()
+        self.peak_sampled = 0
+        self.start_children_maxrss = getrusage(RUSAGE_CHILDREN).ru_maxrss * 1024
+
+        self.stop = Event()
+        self.sampler = Thread(target=self.sample, daemon=True)
+
+        self.start_times = times()
+        self.start_time = monotonic()
+        self.sampler.start()
+        ResourceMonitor.running.add(self)
+
+    def children_cpu_times(self):
+
+        """
+        Return the user and system CPU times of the children alive, by PID and start time of the child (a PID may be reused)
+
+        :rtype: dict[tuple[int, float], tuple[float, float]]
         """
-        elapsed_time = datetime.now() - self.start_time
-        return elapsed_time.total_seconds()
\ No newline at end of file
+
+        children_times = {}
+
+        try:
+            for child in self.process.children(recursive=True):
+                try:
+                    child_times = child.cpu_times()
+                    children_times[(child.pid, child.create_time())] = (child_times.user, child_times.system)
+                except (NoSuchProcess, AccessDenied):
+                    pass
+        except (NoSuchProcess, AccessDenied):
+            pass
+
+        return children_times
+
+    def tree_rss(self):
+
+        """
+        Return the resident set size of the process and of its children
+        """
+
+        rss = 0
+        try:
+            rss += self.process.memory_info().rss
+            for child in self.process.children(recursive=True):
+                try:
+                    rss += child.memory_info().rss
+                except (NoSuchProcess, AccessDenied):
+                    pass
+        except (NoSuchProcess, AccessDenied):
+            pass
+        return rss
+
+    def sample(self):
+
+        """
+        Sample the memory of the process tree until the end of the stage
+        """
+
+        while not self.stop.is_set():
+            self.peak_sampled = max(self.peak_sampled, self.tree_rss())
+            self.stop.wait(self.sampling_interval)
+
+    def measure(self):
+
+        """
+        Return the resources used since the start of the stage: wall time, user and system CPU times (seconds) and peak RSS (bytes)
+
+        :rtype: dict
+        """
+
+        wall = monotonic() - self.start_time
+        end_times = times()
+
+        self.stop.set()
+        self.sampler.join()
+        ResourceMonitor.running.discard(self)
+        self.peak_sampled = max(self.peak_sampled, self.tree_rss())
+
+        ### CPU time of the process, of its children that have ended and of the ones still alive, the last ones without the time used before the stage
+        user = (end_times.user + end_times.children_user) - (self.start_times.user + self.start_times.children_user)
+        system = (end_times.system + end_times.children_system) - (self.start_times.system + self.start_times.children_system)
+
+        for (child, (child_user, child_system)) in self.children_cpu_times().items():
+            (start_user, start_system) = self.start_children_times.get(child, (0, 0))
+            user += child_user - start_user
+            system += child_system - start_system
+
+        peak_rss = self.peak_sampled
+
+        if self.peak_reset:
+            peak_process = read_peak_rss()
+            if peak_process is not None:
+                peak_rss = max(peak_rss, peak_process)
+
+        end_children_maxrss = getrusage(RUSAGE_CHILDREN).ru_maxrss * 1024
+        if end_children_maxrss > self.start_children_maxrss:
+            peak_rss = max(peak_rss, end_children_maxrss)
+
+        return {"wall_time" : wall, "user_time" : user, "system_time" : system, "peak_rss" : peak_rss}
+
+    @staticmethod
+    def stop_all():
+
+        """
+        Stop the sampling threads of the monitors not measured, when a stage has failed. The solver processes are reused, the threads must not outlive the resolution.
+        """
+
+        for monitor in list(ResourceMonitor.running):
+            monitor.measure()
@@ -1,17 +1,25 @@
 import sys
+from functools import partial
 from importlib import import_module
+from inspect import signature
 from os import dup2
+from time import monotonic, sleep
+from queue import Empty
+from multiprocessing import Queue
+from multiprocessing import Process as MultiprocessingProcess
 from psutil import Process, wait_procs, NoSuchProcess
 
-def redirect_all_output(log_file_path:str):
+def redirect_all_output(log_file_path:str, mode:str='w'):
 
     """
     Redirect all the outputs to a file
     
     :param log_file_path: Path to the file
     :type log_file_path: str
+    :param mode: Mode used to open the file, 'a' to append to an existing log
+    :type mode: str
     """
-    log_file = open(log_file_path, 'w')
+    log_file = open(log_file_path, mode)
 
     sys.stdout = log_file
     sys.stderr = log_file
@@ -19,24 +27,34 @@ def redirect_all_output(log_file_path:str):
     dup2(log_file.fileno(), 1)
     dup2(log_file.fileno(), 2)
 
-def import_perm(permutation:str):
+    return log_file
+
+def import_perm(permutation:str, checkpoint_folder:str=None):
 
     """
     Import the generation function of systems of the permutation
     
     :param permutation: The name of the permutation that is the same than the file in the permutations folder.
     :type permutation: str
+    :param checkpoint_folder: Folder of the checkpoints of the rounds, given to the generation function if it accepts a checkpoint_folder argument
+    :type checkpoint_folder: str
     """
 
     module_name = f"permutations.{permutation}"
     module = import_module(module_name)
 
     try:
-        return module.generate_system_of_equations
+        generate_system_of_equations = module.generate_system_of_equations
     except AttributeError:
         raise ImportError(
             f"{module_name} must define generate_system_of_equations()"
         )
+
+    ### The generation functions saving the state after each round have an optional argument checkpoint_folder
+    if checkpoint_folder is not None and "checkpoint_folder" in signature(generate_system_of_equations).parameters:
+        return partial(generate_system_of_equations, checkpoint_folder=checkpoint_folder)
+
+    return generate_system_of_equations
     
 def kill_process_tree(proc):
     """
@@ -56,3 +74,68 @@ def kill_process_tree(proc):
         parent.wait(1)
     except NoSuchProcess:
         pass
+
+
+def run_processes_with_timeout(target, args_list:list[tuple], timeout:float, cores:int=1):
+
+    """
+    Run the function target in a new process for every tuple of arguments, at most cores processes at the same time. The function must put its result in the Queue given as first argument.
+
+    :param target: Function to run, its first argument is the Queue where it puts its result
+    :param args_list: List of the arguments of the function (without the Queue)
+    :type args_list: list[tuple]
+    :param timeout: Timeout of every process
+    :type timeout: float
+    :param cores: Number of processes running at the same time
+    :type cores: int
+
+    :returns: For every tuple of arguments, ("done", result), ("timeout", None) or ("failed", error message)
+    :rtype: list[tuple]
+    """
+
+    outcomes = [None] * len(args_list)
+    next_process = 0
+    running = [] ### (index, process, queue, deadline)
+
+    while next_process < len(args_list) or running != []:
+
+        while next_process < len(args_list) and len(running) < cores:
+            q = Queue()
+            p = MultiprocessingProcess(target=target, args=(q, ) + tuple(args_list[next_process]))
+            p.start()
+            running.append((next_process, p, q, monotonic() + timeout))
+            next_process += 1
+
+        still_running = []
+
+        for (index, p, q, deadline) in running:
+
+            ### The result is read before joining the process: a process putting a large object in a Queue only stops once it has been read
+            try:
+                outcomes[index] = ("done", q.get_nowait())
+                p.join()
+                continue
+            except Empty:
+                pass
+
+            if not p.is_alive():
+                try:
+                    outcomes[index] = ("done", q.get(timeout=1))
+                except Empty:
+                    outcomes[index] = ("failed", "Error has occurred in the Queue to get the result")
+                p.join()
+
+            elif monotonic() > deadline:
+                p.terminate()
+                p.join()
+                outcomes[index] = ("timeout", None)
+
+            else:
+                still_running.append((index, p, q, deadline))
+
+        running = still_running
+
+        if running != []:
+            sleep(0.05)
+
+    return outcomes
\ No newline at end of file